@@ -0,0 +1,127 @@
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import SynchronousOnlyOperation
+from django.http import HttpResponse
+from rest_framework import exceptions, mixins
+from rest_framework.renderers import JSONRenderer
+
+from .cache import CachedResponseMixin, get_cache
+
+
+def plain_response(response):
+    """Отрисовать ответ DRF и вернуть обычный HttpResponse.
+
+    Django под ASGI отрисовывает ответы с методом render в потоке;
+    готовый HttpResponse отдаётся без перехода в поток.
+    """
+    if not hasattr(response, 'render'):
+        return response
+    response.render()
+    plain = HttpResponse(response.content, status=response.status_code)
+    for header, value in response.items():
+        plain[header] = value
+    return plain
+
+
+def cache_in_process():
+    """Кэш ответов в памяти процесса: обращения к нему не блокируют цикл."""
+    return isinstance(get_cache(), LocMemCache)
+
+
+class AsyncReadMixin:
+    """Асинхронные list и retrieve для работы под ASGI.
+
+    Включается настройкой ASYNC_READ_VIEWS. GET-запросы обрабатываются в
+    цикле событий: проверки запроса, ETag и кэш ответов в памяти процесса
+    не требуют потока, выборка и сериализация выполняются одним переходом
+    в поток (в Django 3.2 нет асинхронного ORM), JSON отрисовывается снова
+    в цикле событий. С внешним кэшем (Redis, memcached) обращения к нему
+    тоже уходят в поток. Остальные методы и запросы с другими рендерерами
+    (формы BrowsableAPIRenderer читают базу) передаются синхронному
+    представлению, как это делает Django для синхронных представлений.
+    """
+    async_actions = {
+        'list': mixins.ListModelMixin.list,
+        'retrieve': mixins.RetrieveModelMixin.retrieve,
+    }
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        sync_view = super().as_view(actions, **initkwargs)
+        read_action = actions.get('get')
+        if (not settings.ASYNC_READ_VIEWS
+                or read_action not in cls.async_actions):
+            return sync_view
+        run_sync_view = sync_to_async(sync_view)
+
+        async def view(request, *args, **kwargs):
+            self = cls(**initkwargs)
+            self.action_map = actions
+            for method, action in actions.items():
+                setattr(self, method, getattr(self, action))
+            if (request.method != 'GET'
+                    or not self.renders_json(request, **kwargs)):
+                return await run_sync_view(request, *args, **kwargs)
+            return await self.dispatch_async(request, *args, **kwargs)
+
+        view.cls = cls
+        view.initkwargs = initkwargs
+        view.actions = actions
+        view.csrf_exempt = True
+        return view
+
+    def renders_json(self, request, **kwargs):
+        """Согласование содержимого выбирает JSON, которому не нужна база."""
+        self.format_kwarg = self.get_format_suffix(**kwargs)
+        try:
+            renderer, _ = self.perform_content_negotiation(
+                self.initialize_request(request)
+            )
+        except exceptions.NotAcceptable:
+            return False
+        return isinstance(renderer, JSONRenderer)
+
+    async def dispatch_async(self, request, *args, **kwargs):
+        """APIView.dispatch с асинхронным обработчиком действия."""
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+        try:
+            await self.initial_async(request, *args, **kwargs)
+            response = await self.read_async(
+                self.async_actions[self.action], request, *args, **kwargs
+            )
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        return plain_response(
+            self.finalize_response(request, response, *args, **kwargs)
+        )
+
+    async def initial_async(self, request, *args, **kwargs):
+        if not cache_in_process():
+            return await sync_to_async(self.initial)(request, *args, **kwargs)
+        try:
+            self.initial(request, *args, **kwargs)
+        except SynchronousOnlyOperation:
+            # Аутентификации понадобилась база: повторяем проверки в потоке.
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+    async def read_async(self, handler, request, *args, **kwargs):
+        run = sync_to_async(partial(handler, self))
+        if not isinstance(self, CachedResponseMixin):
+            return await run(request, *args, **kwargs)
+        if not cache_in_process():
+            return await sync_to_async(self.cached_response)(
+                partial(handler, self), request, *args, **kwargs
+            )
+        validators = self.get_validators(request)
+        response = self.get_cached_response(request, *validators)
+        if response is None:
+            response = await run(request, *args, **kwargs)
+            self.store_response(response, *validators)
+        return self.add_validators(response, *validators)
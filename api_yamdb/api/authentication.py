@@ -0,0 +1,94 @@
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.utils.functional import cached_property
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from reviews.models import RoleChoices
+from .cache import is_shared
+
+CLAIMS_CHANGED_KEY = 'jwt-claims-changed:{user_id}'
+ROLE_CLAIM = 'role'
+
+
+def mark_claims_changed(user_id, timestamp):
+    """Пометить ранее выданные пользователю токены как устаревшие."""
+    cache.set(
+        CLAIMS_CHANGED_KEY.format(user_id=user_id),
+        timestamp,
+        api_settings.ACCESS_TOKEN_LIFETIME.total_seconds()
+    )
+
+
+class ClaimsAccessToken(AccessToken):
+    """Токен доступа с ролью пользователя в полезной нагрузке."""
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token['username'] = user.username
+        token[ROLE_CLAIM] = user.role
+        token['is_superuser'] = user.is_superuser
+        return token
+
+
+class ClaimsTokenUser(TokenUser):
+    """Пользователь, восстановленный из полезной нагрузки токена."""
+
+    @cached_property
+    def role(self):
+        return self.token[ROLE_CLAIM]
+
+    @property
+    def is_admin(self):
+        return self.role == RoleChoices.ADMIN or self.is_superuser
+
+    @property
+    def is_moderator(self):
+        return self.role == RoleChoices.MODERATOR
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """JWT-аутентификация без запроса пользователя на чтение.
+
+    Для безопасных методов пользователь строится из полезной нагрузки
+    токена. Из базы данных пользователь загружается для изменяющих
+    запросов, для представлений с разрешениями, которым нужен пользователь
+    из базы (requires_stored_user, например IsAdmin), для токенов без роли
+    и для токенов, выданных до изменения или удаления пользователя.
+
+    Отметки об изменении пользователей хранятся в кэше по умолчанию. Кэш в
+    памяти процесса не видит отметок других процессов, поэтому с ним
+    пользователь всегда загружается из базы.
+    """
+
+    def authenticate(self, request):
+        self.stateless = self.allows_stateless(request)
+        return super().authenticate(request)
+
+    @staticmethod
+    def allows_stateless(request):
+        if request.method not in SAFE_METHODS:
+            return False
+        if not is_shared(caches[DEFAULT_CACHE_ALIAS]):
+            return False
+        view = request.parser_context.get('view')
+        return view is None or not any(
+            getattr(permission, 'requires_stored_user', False)
+            for permission in view.get_permissions()
+        )
+
+    def get_user(self, validated_token):
+        if not self.stateless or not self.has_fresh_claims(validated_token):
+            return super().get_user(validated_token)
+        return ClaimsTokenUser(validated_token)
+
+    def has_fresh_claims(self, validated_token):
+        if ROLE_CLAIM not in validated_token:
+            return False
+        changed = cache.get(CLAIMS_CHANGED_KEY.format(
+            user_id=validated_token[api_settings.USER_ID_CLAIM]
+        ))
+        return changed is None or validated_token['iat'] > changed
@@ -1,21 +1,128 @@
-from rest_framework.filters import SearchFilter
+from django.conf import settings
+from django.db.models import F
+from django.http import Http404
 from rest_framework.mixins import (
     ListModelMixin,
     DestroyModelMixin,
     CreateModelMixin
 )
-from rest_framework import viewsets
+from rest_framework import permissions, viewsets
 
-from .permissions import IsAdminUserOrReadOnly
+from . import metrics
+from .async_views import AsyncReadMixin
+from .cache import CachedRetrieveMixin
+from .filters import AutocompleteSearchFilter
+from .pagination import OptionalCursorPagination
+from .permissions import (
+    IsAdminModeratorAuthorOrReadOnly,
+    IsAdminUserOrReadOnly
+)
+from .serializers import RowSerializerMixin
+
+
+class SerializeMetricsMixin:
+    """Время сериализации ответа для MetricsMiddleware.
+
+    У сериализатора из get_serializer замеряется to_representation: для
+    списка это вызов ListSerializer по всей странице, вложенные поля в
+    него входят. Время копится в request.metrics['serialize_time'].
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        serializer = super().get_serializer(*args, **kwargs)
+        values = getattr(self.request, 'metrics', None)
+        if values is not None:
+            represent = serializer.to_representation
+
+            def to_representation(instance):
+                with metrics.measure(values, 'serialize_time'):
+                    return represent(instance)
+
+            serializer.to_representation = to_representation
+        return serializer
+
+
+class RowListMixin:
+    """Списки выбираются строками .values() для быстрого пути чтения.
+
+    Включается настройкой FAST_READ_SERIALIZERS для сериализаторов с
+    RowSerializerMixin: столбцы выборки задаёт сериализатор, объекты
+    моделей и дерево полей для каждой строки не создаются.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.action != 'list' or not settings.FAST_READ_SERIALIZERS:
+            return queryset
+        serializer_class = self.get_serializer_class()
+        if not issubclass(serializer_class, RowSerializerMixin):
+            return queryset
+        return queryset.prefetch_related(None).values(
+            *serializer_class.query_columns()
+        )
 
 
 class SearchableViewSet(
+    SerializeMetricsMixin,
     CreateModelMixin,
     ListModelMixin,
     DestroyModelMixin,
     viewsets.GenericViewSet
 ):
-    filter_backends = (SearchFilter,)
+    filter_backends = (AutocompleteSearchFilter,)
     search_fields = ('name',)
     lookup_field = 'slug'
     permission_classes = (IsAdminUserOrReadOnly,)
+
+
+class NestedPostViewSet(AsyncReadMixin, SerializeMetricsMixin, RowListMixin,
+                        CachedRetrieveMixin, viewsets.ModelViewSet):
+    """Отзывы и комментарии, вложенные в родительский объект из URL.
+
+    Выборка фильтруется по id родителя напрямую, без его загрузки, а имя
+    автора берётся тем же запросом.
+    Существование родителя проверяется одним запросом и только когда
+    это не следует из результата: при пустой странице и при создании.
+    """
+    pagination_class = OptionalCursorPagination
+    permission_classes = (permissions.IsAuthenticatedOrReadOnly,
+                          IsAdminModeratorAuthorOrReadOnly)
+    http_method_names = ('get', 'post', 'patch', 'delete')
+    store_responses = False
+    parent_model = None
+    parent_field = None
+    parent_checked = False
+
+    @property
+    def parent_id(self):
+        return self.kwargs[f'{self.parent_field}_id']
+
+    def get_parent_lookup(self):
+        return {'pk': self.parent_id}
+
+    def check_parent(self):
+        if self.parent_checked:
+            return
+        if not self.parent_model.objects.filter(
+            **self.get_parent_lookup()
+        ).exists():
+            raise Http404
+        self.parent_checked = True
+
+    def get_queryset(self):
+        return self.get_serializer_class().Meta.model.objects.filter(
+            **{f'{self.parent_field}_id': self.parent_id}
+        ).annotate(author_username=F('author__username'))
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if not page:
+            self.check_parent()
+        return page
+
+    def perform_create(self, serializer):
+        self.check_parent()
+        serializer.save(
+            author=self.request.user,
+            **{f'{self.parent_field}_id': self.parent_id}
+        )
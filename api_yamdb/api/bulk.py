@@ -0,0 +1,102 @@
+from django.db import connection, transaction
+from rest_framework.serializers import SlugRelatedField
+
+from reviews.models import Category, Genre, GenreTitle, Title
+from .cache import TITLES_SCOPE, bump_versions
+from .serializers import TitleBulkItemSerializer
+
+DOES_NOT_EXIST = SlugRelatedField.default_error_messages['does_not_exist']
+
+
+def does_not_exist(slug):
+    return DOES_NOT_EXIST.format(slug_name='slug', value=slug)
+
+
+def validate_items(items, results):
+    """Проверить поля элементов, не обращаясь к базе."""
+    valid = []
+    for index, item in enumerate(items):
+        serializer = TitleBulkItemSerializer(data=item)
+        if serializer.is_valid():
+            valid.append((index, serializer.validated_data))
+        else:
+            results[index] = {'errors': serializer.errors}
+    return valid
+
+
+def resolve_slugs(valid, results):
+    """Разрешить слаги одним запросом IN на модель и собрать объекты."""
+    categories = dict(Category.objects.filter(
+        slug__in={data['category'] for _, data in valid}
+    ).values_list('slug', 'id'))
+    genres = dict(Genre.objects.filter(
+        slug__in={slug for _, data in valid for slug in data['genre']}
+    ).values_list('slug', 'id'))
+    titles = []
+    for index, data in valid:
+        errors = {}
+        if data['category'] not in categories:
+            errors['category'] = [does_not_exist(data['category'])]
+        missing = [slug for slug in data['genre'] if slug not in genres]
+        if missing:
+            errors['genre'] = [does_not_exist(slug) for slug in missing]
+        if errors:
+            results[index] = {'errors': errors}
+            continue
+        title = Title(
+            name=data['name'],
+            year=data['year'],
+            description=data.get('description'),
+            category_id=categories[data['category']],
+        )
+        genre_ids = [genres[slug] for slug in dict.fromkeys(data['genre'])]
+        titles.append((index, title, genre_ids))
+    return titles
+
+
+def assign_inserted_ids(objects):
+    """Проставить id объектам, вставленным bulk_create.
+
+    Бэкенд не возвращает id из bulk_create (SQLite в Django 3.2), а они
+    нужны для связей с жанрами. Вставка держит блокировку записи до конца
+    транзакции, а id растут (AUTOINCREMENT), поэтому вставленным строкам
+    принадлежат len(objects) последних id в порядке вставки.
+    """
+    ids = list(
+        Title.objects.order_by('-pk').values_list('pk', flat=True)[
+            :len(objects)
+        ]
+    )
+    for obj, pk in zip(objects, reversed(ids)):
+        obj.pk = pk
+
+
+def insert_titles(titles):
+    with transaction.atomic():
+        objects = Title.objects.bulk_create([title for _, title, _ in titles])
+        if not connection.features.can_return_rows_from_bulk_insert:
+            assign_inserted_ids(objects)
+        GenreTitle.objects.bulk_create(
+            GenreTitle(title_id=title.id, genre_id=genre_id)
+            for _, title, genre_ids in titles
+            for genre_id in genre_ids
+        )
+    # bulk_create не отправляет сигналы, поэтому кэш сбрасываем явно.
+    bump_versions(TITLES_SCOPE)
+
+
+def create_titles(items):
+    """Создать произведения пакетом.
+
+    Слаги жанров и категорий разрешаются одним запросом IN на модель,
+    произведения и связи с жанрами вставляются bulk_create. Возвращает
+    список той же длины, что и items: {'id': ...} для созданного
+    произведения или {'errors': ...} для отклонённого.
+    """
+    results = [None] * len(items)
+    titles = resolve_slugs(validate_items(items, results), results)
+    if titles:
+        insert_titles(titles)
+    for index, title, _ in titles:
+        results[index] = {'id': title.id}
+    return results
@@ -0,0 +1,164 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+VERSION_KEY = 'api-version:{scope}'
+RESPONSE_KEY = 'api-response:{digest}'
+
+# Области кэша: изменение категорий и жанров затрагивает все ответы с
+# произведениями (CATALOGUE_SCOPE), изменение произведения или его отзывов -
+# списки произведений и его собственную карточку. Отзывы и комментарии
+# версионируются по родительскому объекту, имена авторов - общей областью.
+CATEGORIES_SCOPE = 'categories'
+GENRES_SCOPE = 'genres'
+CATALOGUE_SCOPE = 'catalogue'
+TITLES_SCOPE = 'titles'
+AUTHORS_SCOPE = 'authors'
+# Входит в каждый набор областей. Её обновляют команды, которые пишут в
+# базу в обход сигналов моделей (reviews.signals.data_changed).
+ALL_SCOPE = 'all'
+
+
+def title_scope(title_id):
+    return f'title:{title_id}'
+
+
+def reviews_scope(title_id):
+    return f'reviews:{title_id}'
+
+
+def comments_scope(review_id):
+    return f'comments:{review_id}'
+
+
+def get_cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def is_shared(cache):
+    """Записи кэша видны всем процессам сервера."""
+    return not isinstance(cache, (LocMemCache, DummyCache))
+
+
+def bump_versions(*scopes):
+    """Сделать недействительными закэшированные ответы областей scopes."""
+    transaction.on_commit(lambda: _bump_versions(scopes))
+
+
+def _bump_versions(scopes):
+    # Версия - время последнего изменения области в наносекундах, оно же
+    # служит значением Last-Modified.
+    now = time.time_ns()
+    get_cache().set_many(
+        {VERSION_KEY.format(scope=scope): now for scope in scopes},
+        settings.API_CACHE_VERSION_TIMEOUT
+    )
+
+
+def get_versions(scopes):
+    """Версии областей; отсутствующие создаются с текущим временем.
+
+    Версии хранятся API_CACHE_VERSION_TIMEOUT секунд: области создаются
+    и для несуществующих объектов, и бессрочные ключи копились бы в
+    кэше. Истёкшая версия заменяется новой, что равносильно промаху.
+    """
+    cache = get_cache()
+    keys = [VERSION_KEY.format(scope=scope) for scope in scopes]
+    versions = cache.get_many(keys)
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    for key, version in missing.items():
+        if not cache.add(key, version, settings.API_CACHE_VERSION_TIMEOUT):
+            version = cache.get(key, version)
+        versions[key] = version
+    return [versions[key] for key in keys]
+
+
+class CachedResponseMixin:
+    """Кэширование ответов на GET-запросы списка.
+
+    Версии областей, которые возвращает get_cache_scopes, дают ETag и
+    Last-Modified: условный запрос с актуальными валидаторами получает
+    ответ 304 без обращения к базе. Если store_responses включен, данные
+    ответа сохраняются в кэше под ключом из версий и пути с параметрами
+    запроса. Изменение данных обновляет версии своих областей
+    (см. api.signals), и старые ответы больше не читаются.
+    """
+    cache_scopes = ()
+    store_responses = True
+
+    def get_cache_scopes(self):
+        return self.cache_scopes
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        validators = self.get_validators(request)
+        response = self.get_cached_response(request, *validators)
+        if response is None:
+            response = handler(request, *args, **kwargs)
+            self.store_response(response, *validators)
+        return self.add_validators(response, *validators)
+
+    def get_validators(self, request):
+        """Версии областей, адрес запроса, ETag и Last-Modified ответа.
+
+        Ссылки next и previous в данных ответа абсолютные, поэтому ключ
+        включает схему и хост, а не только путь.
+        """
+        versions = get_versions((ALL_SCOPE, *self.get_cache_scopes()))
+        path = request.build_absolute_uri()
+        etag = quote_etag(hashlib.md5(
+            f'{versions}:{request.accepted_renderer.format}:{path}'.encode()
+        ).hexdigest())
+        return versions, path, etag, max(versions) // 10 ** 9
+
+    def get_cached_response(self, request, versions, path, etag,
+                            last_modified):
+        """Ответ 304 или сохранённый ответ; None, если его нужно получить."""
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None and self.store_responses:
+            data = get_cache().get(self.get_response_key(versions, path))
+            if data is not None:
+                response = Response(data)
+        return response
+
+    def store_response(self, response, versions, path, etag, last_modified):
+        if self.store_responses and response.status_code == 200:
+            get_cache().set(
+                self.get_response_key(versions, path),
+                response.data,
+                settings.API_CACHE_TIMEOUT
+            )
+
+    @staticmethod
+    def get_response_key(versions, path):
+        return RESPONSE_KEY.format(
+            digest=hashlib.md5(f'{versions}:{path}'.encode()).hexdigest()
+        )
+
+    @staticmethod
+    def add_validators(response, versions, path, etag, last_modified):
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            response['Last-Modified'] = http_date(last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+
+class CachedRetrieveMixin(CachedResponseMixin):
+    """CachedResponseMixin, применённый также к retrieve."""
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(
+            super().retrieve, request, *args, **kwargs
+        )
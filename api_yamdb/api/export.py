@@ -0,0 +1,140 @@
+import csv
+from datetime import datetime, time
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+
+from reviews.models import GenreTitle, Review, Title
+
+CHUNK_SIZE = 2000
+TITLE_FIELDS = ('id', 'name', 'year', 'description', 'rating', 'category',
+                'genre')
+REVIEW_FIELDS = ('id', 'title_id', 'author', 'text', 'score', 'pub_date')
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+class Echo:
+    """Псевдобуфер для csv.writer, возвращающий записанную строку."""
+
+    def write(self, value):
+        return value
+
+
+def parse_since_date(value):
+    """Дата или дата и время в формате ISO 8601; None, если не разобрать.
+
+    Дата без времени означает начало суток, время без часового пояса -
+    текущий часовой пояс.
+    """
+    try:
+        moment = parse_datetime(value)
+        day = parse_date(value) if moment is None else None
+    except ValueError:
+        return None
+    if day is not None:
+        moment = datetime.combine(day, time.min)
+    if moment is not None and timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def get_since(request, with_date=True):
+    """Параметры выгрузки новых записей: since (id) и since_date."""
+    since = request.query_params.get('since')
+    if since is not None and not since.isdigit():
+        raise ValidationError({'since': 'Ожидается id записи.'})
+    since_date = request.query_params.get('since_date')
+    if since_date is not None and not with_date:
+        raise ValidationError(
+            {'since_date': 'Выгрузка не поддерживает этот параметр.'}
+        )
+    date = parse_since_date(since_date) if since_date else None
+    if since_date and date is None:
+        raise ValidationError(
+            {'since_date': 'Ожидается дата в формате ISO 8601.'}
+        )
+    return (int(since) if since else None), date
+
+
+def title_rows(since=None):
+    """Произведения с жанрами, категорией и рейтингом.
+
+    Произведения и связи с жанрами читаются двумя серверными курсорами,
+    упорядоченными по id произведения, и объединяются слиянием.
+    """
+    titles = Title.objects.order_by('id')
+    links = GenreTitle.objects.order_by('title_id', 'genre__slug')
+    if since is not None:
+        titles = titles.filter(id__gt=since)
+        links = links.filter(title_id__gt=since)
+    links = links.values_list('title_id', 'genre__slug').iterator(
+        chunk_size=CHUNK_SIZE
+    )
+    link = next(links, None)
+    for title in titles.values(
+        'id', 'name', 'year', 'description', 'rating', 'category__slug'
+    ).iterator(chunk_size=CHUNK_SIZE):
+        title['category'] = title.pop('category__slug')
+        title['genre'] = []
+        while link is not None and link[0] <= title['id']:
+            if link[0] == title['id']:
+                title['genre'].append(link[1])
+            link = next(links, None)
+        yield title
+
+
+def review_rows(since=None, since_date=None):
+    reviews = Review.objects.order_by('id')
+    if since is not None:
+        reviews = reviews.filter(id__gt=since)
+    if since_date is not None:
+        reviews = reviews.filter(pub_date__gt=since_date)
+    for review in reviews.values(
+        'id', 'title_id', 'author__username', 'text', 'score', 'pub_date'
+    ).iterator(chunk_size=CHUNK_SIZE):
+        review['author'] = review.pop('author__username')
+        yield review
+
+
+def to_ndjson(rows, fields):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode({field: row[field] for field in fields}) + '\n'
+
+
+def to_csv(rows, fields):
+    writer = csv.writer(Echo())
+    yield writer.writerow(fields)
+    for row in rows:
+        yield writer.writerow(
+            ','.join(row[field]) if isinstance(row[field], list)
+            else row[field]
+            for field in fields
+        )
+
+
+def stream(request, rows, fields, filename):
+    """Потоковый ответ в формате из параметра output (ndjson или csv).
+
+    Параметры проверяются до начала выгрузки, строки читаются по мере
+    отправки ответа.
+    """
+    output = request.query_params.get('output', 'ndjson')
+    if output not in CONTENT_TYPES:
+        raise ValidationError(
+            {'output': f'Допустимые форматы: {", ".join(CONTENT_TYPES)}.'}
+        )
+    lines = (to_csv if output == 'csv' else to_ndjson)(rows, fields)
+    response = StreamingHttpResponse(
+        lines, content_type=CONTENT_TYPES[output]
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="{filename}.{output}"'
+    )
+    return response
@@ -1,20 +1,158 @@
 import django_filters
+from django.conf import settings
+from django.db import connection
+from django.db.models import (
+    Case, CharField, F, FloatField, Func, IntegerField, Lookup, Q, Value, When
+)
+from django.db.models.functions import Greatest, Lower
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import SearchFilter
 
 from reviews.models import Title
+from reviews.search import TRIGRAM_THRESHOLD, similarity
+from .lookups import categories, genres
 
 
 class TitleFilter(django_filters.FilterSet):
-    genre = django_filters.CharFilter(
-        field_name='genre__slug',
-        lookup_expr='exact'
-    )
-    category = django_filters.CharFilter(
-        field_name='category__slug',
-        lookup_expr='exact'
-    )
+    """Фильтр произведений.
+
+    Слаги жанра и категории переводятся в id по копиям таблиц в памяти
+    процесса, и выборка не соединяется с таблицами жанров и категорий.
+    """
+    genre = django_filters.CharFilter(method='filter_by_slug')
+    category = django_filters.CharFilter(method='filter_by_slug')
     year = django_filters.CharFilter(field_name='year', lookup_expr='exact')
     name = django_filters.CharFilter(field_name='name', lookup_expr='exact')
+    rating_min = django_filters.NumberFilter(
+        field_name='rating',
+        lookup_expr='gte'
+    )
+    rating_max = django_filters.NumberFilter(
+        field_name='rating',
+        lookup_expr='lte'
+    )
 
     class Meta:
         model = Title
         fields = ('genre', 'category')
+
+    def filter_by_slug(self, queryset, name, value):
+        obj = (genres if name == 'genre' else categories).get_by_slug(value)
+        if obj is None:
+            return queryset.none()
+        return queryset.filter(**{name: obj.pk})
+
+
+class TrigramSimilar(Lookup):
+    """Оператор pg_trgm `%`, использующий триграммный индекс."""
+    lookup_name = 'trigram_similar'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} %% {rhs}', lhs_params + rhs_params
+
+
+CharField.register_lookup(TrigramSimilar)
+
+
+def match_score(obj, fields, terms, mode):
+    """Оценка совпадения объекта из кэша: 1 или 0, для fuzzy - сходство."""
+    values = [str(getattr(obj, field)).casefold() for field in fields]
+    if mode == 'contains':
+        return float(all(
+            any(term in value for value in values) for term in terms
+        ))
+    phrase = ' '.join(terms)
+    if mode == 'prefix':
+        return float(any(value.startswith(phrase) for value in values))
+    return max(similarity(value, phrase) for value in values)
+
+
+class AutocompleteSearchFilter(SearchFilter):
+    """Поиск с выбором режима параметром search_mode.
+
+    contains (по умолчанию) - вхождение каждого слова, как SearchFilter;
+    prefix - начало значения без учёта регистра, по индексу LOWER(поле);
+    fuzzy - нечёткое совпадение по триграммам, лучшие совпадения первыми.
+
+    Если у представления задан search_cache (TableCache), небольшая
+    таблица фильтруется в памяти процесса, а из базы объекты выбираются
+    по первичному ключу.
+    """
+    mode_param = 'search_mode'
+    modes = ('contains', 'prefix', 'fuzzy')
+
+    def get_search_mode(self, request):
+        mode = request.query_params.get(self.mode_param, self.modes[0])
+        if mode not in self.modes:
+            raise ValidationError(
+                {self.mode_param: f'Допустимые режимы: '
+                                  f'{", ".join(self.modes)}.'}
+            )
+        return mode
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        fields = self.get_search_fields(view, request)
+        if not terms or not fields:
+            return queryset
+        mode = self.get_search_mode(request)
+        table = getattr(view, 'search_cache', None)
+        if table is not None:
+            return self.filter_cached(queryset, table, fields, terms, mode)
+        if mode == 'prefix':
+            return self.filter_prefix(queryset, fields, ' '.join(terms))
+        if mode == 'fuzzy' and (connection.vendor == 'postgresql'
+                                and settings.SEARCH_TRIGRAM_INDEX):
+            return self.filter_trigram(queryset, fields, ' '.join(terms))
+        return super().filter_queryset(request, queryset, view)
+
+    @staticmethod
+    def filter_cached(queryset, table, fields, terms, mode):
+        terms = [term.casefold() for term in terms]
+        scores = {}
+        for obj in table.all():
+            score = match_score(obj, fields, terms, mode)
+            if score >= TRIGRAM_THRESHOLD:
+                scores[obj.pk] = score
+        queryset = queryset.filter(pk__in=scores)
+        if mode != 'fuzzy':
+            return queryset
+        ranked = sorted(scores, key=scores.get, reverse=True)
+        return queryset.order_by(Case(
+            *(When(pk=pk, then=Value(rank)) for rank, pk in enumerate(ranked)),
+            output_field=IntegerField()
+        ))
+
+    @staticmethod
+    def filter_prefix(queryset, fields, prefix):
+        # Диапазон вместо LIKE: сравнение LOWER(поле) использует
+        # функциональный B-tree индекс (User.Meta.indexes).
+        prefix = prefix.lower()
+        aliases = {
+            f'search_prefix_{number}': Lower(field)
+            for number, field in enumerate(fields)
+        }
+        condition = Q()
+        for alias in aliases:
+            condition |= Q(**{
+                f'{alias}__gte': prefix,
+                f'{alias}__lt': prefix + '\U0010ffff',
+            })
+        return queryset.alias(**aliases).filter(condition)
+
+    @staticmethod
+    def filter_trigram(queryset, fields, phrase):
+        condition = Q()
+        for field in fields:
+            condition |= Q(**{f'{field}__trigram_similar': phrase})
+        scores = [
+            Func(F(field), Value(phrase), function='SIMILARITY',
+                 output_field=FloatField())
+            for field in fields
+        ]
+        return queryset.filter(condition).annotate(
+            search_similarity=scores[0] if len(scores) == 1
+            else Greatest(*scores)
+        ).order_by('-search_similarity')
@@ -0,0 +1,81 @@
+import time
+
+from django.conf import settings
+
+from reviews.models import Category, Genre
+from .cache import ALL_SCOPE, CATEGORIES_SCOPE, GENRES_SCOPE, get_versions
+
+
+class TableCache:
+    """Копия небольшой таблицы в памяти процесса.
+
+    Изменения в этом процессе сбрасывают копию сразу (см. api.signals).
+    Изменения в других процессах обнаруживаются по версии области кэша:
+    она читается из общего кэша не чаще раза в
+    LOOKUP_CACHE_CHECK_INTERVAL секунд. Если объекта нет в копии, но он
+    есть в базе, таблица перечитывается сразу.
+    Объекты общие для всех запросов процесса и не должны изменяться.
+    """
+
+    def __init__(self, model, scope):
+        self.model = model
+        self.scope = scope
+        self.clear()
+
+    def clear(self):
+        self.checked = None
+        self.state = (None, (), {}, {})
+
+    def refresh(self, version):
+        objects = tuple(self.model.objects.all())
+        self.state = (
+            version,
+            objects,
+            {obj.pk: obj for obj in objects},
+            {obj.slug: obj for obj in objects},
+        )
+        return self.state
+
+    def load(self):
+        now = time.monotonic()
+        if (self.checked is not None
+                and now - self.checked < settings.LOOKUP_CACHE_CHECK_INTERVAL):
+            return self.state
+        version = get_versions([ALL_SCOPE, self.scope])
+        state = self.state
+        if state[0] != version:
+            state = self.refresh(version)
+        self.checked = now
+        return state
+
+    def find(self, index, key, **lookup):
+        state = self.load()
+        obj = state[index].get(key)
+        if obj is None and self.model.objects.filter(**lookup).exists():
+            obj = self.refresh(state[0])[index].get(key)
+        return obj
+
+    def all(self):
+        return self.load()[1]
+
+    def get(self, pk):
+        """Объект по первичному ключу или None."""
+        return self.find(2, pk, pk=pk)
+
+    def get_by_slug(self, slug):
+        """Объект по слагу или None."""
+        return self.find(3, slug, slug=slug)
+
+    def get_many(self, pks):
+        """Объекты с первичными ключами pks в порядке таблицы."""
+        pks = set(pks)
+        objects = [obj for obj in self.all() if obj.pk in pks]
+        if len(objects) < len(pks):
+            for pk in pks.difference(obj.pk for obj in objects):
+                self.get(pk)
+            objects = [obj for obj in self.all() if obj.pk in pks]
+        return objects
+
+
+categories = TableCache(Category, CATEGORIES_SCOPE)
+genres = TableCache(Genre, GENRES_SCOPE)
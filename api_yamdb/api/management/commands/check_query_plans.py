@@ -0,0 +1,91 @@
+from django.core.management import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from api.filters import TitleFilter
+from api.views import TitleViewSet
+from reviews.models import Category, Comment, Genre, Review
+
+PAGE_SIZE = 10
+
+
+def title_list(filters=None):
+    return TitleFilter(
+        filters or {}, queryset=TitleViewSet.queryset
+    ).qs[:PAGE_SIZE]
+
+
+def slug_of(model):
+    """Слаг существующей записи: неизвестный слаг даёт пустую выборку."""
+    return model.objects.values_list('slug', flat=True).first()
+
+
+def filtered_title_list(name, model):
+    """Список с фильтром по слагу, как в API.
+
+    Без записей в таблице фильтр строится по id напрямую, как после
+    разрешения слага в TitleFilter: планировщику не важно, есть ли такая
+    запись.
+    """
+    slug = slug_of(model)
+    if slug is None:
+        return TitleViewSet.queryset.filter(**{name: 1})[:PAGE_SIZE]
+    return title_list({name: slug})
+
+
+def get_queries():
+    """Основные запросы списков API."""
+    return {
+        'titles': title_list(),
+        'titles?category=': filtered_title_list('category', Category),
+        'titles?genre=': filtered_title_list('genre', Genre),
+        'titles?year=': title_list({'year': '2000'}),
+        'titles?name=': title_list({'name': 'name'}),
+        'titles?ordering=-rating': TitleViewSet.queryset.order_by(
+            '-rating'
+        )[:PAGE_SIZE],
+        'reviews': Review.objects.filter(title_id=1)[:PAGE_SIZE],
+        'reviews?cursor=': Review.objects.filter(title_id=1).order_by(
+            '-pub_date', '-id'
+        )[:PAGE_SIZE],
+        'comments': Comment.objects.filter(review_id=1)[:PAGE_SIZE],
+    }
+
+
+def is_full_scan(line):
+    if connection.vendor == 'sqlite':
+        return ' SCAN ' in f' {line}' and 'USING' not in line
+    return 'Seq Scan' in line
+
+
+class Command(BaseCommand):
+    help = """Run EXPLAIN on the main API list queries and fail
+    if any of them reads a whole table instead of an index."""
+
+    def handle(self, *args, **kwargs):
+        failed = []
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                # На маленьких таблицах планировщик предпочитает Seq Scan
+                # даже при наличии индекса, поэтому запрещаем его.
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+            for name, queryset in get_queries().items():
+                if queryset.query.is_empty():
+                    # Выборка заведомо пуста (.none()): запрос не
+                    # выполняется, и плана у него нет.
+                    self.stdout.write(self.style.WARNING(
+                        f'{name}: пустая выборка, запрос не выполняется'
+                    ))
+                    continue
+                plan = queryset.explain()
+                scans = [line for line in plan.splitlines()
+                         if is_full_scan(line)]
+                style = self.style.ERROR if scans else self.style.SUCCESS
+                self.stdout.write(style(name))
+                self.stdout.write(plan)
+                if scans:
+                    failed.append(name)
+        if failed:
+            raise CommandError(
+                f'Полное сканирование таблиц в запросах: {", ".join(failed)}'
+            )
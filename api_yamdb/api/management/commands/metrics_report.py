@@ -0,0 +1,46 @@
+import json
+
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from api.metrics import METRICS, PERCENTILES, read_log, summarize
+
+
+class Command(BaseCommand):
+    help = """Per-route percentiles of SQL count, SQL time, view time
+    (without SQL, serialization and rendering), serialization time,
+    rendering time and total time from the request metrics log."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--file',
+            type=str,
+            default=str(settings.METRICS_LOG_FILE),
+            help='Path to the metrics log'
+        )
+        parser.add_argument(
+            '--json', action='store_true', help='Print the report as JSON'
+        )
+
+    def handle(self, *args, **kwargs):
+        try:
+            with open(kwargs['file'], encoding='utf-8') as log:
+                summary = summarize(read_log(log))
+        except OSError as e:
+            self.stdout.write(
+                self.style.ERROR(f'Ошибка при чтении журнала: {e}')
+            )
+            return
+        if kwargs['json']:
+            self.stdout.write(json.dumps(summary, indent=2))
+            return
+        for route, metrics in sorted(summary.items()):
+            self.stdout.write(
+                self.style.SUCCESS(f'{route}: {metrics["requests"]} запросов')
+            )
+            for metric in METRICS:
+                values = ', '.join(
+                    f'p{rank}={metrics[metric][f"p{rank}"]:.4g}'
+                    for rank in PERCENTILES
+                )
+                self.stdout.write(f'    {metric}: {values}')
@@ -0,0 +1,62 @@
+import json
+import logging
+import math
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+logger = logging.getLogger('api.metrics')
+
+METRICS = ('sql_count', 'sql_time', 'view_time', 'serialize_time',
+           'render_time', 'total_time')
+PERCENTILES = (50, 95, 99)
+
+
+def record(route, **values):
+    """Записать замеры запроса в журнал api.metrics."""
+    logger.info(json.dumps({'route': route, **values}))
+
+
+@contextmanager
+def measure(values, name):
+    """Добавить к values[name] время блока без выполненных в нём SQL."""
+    start, sql_time = time.perf_counter(), values['sql_time']
+    try:
+        yield
+    finally:
+        values[name] += (
+            time.perf_counter() - start - (values['sql_time'] - sql_time)
+        )
+
+
+def read_log(lines):
+    """Прочитать замеры из строк журнала api.metrics."""
+    for line in lines:
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(entry, dict) and 'route' in entry:
+            yield entry
+
+
+def percentile(values, rank):
+    """Перцентиль методом ближайшего ранга по отсортированным values."""
+    return values[max(math.ceil(len(values) * rank / 100) - 1, 0)]
+
+
+def summarize(entries):
+    """Сводка по маршрутам: число запросов и перцентили каждой метрики."""
+    routes = defaultdict(lambda: defaultdict(list))
+    for entry in entries:
+        for metric in METRICS:
+            routes[entry['route']][metric].append(entry.get(metric, 0))
+    summary = {}
+    for route, metrics in routes.items():
+        summary[route] = {'requests': len(metrics['total_time'])}
+        for metric, values in metrics.items():
+            values.sort()
+            summary[route][metric] = {
+                f'p{rank}': percentile(values, rank) for rank in PERCENTILES
+            }
+    return summary
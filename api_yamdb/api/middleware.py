@@ -0,0 +1,107 @@
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework.permissions import SAFE_METHODS
+
+from api_yamdb.routers import REPLICA_ALIAS, use_replica
+from . import metrics
+
+API_PREFIX = '/api/v1/'
+
+
+class QueryMetrics:
+    """Обёртка выполнения SQL, считающая запросы и время в базе."""
+
+    def __init__(self, values):
+        self.values = values
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.values['sql_time'] += time.perf_counter() - start
+            self.values['sql_count'] += 1
+
+
+class MetricsMiddleware:
+    """Замер SQL-запросов, сериализации, рендеринга и работы представления.
+
+    Включается настройкой METRICS_ENABLED, доля замеряемых запросов
+    задаётся METRICS_SAMPLE_RATE. Время сериализации - вызовы
+    to_representation сериализаторов представления (SerializeMetricsMixin),
+    время рендеринга - преобразование ответа в байты, оба без SQL. Время
+    представления - остаток времени обработки запроса: проверки, кэш и
+    остальной код Python.
+    """
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if random.random() >= settings.METRICS_SAMPLE_RATE:
+            return self.get_response(request)
+        values = request.metrics = {
+            'sql_count': 0,
+            'sql_time': 0.0,
+            'serialize_time': 0.0,
+            'render_time': 0.0,
+        }
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(
+                    connection.execute_wrapper(QueryMetrics(values))
+                )
+            response = self.get_response(request)
+        total = time.perf_counter() - start
+        match = request.resolver_match
+        if match is None:
+            return response
+        view_time = total - sum(
+            values[metric]
+            for metric in ('sql_time', 'serialize_time', 'render_time')
+        )
+        metrics.record(
+            f'{request.method} {match.view_name}',
+            status=response.status_code,
+            **values,
+            view_time=max(view_time, 0.0),
+            total_time=total
+        )
+        return response
+
+    def process_template_response(self, request, response):
+        if hasattr(request, 'metrics'):
+            with metrics.measure(request.metrics, 'render_time'):
+                response.render()
+        return response
+
+
+class ReadReplicaMiddleware:
+    """Чтение в безопасных запросах к API из базы только для чтения.
+
+    Работает, если в DATABASES есть реплика (api_yamdb.routers), иначе
+    отключается.
+    """
+
+    def __init__(self, get_response):
+        if REPLICA_ALIAS not in settings.DATABASES:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if (request.method not in SAFE_METHODS
+                or not request.path.startswith(API_PREFIX)):
+            return self.get_response(request)
+        token = use_replica.set(True)
+        try:
+            return self.get_response(request)
+        finally:
+            use_replica.reset(token)
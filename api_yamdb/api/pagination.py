@@ -0,0 +1,117 @@
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import (
+    Cursor, CursorPagination, LimitOffsetPagination
+)
+
+
+def get_key(item):
+    """Ключ (pub_date, id) объекта или строки .values()."""
+    if isinstance(item, dict):
+        return item['pub_date'], item['id']
+    return item.pub_date, item.id
+
+
+class PubDateCursorPagination(CursorPagination):
+    """Курсорная пагинация по ключу (pub_date, id) по убыванию.
+
+    Курсор хранит оба поля последней записи страницы, и следующая
+    страница выбирается условием (pub_date, id) < (p, i) по индексу
+    (родитель, -pub_date, -id). Записи с одинаковой датой не требуют
+    OFFSET, сколько бы их ни было. Размер страницы задаёт параметр
+    `limit`, по умолчанию PAGE_SIZE.
+    """
+    ordering = ('-pub_date', '-id')
+    page_size_query_param = 'limit'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.base_url = request.build_absolute_uri()
+        cursor = self.decode_cursor(request)
+        reverse = cursor is not None and cursor.reverse
+        self.position = cursor and cursor.position
+        position = self.decode_position(self.position)
+        if reverse:
+            queryset = queryset.order_by('pub_date', 'id')
+        else:
+            queryset = queryset.order_by('-pub_date', '-id')
+        if position is not None:
+            pub_date, pk = position
+            if reverse:
+                queryset = queryset.filter(
+                    Q(pub_date__gt=pub_date) | Q(pub_date=pub_date, id__gt=pk)
+                )
+            else:
+                queryset = queryset.filter(
+                    Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, id__lt=pk)
+                )
+        results = list(queryset[:self.page_size + 1])
+        page = results[:self.page_size]
+        has_more = len(results) > self.page_size
+        if reverse:
+            page.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        self.page = page
+        return page
+
+    def decode_position(self, position):
+        if position is None:
+            return None
+        pub_date, _, pk = position.rpartition('|')
+        try:
+            pub_date, pk = parse_datetime(pub_date), int(pk)
+        except ValueError:
+            pub_date = None
+        if pub_date is None:
+            raise NotFound(self.invalid_cursor_message)
+        return pub_date, pk
+
+    def get_link(self, reverse):
+        """Ссылка от последней (вперёд) или первой (назад) записи страницы.
+
+        Для пустой страницы - от позиции текущего курсора.
+        """
+        if self.page:
+            pub_date, pk = get_key(self.page[0 if reverse else -1])
+            position = f'{pub_date.isoformat()}|{pk}'
+        else:
+            position = self.position
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=reverse, position=position)
+        )
+
+    def get_next_link(self):
+        return self.get_link(reverse=False) if self.has_next else None
+
+    def get_previous_link(self):
+        return self.get_link(reverse=True) if self.has_previous else None
+
+
+class OptionalCursorPagination(LimitOffsetPagination):
+    """Пагинация limit/offset с переходом на курсорную по запросу.
+
+    Передача параметра `cursor` (для первой страницы - пустого) включает
+    постраничный вывод по ключу (pub_date, id) без OFFSET и COUNT(*).
+    Параметр `limit` в обоих режимах задаёт размер страницы.
+    """
+    cursor_query_param = 'cursor'
+    cursor_pagination_class = PubDateCursorPagination
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if self.cursor_query_param not in request.query_params:
+            return super().paginate_queryset(queryset, request, view)
+        self.cursor_paginator = self.cursor_pagination_class()
+        return self.cursor_paginator.paginate_queryset(
+            queryset, request, view
+        )
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
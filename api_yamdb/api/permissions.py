@@ -2,6 +2,9 @@ from rest_framework.permissions import SAFE_METHODS, BasePermission
 
 
 class IsAdmin(BasePermission):
+    # Роль проверяется и на чтение: пользователь нужен из базы, а не из
+    # полезной нагрузки токена (см. StatelessJWTAuthentication).
+    requires_stored_user = True
 
     def has_permission(self, request, view):
         return request.user.is_authenticated and (
@@ -19,6 +22,7 @@ class IsAdminModeratorAuthorOrReadOnly(BasePermission):
 
 
 class IsAdminUserOrReadOnly(IsAdmin):
+    requires_stored_user = False
 
     def has_permission(self, request, view):
         return request.method in SAFE_METHODS or (
@@ -0,0 +1,60 @@
+import re
+
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# DRF экранирует разделители строк и абзацев для встраивания JSON в <script>.
+ESCAPES = (
+    ('\u2028'.encode(), b'\\u2028'),
+    ('\u2029'.encode(), b'\\u2029'),
+)
+# Числа с плавающей точкой вне [1e-4, 1e16) orjson пишет иначе, чем repr:
+# 1e-6 вместо 1e-06, 1e16 вместо 1e+16, 0.000025 вместо 2.5e-05. Такие
+# числа в выводе orjson (и редкие похожие строки) отрисовывает json.
+STDLIB_FLOAT = re.compile(rb'[:,\[]-?(?:[0-9]+(?:\.[0-9]+)?[eE]|0\.0000)')
+
+
+class FastJSONRenderer(JSONRenderer):
+    """JSONRenderer на orjson, если библиотека установлена.
+
+    Вывод совпадает с JSONRenderer байт в байт: компактные разделители,
+    кириллица без экранирования, даты, Decimal и ленивые строки через
+    encoder_class DRF. Отступы по запросу клиента, ensure_ascii, целые
+    вне 64 бит, дробные числа в экспоненциальной записи (например rank
+    поиска) и прочие случаи, которых нет в orjson, отрисовывает
+    стандартный json.
+    """
+    options = (
+        orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+        if orjson else 0
+    )
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None or not self.fast_path_allowed(
+            accepted_media_type, renderer_context or {}
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data, default=self.encoder_class().default,
+                option=self.options
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        if STDLIB_FLOAT.search(ret):
+            return super().render(data, accepted_media_type, renderer_context)
+        for char, escape in ESCAPES:
+            ret = ret.replace(char, escape)
+        return ret
+
+    def fast_path_allowed(self, accepted_media_type, renderer_context):
+        return (
+            orjson is not None
+            and not self.ensure_ascii
+            and self.compact
+            and self.get_indent(accepted_media_type, renderer_context) is None
+        )
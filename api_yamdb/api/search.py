@@ -0,0 +1,57 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import LimitOffsetPagination
+
+from reviews import search
+from reviews.models import Comment, Review
+
+PARENT_FIELDS = {
+    'review': (Review, ('title_id',)),
+    'comment': (Comment, ('review_id', 'review__title_id')),
+}
+
+
+def get_query(request):
+    """Параметры поиска: текст запроса q и вид объектов type."""
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        raise ValidationError({'q': 'Укажите текст запроса.'})
+    kind = request.query_params.get('type', 'title')
+    if kind not in search.TARGETS:
+        raise ValidationError(
+            {'type': f'Допустимые значения: {", ".join(search.TARGETS)}.'}
+        )
+    return query, kind
+
+
+def with_parents(kind, rows):
+    """Дополнить найденные отзывы и комментарии id родительских объектов."""
+    results = [
+        {'id': pk, 'rank': rank, 'snippet': snippet}
+        for pk, rank, snippet in rows
+    ]
+    if kind not in PARENT_FIELDS:
+        return results
+    model, fields = PARENT_FIELDS[kind]
+    parents = {
+        row[0]: row[1:] for row in model.objects.filter(
+            id__in=[result['id'] for result in results]
+        ).values_list('id', *fields)
+    }
+    for result in results:
+        values = parents.get(result['id'], (None,) * len(fields))
+        for field, value in zip(fields, values):
+            result[field.split('__')[-1]] = value
+    return results
+
+
+def search_response(request):
+    """Страница результатов поиска в порядке релевантности."""
+    query, kind = get_query(request)
+    paginator = LimitOffsetPagination()
+    paginator.request = request
+    paginator.limit = paginator.get_limit(request)
+    paginator.offset = paginator.get_offset(request)
+    paginator.count, rows = search.search(
+        kind, query, paginator.limit, paginator.offset
+    )
+    return paginator.get_paginated_response(with_parents(kind, rows))
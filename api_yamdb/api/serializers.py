@@ -1,11 +1,20 @@
+from collections import defaultdict
+from operator import attrgetter, itemgetter
+
 from django.conf import settings
+from django.db import models
+from django.utils.functional import cached_property
 from rest_framework import serializers
 
 from .constants import CONFIRMATION_CODE_SIZE
+from .lookups import categories, genres
 from reviews.models import (
     Category,
     Genre,
+    GenreTitle,
     Title,
+    SCORES,
+    score_count_field,
     Review,
     Comment,
     User,
@@ -15,22 +24,146 @@ from reviews.models import (
 )
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class AnnotationField(serializers.ReadOnlyField):
+    """Значение из аннотации выборки, а без неё - по пути source.
+
+    Позволяет получать поля связанных объектов одним JOIN в запросе
+    списка, не загружая связанный объект для каждой строки.
+    """
+
+    def __init__(self, annotation, **kwargs):
+        self.annotation = annotation
+        super().__init__(**kwargs)
+
+    def get_attribute(self, instance):
+        if hasattr(instance, self.annotation):
+            return getattr(instance, self.annotation)
+        return super().get_attribute(instance)
+
+
+class CachedSlugRelatedField(serializers.SlugRelatedField):
+    """Слаг объекта небольшой таблицы, разрешаемый по её копии в памяти."""
+
+    def __init__(self, table, **kwargs):
+        self.table = table
+        kwargs.setdefault('queryset', table.model.objects.all())
+        super().__init__(slug_field='slug', **kwargs)
+
+    def to_internal_value(self, data):
+        if not isinstance(data, str):
+            self.fail('invalid')
+        obj = self.table.get_by_slug(data)
+        if obj is None:
+            self.fail('does_not_exist', slug_name=self.slug_field, value=data)
+        return obj
+
+
+class RowListSerializer(serializers.ListSerializer):
+    """Список, который строки .values() отдаёт быстрому пути элемента."""
+
+    def to_representation(self, data):
+        if isinstance(data, models.Manager):
+            data = data.all()
+        rows = list(data)
+        if rows and isinstance(rows[0], dict):
+            return self.child.represent_rows(rows)
+        return [self.child.to_representation(item) for item in rows]
+
+
+class RowSerializerMixin:
+    """Быстрый путь чтения списков без обхода дерева полей.
+
+    План - имена полей, столбцы и преобразования значений - собирается
+    один раз на класс по полям его экземпляра без контекста: CharField и
+    IntegerField преобразуются встроенными str и int, остальные поля -
+    своим to_representation, SerializerMethodField - методом row_<имя>
+    по значению столбца row_columns[имя]. Словари строятся по столбцам
+    .values() или атрибутам объектов с тем же порядком ключей и
+    значениями, что и to_representation, поэтому JSON совпадает байт в
+    байт.
+    """
+    row_columns = {}
+    row_converters = {
+        serializers.CharField: str,
+        serializers.IntegerField: int,
+        serializers.ReadOnlyField: None,
+        AnnotationField: None,
+    }
+
+    @classmethod
+    def get_row_plan(cls):
+        plan = cls.__dict__.get('row_plan')
+        if plan is None:
+            plan = cls.row_plan = cls().compile_row_plan()
+        return plan
+
+    @classmethod
+    def query_columns(cls):
+        """Столбцы для .values() выборки списка."""
+        return tuple(dict.fromkeys(cls.get_row_plan()[1]))
+
+    def compile_row_plan(self):
+        names, columns, converters = [], [], []
+        for field in self._readable_fields:
+            name = field.field_name
+            names.append(name)
+            if isinstance(field, serializers.SerializerMethodField):
+                columns.append(self.row_columns[name])
+                # Метод связывается с сериализатором при каждом вызове.
+                converters.append((name, f'row_{name}'))
+                continue
+            columns.append(getattr(field, 'annotation', field.source))
+            convert = self.row_converters.get(
+                type(field), field.to_representation
+            )
+            if convert is not None:
+                converters.append((name, convert))
+        return names, columns, converters
+
+    def represent(self, items, getter):
+        names, columns, converters = self.get_row_plan()
+        get = getter(*columns)
+        data = [dict(zip(names, get(item))) for item in items]
+        for name, convert in converters:
+            if isinstance(convert, str):
+                convert = getattr(self, convert)
+            for item in data:
+                value = item[name]
+                if value is not None:
+                    item[name] = convert(value)
+        return data
+
+    def represent_rows(self, rows):
+        """Представления строк .values(*query_columns())."""
+        return self.represent(rows, itemgetter)
+
+    def represent_objects(self, objects):
+        return self.represent(objects, attrgetter)
+
+
+class CategorySerializer(RowSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = ('name', 'slug',)
 
 
-class GenreSerializer(serializers.ModelSerializer):
+class GenreSerializer(RowSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Genre
         fields = ('name', 'slug',)
 
 
-class TitleSafeSerializer(serializers.ModelSerializer):
-    genre = GenreSerializer(many=True)
-    category = CategorySerializer()
+class TitleSafeSerializer(RowSerializerMixin, serializers.ModelSerializer):
+    """Произведение для чтения.
+
+    Категория и жанры берутся из копий таблиц в памяти процесса по id:
+    выборке нужны только строки произведений и связей с жанрами
+    (genretitle_set, а для строк .values() - отдельный запрос связей).
+    """
+    genre = serializers.SerializerMethodField()
+    category = serializers.SerializerMethodField()
     rating = serializers.IntegerField(read_only=True)
+    row_columns = {'genre': 'id', 'category': 'category_id'}
 
     class Meta:
         model = Title
@@ -44,19 +177,71 @@ class TitleSafeSerializer(serializers.ModelSerializer):
             'category'
         )
         read_only_fields = fields
+        list_serializer_class = RowListSerializer
 
+    def get_genre(self, title):
+        return GenreSerializer(genres.get_many(
+            link.genre_id for link in title.genretitle_set.all()
+        ), many=True).data
 
-class TitleSerializer(serializers.ModelSerializer):
-    genre = serializers.SlugRelatedField(
-        queryset=Genre.objects.all(),
-        many=True,
-        slug_field='slug'
-    )
-    category = serializers.SlugRelatedField(
-        queryset=Category.objects.all(),
-        slug_field='slug'
+    def get_category(self, title):
+        if title.category_id is None:
+            return None
+        category = categories.get(title.category_id)
+        return CategorySerializer(category).data if category else None
+
+    @cached_property
+    def genre_serializer(self):
+        return GenreSerializer()
+
+    @cached_property
+    def category_serializer(self):
+        return CategorySerializer()
+
+    def represent_rows(self, rows):
+        self.genre_ids = defaultdict(list)
+        for title_id, genre_id in GenreTitle.objects.filter(
+            title_id__in=[row['id'] for row in rows]
+        ).values_list('title_id', 'genre_id'):
+            self.genre_ids[title_id].append(genre_id)
+        return super().represent_rows(rows)
+
+    def row_genre(self, title_id):
+        return self.genre_serializer.represent_objects(
+            genres.get_many(self.genre_ids[title_id])
+        )
+
+    def row_category(self, category_id):
+        category = categories.get(category_id)
+        if category is None:
+            return None
+        return self.category_serializer.represent_objects([category])[0]
+
+
+class TitleStatsSerializer(serializers.Serializer):
+    """Статистика оценок произведения по его счётчикам, без чтения отзывов."""
+    count = serializers.IntegerField(source='rating_count')
+    mean = serializers.FloatField(source='rating')
+    median = serializers.FloatField(source='score_median')
+    histogram = serializers.SerializerMethodField()
+
+    fields_to_load = (
+        'rating_count',
+        'rating',
+        *(score_count_field(score) for score in SCORES),
     )
 
+    def get_histogram(self, title):
+        return [
+            {'score': score, 'count': count}
+            for score, count in title.score_counts.items()
+        ]
+
+
+class TitleSerializer(serializers.ModelSerializer):
+    genre = CachedSlugRelatedField(genres, many=True)
+    category = CachedSlugRelatedField(categories)
+
     def to_representation(self, instance):
         return TitleSafeSerializer(instance).data
 
@@ -71,42 +256,42 @@ class TitleSerializer(serializers.ModelSerializer):
         )
 
 
-class ReviewSerializer(serializers.ModelSerializer):
-    author = serializers.SlugRelatedField(
-        read_only=True,
-        slug_field='username'
-    )
+class TitleBulkItemSerializer(serializers.ModelSerializer):
+    """Элемент пакетного создания: слаги проверяются без запросов к базе."""
+    genre = serializers.ListField(child=serializers.SlugField())
+    category = serializers.SlugField()
+
+    class Meta:
+        model = Title
+        fields = (
+            'name',
+            'year',
+            'description',
+            'genre',
+            'category',
+        )
+
+
+class ReviewSerializer(RowSerializerMixin, serializers.ModelSerializer):
+    author = AnnotationField('author_username', source='author.username')
     score = serializers.IntegerField(
         min_value=settings.MIN_SCORE,
         max_value=settings.MAX_SCORE
     )
 
-    def validate(self, data):
-        if self.context['request'].method != 'POST':
-            return data
-        author = self.context['request'].user
-        title_id = self.context['request'].parser_context['kwargs']['title_id']
-        if Review.objects.filter(title_id=title_id, author=author).exists():
-            raise serializers.ValidationError(
-                f'Отзыв на произведение '
-                f'\'{Title.objects.get(id=title_id).name}\'уже существует'
-            )
-        return data
-
     class Meta:
         model = Review
         fields = ('id', 'text', 'author', 'score', 'pub_date')
+        list_serializer_class = RowListSerializer
 
 
-class CommentSerializer(serializers.ModelSerializer):
-    author = serializers.SlugRelatedField(
-        read_only=True,
-        slug_field='username'
-    )
+class CommentSerializer(RowSerializerMixin, serializers.ModelSerializer):
+    author = AnnotationField('author_username', source='author.username')
 
     class Meta:
         model = Comment
         fields = ('id', 'text', 'author', 'pub_date')
+        list_serializer_class = RowListSerializer
 
 
 class SignUpSerializer(serializers.Serializer):
@@ -0,0 +1,105 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_save
+)
+from django.dispatch import receiver
+
+from reviews.models import Category, Comment, Genre, Review, Title
+from reviews.signals import data_changed
+from .authentication import mark_claims_changed
+from .cache import (
+    ALL_SCOPE,
+    AUTHORS_SCOPE,
+    CATALOGUE_SCOPE,
+    CATEGORIES_SCOPE,
+    GENRES_SCOPE,
+    TITLES_SCOPE,
+    bump_versions,
+    comments_scope,
+    reviews_scope,
+    title_scope
+)
+from .lookups import categories, genres
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_token_claims(sender, instance, **kwargs):
+    mark_claims_changed(instance.pk, int(time.time()))
+
+
+@receiver(pre_save, sender=User)
+def invalidate_author_names(sender, instance, **kwargs):
+    if instance.pk is None:
+        return
+    if User.objects.filter(pk=instance.pk).exclude(
+        username=instance.username
+    ).exists():
+        bump_versions(AUTHORS_SCOPE)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_categories(sender, instance, **kwargs):
+    bump_versions(CATEGORIES_SCOPE, CATALOGUE_SCOPE)
+    transaction.on_commit(categories.clear)
+
+
+@receiver(post_save, sender=Genre)
+@receiver(post_delete, sender=Genre)
+def invalidate_genres(sender, instance, **kwargs):
+    bump_versions(GENRES_SCOPE, CATALOGUE_SCOPE)
+    transaction.on_commit(genres.clear)
+
+
+@receiver(post_save, sender=Title)
+@receiver(post_delete, sender=Title)
+def invalidate_title(sender, instance, **kwargs):
+    bump_versions(TITLES_SCOPE, title_scope(instance.pk))
+
+
+@receiver(m2m_changed, sender=Title.genre.through)
+def invalidate_title_genres(sender, instance, action, reverse, **kwargs):
+    if not action.startswith('post_'):
+        return
+    if reverse:
+        bump_versions(CATALOGUE_SCOPE)
+    else:
+        bump_versions(TITLES_SCOPE, title_scope(instance.pk))
+
+
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+def invalidate_review(sender, instance, **kwargs):
+    bump_versions(
+        TITLES_SCOPE,
+        title_scope(instance.title_id),
+        reviews_scope(instance.title_id)
+    )
+
+
+@receiver(pre_save, sender=Review)
+def invalidate_moved_review(sender, instance, **kwargs):
+    # Отзыв перенесён к другому произведению: меняются рейтинг и
+    # статистика оценок прежнего.
+    old_title_id = getattr(instance, '_loaded_values', {}).get('title_id')
+    if old_title_id is not None and old_title_id != instance.title_id:
+        bump_versions(title_scope(old_title_id), reviews_scope(old_title_id))
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+def invalidate_comment(sender, instance, **kwargs):
+    bump_versions(comments_scope(instance.review_id))
+
+
+@receiver(data_changed)
+def invalidate_all(sender, **kwargs):
+    bump_versions(ALL_SCOPE)
+    transaction.on_commit(categories.clear)
+    transaction.on_commit(genres.clear)
@@ -8,6 +8,9 @@ from .views import (
     CommentViewSet,
     signup,
     get_token,
+    export_titles,
+    export_reviews,
+    search,
     UserViewSet
 )
 
@@ -33,7 +36,14 @@ auth_urlpatterns = [
     path('token/', get_token, name='token'),
 ]
 
+export_urlpatterns = [
+    path('titles/', export_titles, name='export-titles'),
+    path('reviews/', export_reviews, name='export-reviews'),
+]
+
 urlpatterns = [
     path('v1/', include(v1_router.urls)),
     path('v1/auth/', include(auth_urlpatterns)),
+    path('v1/export/', include(export_urlpatterns)),
+    path('v1/search/', search, name='search'),
 ]
@@ -1,37 +1,63 @@
 from django.conf import settings
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from django.contrib.auth import get_user_model
-from django.core.mail import send_mail
 from django.contrib.auth.tokens import default_token_generator
-from django.db.models import Avg
 from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import status
-from rest_framework import viewsets, permissions
-from rest_framework.decorators import api_view, action
+from rest_framework import generics, status
+from rest_framework import viewsets
+from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import SAFE_METHODS
-from rest_framework.filters import SearchFilter
+from rest_framework.filters import OrderingFilter
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 from rest_framework.viewsets import ModelViewSet
-from rest_framework_simplejwt.tokens import AccessToken
 
 from api_yamdb.settings import ADMIN_EMAIL
+from reviews.mail_queue import enqueue_mail
 from reviews.models import Category, Genre, Title, Review
-from .base_views import SearchableViewSet
-from .filters import TitleFilter
-from .permissions import (
-    IsAdminModeratorAuthorOrReadOnly,
-    IsAdminUserOrReadOnly,
-    IsAdmin
+from .async_views import AsyncReadMixin
+from .authentication import ClaimsAccessToken
+from .base_views import (
+    NestedPostViewSet,
+    RowListMixin,
+    SearchableViewSet,
+    SerializeMetricsMixin
 )
+from .bulk import create_titles
+from .cache import (
+    AUTHORS_SCOPE,
+    CATALOGUE_SCOPE,
+    CATEGORIES_SCOPE,
+    GENRES_SCOPE,
+    TITLES_SCOPE,
+    CachedResponseMixin,
+    CachedRetrieveMixin,
+    comments_scope,
+    reviews_scope,
+    title_scope
+)
+from .export import (
+    REVIEW_FIELDS,
+    TITLE_FIELDS,
+    get_since,
+    review_rows,
+    stream,
+    title_rows
+)
+from .filters import AutocompleteSearchFilter, TitleFilter
+from .lookups import categories, genres
+from .permissions import IsAdminUserOrReadOnly, IsAdmin
+from .search import search_response
 from .serializers import (
     CategorySerializer,
     GenreSerializer,
     TitleSafeSerializer,
     TitleSerializer,
+    TitleStatsSerializer,
     ReviewSerializer,
     CommentSerializer,
     SignUpSerializer,
@@ -42,63 +68,123 @@ from .serializers import (
 User = get_user_model()
 
 
-class CategoryViewSet(SearchableViewSet):
+class CategoryViewSet(CachedResponseMixin, SearchableViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
+    cache_scopes = (CATEGORIES_SCOPE,)
+    search_cache = categories
 
 
-class GenreViewSet(SearchableViewSet):
+class GenreViewSet(CachedResponseMixin, SearchableViewSet):
     queryset = Genre.objects.all()
     serializer_class = GenreSerializer
+    cache_scopes = (GENRES_SCOPE,)
+    search_cache = genres
 
 
-class TitleViewSet(viewsets.ModelViewSet):
+class TitleViewSet(AsyncReadMixin, SerializeMetricsMixin, RowListMixin,
+                   CachedRetrieveMixin, viewsets.ModelViewSet):
     queryset = Title.objects.prefetch_related(
-        'reviews').annotate(
-            rating=Avg('reviews__score')
-    ).order_by(*Title._meta.ordering)
-    filter_backends = (DjangoFilterBackend,)
+        'genretitle_set').order_by(*Title._meta.ordering)
+    filter_backends = (DjangoFilterBackend, OrderingFilter)
     filterset_class = TitleFilter
+    ordering_fields = ('rating', 'year', 'name')
+    cache_scopes = (CATALOGUE_SCOPE, TITLES_SCOPE)
     permission_classes = (IsAdminUserOrReadOnly,)
     http_method_names = ('get', 'post', 'patch', 'delete')
 
     def get_serializer_class(self):
+        if self.action == 'stats':
+            return TitleStatsSerializer
         if self.request.method in SAFE_METHODS:
             return TitleSafeSerializer
         return TitleSerializer
 
+    def get_cache_scopes(self):
+        if self.action == 'retrieve':
+            return (CATALOGUE_SCOPE, title_scope(self.kwargs['pk']))
+        if self.action == 'stats':
+            return (title_scope(self.kwargs['pk']),)
+        return super().get_cache_scopes()
 
-class ReviewViewSet(viewsets.ModelViewSet):
-    serializer_class = ReviewSerializer
-    permission_classes = (permissions.IsAuthenticatedOrReadOnly,
-                          IsAdminModeratorAuthorOrReadOnly)
-    http_method_names = ('get', 'post', 'patch', 'delete')
+    @action(detail=True, methods=['get'])
+    def stats(self, request, pk=None):
+        return self.cached_response(self.read_stats, request, pk=pk)
 
-    def get_title(self):
-        return get_object_or_404(Title, id=self.kwargs['title_id'])
+    def read_stats(self, request, pk):
+        title = generics.get_object_or_404(
+            Title.objects.only(*TitleStatsSerializer.fields_to_load), pk=pk
+        )
+        return Response(self.get_serializer(title).data)
 
-    def get_queryset(self):
-        return self.get_title().reviews.all()
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        if not isinstance(request.data, list):
+            raise ValidationError('Ожидается список произведений.')
+        if not request.data:
+            raise ValidationError('Список произведений пуст.')
+        if len(request.data) > settings.TITLES_BULK_MAX_SIZE:
+            raise ValidationError(
+                f'За один запрос можно создать не более '
+                f'{settings.TITLES_BULK_MAX_SIZE} произведений.'
+            )
+        results = create_titles(request.data)
+        created = any('id' in result for result in results)
+        return Response(
+            results,
+            status=status.HTTP_201_CREATED if created
+            else status.HTTP_400_BAD_REQUEST
+        )
+
+
+class ReviewViewSet(NestedPostViewSet):
+    serializer_class = ReviewSerializer
+    parent_model = Title
+    parent_field = 'title'
 
+    def get_cache_scopes(self):
+        return (reviews_scope(self.parent_id), AUTHORS_SCOPE)
+
+    @transaction.atomic
     def perform_create(self, serializer):
-        serializer.save(author=self.request.user, title=self.get_title())
+        # Повторный отзыв отсекает ограничение unique_review в базе.
+        try:
+            with transaction.atomic():
+                super().perform_create(serializer)
+        except IntegrityError:
+            name = Title.objects.values_list('name', flat=True).get(
+                pk=self.parent_id
+            )
+            raise ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: [
+                    f'Отзыв на произведение \'{name}\'уже существует'
+                ]
+            })
+
+    @transaction.atomic
+    def perform_update(self, serializer):
+        serializer.save()
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(NestedPostViewSet):
     serializer_class = CommentSerializer
-    permission_classes = (permissions.IsAuthenticatedOrReadOnly,
-                          IsAdminModeratorAuthorOrReadOnly)
-    http_method_names = ('get', 'post', 'patch', 'delete')
+    parent_model = Review
+    parent_field = 'review'
 
-    def get_review(self):
-        return get_object_or_404(Review, id=self.kwargs['review_id'])
+    def get_cache_scopes(self):
+        return (comments_scope(self.parent_id), AUTHORS_SCOPE)
 
-    def get_queryset(self):
-        return self.get_review().comments.all()
+    def get_parent_lookup(self):
+        return {'pk': self.parent_id, 'title_id': self.kwargs['title_id']}
 
-    def perform_create(self, serializer):
-        review = self.get_review()
-        serializer.save(author=self.request.user, review=review)
+    def get_queryset(self):
+        return super().get_queryset().filter(
+            review__title_id=self.kwargs['title_id']
+        )
 
 
 @api_view(['POST'])
@@ -119,12 +205,11 @@ def signup(request):
             )
         )
     confirmation_code = default_token_generator.make_token(user)
-    send_mail(
+    enqueue_mail(
         'Код подтверждения',
         f'Ваш код подтверждения: {confirmation_code}',
         ADMIN_EMAIL,
         [user.email],
-        fail_silently=False,
     )
     return Response(serializer.data, status=status.HTTP_200_OK)
 
@@ -138,17 +223,38 @@ def get_token(request):
     user = get_object_or_404(User, username=username)
     if not default_token_generator.check_token(user, confirmation_code):
         raise ValidationError({"detail": "Неверный код подтверждения"})
-    access_token = AccessToken.for_user(user)
+    access_token = ClaimsAccessToken.for_user(user)
     return Response({
         'access': str(access_token),
     }, status=status.HTTP_200_OK)
 
 
-class UserViewSet(ModelViewSet):
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def export_titles(request):
+    since, _ = get_since(request, with_date=False)
+    return stream(request, title_rows(since), TITLE_FIELDS, 'titles')
+
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def export_reviews(request):
+    since, since_date = get_since(request)
+    return stream(
+        request, review_rows(since, since_date), REVIEW_FIELDS, 'reviews'
+    )
+
+
+@api_view(['GET'])
+def search(request):
+    return search_response(request)
+
+
+class UserViewSet(SerializeMetricsMixin, ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     lookup_field = 'username'
-    filter_backends = [SearchFilter]
+    filter_backends = [AutocompleteSearchFilter]
     search_fields = ['username']
     pagination_class = PageNumberPagination
     http_method_names = ['get', 'post', 'patch', 'delete']
@@ -160,12 +266,15 @@ class UserViewSet(ModelViewSet):
             permission_classes=[IsAuthenticated])
     def myself(self, request):
         user = request.user
+        if not isinstance(user, User):
+            # Пользователь восстановлен из токена, профиль берём из базы.
+            user = get_object_or_404(User, pk=user.pk)
         if request.method == 'GET':
-            return Response(UserSerializer(user).data)
+            return Response(self.get_serializer(user).data)
 
         data = request.data.copy()
         data.pop('role', None)
-        serializer = UserSerializer(
+        serializer = self.get_serializer(
             user,
             data=data,
             partial=True
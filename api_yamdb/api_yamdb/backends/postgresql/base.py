@@ -0,0 +1,115 @@
+"""PostgreSQL с проверкой постоянных соединений и локальным пулом.
+
+Настройки в DATABASES (дополнительно к стандартным):
+
+- CONN_HEALTH_CHECKS - перед первым запросом к базе в каждом HTTP-запросе
+  постоянное соединение проверяется (SELECT 1) и при обрыве заменяется
+  новым, а не возвращает ошибку пользователю;
+- POOL - словарь с min_size и max_size: соединения берутся из пула
+  процесса и возвращаются в него при закрытии. Пул хранит до min_size
+  свободных соединений и открывает не больше max_size одновременно
+  (max_size должен быть не меньше числа потоков процесса). С пулом
+  CONN_MAX_AGE обычно 0: соединение возвращается в пул в конце каждого
+  запроса.
+"""
+import threading
+
+import psycopg2.extras
+from psycopg2 import pool
+from django.db.backends.postgresql import base, creation
+
+pools = {}
+pools_lock = threading.Lock()
+
+
+def get_pool(conn_params, min_size=1, max_size=10):
+    """Пул соединений процесса для набора параметров подключения."""
+    key = repr(sorted(conn_params.items()))
+    with pools_lock:
+        if key not in pools:
+            pools[key] = pool.ThreadedConnectionPool(
+                min_size, max_size, **conn_params
+            )
+        return pools[key]
+
+
+def close_pools():
+    """Закрыть все соединения пулов процесса."""
+    with pools_lock:
+        for connection_pool in pools.values():
+            connection_pool.closeall()
+        pools.clear()
+
+
+class DatabaseCreation(creation.DatabaseCreation):
+
+    def _destroy_test_db(self, test_database_name, verbosity):
+        # Свободные соединения пула с тестовой базой мешают её удалить.
+        close_pools()
+        super()._destroy_test_db(test_database_name, verbosity)
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    health_check_done = False
+    connection_pool = None
+    creation_class = DatabaseCreation
+
+    def get_new_connection(self, conn_params):
+        options = self.settings_dict.get('POOL')
+        if not options:
+            return super().get_new_connection(conn_params)
+        self.connection_pool = get_pool(conn_params, **options)
+        connection = self.checkout()
+        # Дальше - как при новом соединении в base.DatabaseWrapper.
+        try:
+            self.isolation_level = (
+                self.settings_dict['OPTIONS']['isolation_level']
+            )
+        except KeyError:
+            self.isolation_level = connection.isolation_level
+        else:
+            if self.isolation_level != connection.isolation_level:
+                connection.set_session(isolation_level=self.isolation_level)
+        psycopg2.extras.register_default_jsonb(
+            conn_or_curs=connection, loads=lambda x: x
+        )
+        return connection
+
+    def checkout(self):
+        """Взять из пула рабочее соединение, отбрасывая оборванные."""
+        while True:
+            connection = self.connection_pool.getconn()
+            connection.autocommit = False
+            if not self.settings_dict.get('CONN_HEALTH_CHECKS'):
+                return connection
+            try:
+                connection.cursor().execute('SELECT 1')
+                connection.rollback()
+                return connection
+            except psycopg2.Error:
+                self.connection_pool.putconn(connection, close=True)
+
+    def _close(self):
+        if self.connection_pool is None:
+            return super()._close()
+        if self.connection is not None:
+            # Пул сам откатывает незавершённую транзакцию и закрывает
+            # соединения с потерянной связью с сервером.
+            with self.wrap_database_errors:
+                self.connection_pool.putconn(
+                    self.connection, close=bool(self.connection.closed)
+                )
+
+    def close_if_unusable_or_obsolete(self):
+        # Вызывается в начале и в конце HTTP-запроса.
+        super().close_if_unusable_or_obsolete()
+        self.health_check_done = False
+
+    def ensure_connection(self):
+        if (self.connection is not None
+                and not self.health_check_done
+                and self.settings_dict.get('CONN_HEALTH_CHECKS')):
+            self.health_check_done = True
+            if not self.is_usable():
+                self.close()
+        super().ensure_connection()
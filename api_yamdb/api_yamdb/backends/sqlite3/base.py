@@ -0,0 +1,26 @@
+"""SQLite с настройкой соединений через PRAGMA.
+
+Настройки в DATABASES (дополнительно к стандартным):
+
+- PRAGMAS - словарь PRAGMA, которые выполняются для каждого нового
+  соединения, например {'journal_mode': 'wal', 'busy_timeout': 5000}.
+  В режиме WAL читатели не ждут писателя, а писатели ждут друг друга
+  busy_timeout миллисекунд вместо немедленной ошибки database is locked;
+- TRANSACTION_MODE - IMMEDIATE, чтобы транзакция сразу брала блокировку
+  записи. Иначе транзакция, начавшая с чтения, при попытке записи после
+  чужого коммита получает database is locked без ожидания.
+"""
+from django.db.backends.sqlite3 import base
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_new_connection(self, conn_params):
+        connection = super().get_new_connection(conn_params)
+        for name, value in self.settings_dict.get('PRAGMAS', {}).items():
+            connection.execute(f'PRAGMA {name} = {value}')
+        return connection
+
+    def _start_transaction_under_autocommit(self):
+        mode = self.settings_dict.get('TRANSACTION_MODE')
+        self.cursor().execute(f'BEGIN {mode}' if mode else 'BEGIN')
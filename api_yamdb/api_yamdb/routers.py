@@ -0,0 +1,24 @@
+from contextvars import ContextVar
+
+REPLICA_ALIAS = 'replica'
+
+# Включается api.middleware.ReadReplicaMiddleware на время безопасных
+# запросов к API.
+use_replica = ContextVar('use_replica', default=False)
+
+
+class ReadReplicaRouter:
+    """Чтение в безопасных запросах к API - из базы только для чтения."""
+
+    def db_for_read(self, model, **hints):
+        return REPLICA_ALIAS if use_replica.get() else None
+
+    def db_for_write(self, model, **hints):
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Реплика - та же база, объекты из неё связываются с основными.
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        return False if db == REPLICA_ALIAS else None
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from datetime import timedelta
 
@@ -37,6 +38,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'api.middleware.ReadReplicaMiddleware',
+    'api.middleware.MetricsMiddleware',
 ]
 
 ROOT_URLCONF = 'api_yamdb.urls'
@@ -63,13 +66,122 @@ WSGI_APPLICATION = 'api_yamdb.wsgi.application'
 
 # Database
 
-DATABASES = {
+# База данных выбирается переменной окружения DB_ENGINE: sqlite3
+# (по умолчанию) или postgresql.
+
+
+def env_bool(name, default):
+    return os.getenv(name, str(default)).lower() in ('1', 'true', 'yes')
+
+
+DB_ENGINE = os.getenv('DB_ENGINE', 'sqlite3')
+
+if DB_ENGINE == 'postgresql':
+    DB_POOL = env_bool('DB_POOL', False)
+    DATABASES = {
+        'default': {
+            'ENGINE': 'api_yamdb.backends.postgresql',
+            'NAME': os.getenv('POSTGRES_DB', 'api_yamdb'),
+            'USER': os.getenv('POSTGRES_USER', 'postgres'),
+            'PASSWORD': os.getenv('POSTGRES_PASSWORD', ''),
+            'HOST': os.getenv('DB_HOST', 'localhost'),
+            'PORT': os.getenv('DB_PORT', '5432'),
+            # С пулом соединение возвращается в пул после каждого запроса.
+            'CONN_MAX_AGE': int(
+                os.getenv('DB_CONN_MAX_AGE', 0 if DB_POOL else 60)
+            ),
+            'CONN_HEALTH_CHECKS': env_bool('DB_CONN_HEALTH_CHECKS', True),
+            'POOL': {
+                'min_size': int(os.getenv('DB_POOL_MIN_SIZE', 4)),
+                'max_size': int(os.getenv('DB_POOL_MAX_SIZE', 20)),
+            } if DB_POOL else None,
+            # Нужно за PgBouncer в режиме пула транзакций.
+            'DISABLE_SERVER_SIDE_CURSORS': env_bool(
+                'DB_DISABLE_SERVER_SIDE_CURSORS', False
+            ),
+        }
+    }
+else:
+    # SQLITE_TUNING включает режим WAL и настройки соединений ниже.
+    SQLITE_TUNING = env_bool('SQLITE_TUNING', True)
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'wal',
+        'synchronous': 'normal',
+        'mmap_size': 256 * 1024 * 1024,
+        # Отрицательное значение - размер кэша страниц в КиБ.
+        'cache_size': -64 * 1024,
+        'busy_timeout': 5000,
+    }
+    DATABASES = {
+        'default': {
+            'ENGINE': 'api_yamdb.backends.sqlite3',
+            'NAME': os.getenv('SQLITE_PATH', BASE_DIR / 'db.sqlite3'),
+            'CONN_MAX_AGE': int(os.getenv('DB_CONN_MAX_AGE', 0)),
+            'PRAGMAS': SQLITE_PRAGMAS if SQLITE_TUNING else {},
+            'TRANSACTION_MODE': 'IMMEDIATE' if SQLITE_TUNING else None,
+        }
+    }
+    # SQLITE_READ_REPLICA добавляет соединения только для чтения к тому же
+    # файлу: в них идут чтения безопасных запросов к API.
+    if env_bool('SQLITE_READ_REPLICA', False):
+        DATABASES['replica'] = {
+            **DATABASES['default'],
+            'PRAGMAS': {**DATABASES['default']['PRAGMAS'],
+                        'query_only': 'on'},
+            'TRANSACTION_MODE': None,
+            'TEST': {'MIRROR': 'default'},
+        }
+        DATABASE_ROUTERS = ['api_yamdb.routers.ReadReplicaRouter']
+
+
+# Cache
+# LocMemCache подходит только для одного процесса: версии кэша ответов и
+# отметки об изменении пользователей в нём не видны другим процессам, и
+# они продолжают отдавать устаревшие ответы. Для нескольких процессов
+# используйте общий бэкенд, например
+# django.core.cache.backends.filebased.FileBasedCache или Redis-совместимый.
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     }
 }
 
+API_CACHE_ALIAS = 'default'
+API_CACHE_TIMEOUT = 300
+# Срок хранения версий областей кэша; должен быть заметно больше
+# API_CACHE_TIMEOUT.
+API_CACHE_VERSION_TIMEOUT = 3600
+# Как часто копии таблиц категорий и жанров в памяти процесса сверяются
+# с версией в общем кэше, секунды.
+LOOKUP_CACHE_CHECK_INTERVAL = 1
+
+
+# Request metrics
+
+METRICS_ENABLED = False
+METRICS_SAMPLE_RATE = 1.0
+METRICS_LOG_FILE = BASE_DIR / 'metrics.log'
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'metrics': {
+            'class': 'logging.FileHandler',
+            'filename': METRICS_LOG_FILE,
+            'delay': True,
+        },
+    },
+    'loggers': {
+        'api.metrics': {
+            'handlers': ['metrics'],
+            'level': 'INFO',
+            'propagate': False,
+        },
+    },
+}
+
 
 # Password validation
 AUTH_USER_MODEL = 'reviews.User'
@@ -111,15 +223,36 @@ STATICFILES_DIRS = ((BASE_DIR / 'static/'),)
 
 EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 
+# Доступные очереди: reviews.mail_queue.DatabaseMailQueue (письма
+# отправляет команда send_queued_mail), reviews.mail_queue.ThreadPoolMailQueue
+# (фоновый поток в процессе приложения), reviews.mail_queue.SyncMailQueue.
+MAIL_QUEUE_BACKEND = 'reviews.mail_queue.DatabaseMailQueue'
+MAIL_QUEUE_BATCH_SIZE = 100
+MAIL_QUEUE_MAX_ATTEMPTS = 5
+# Пауза перед повторной отправкой неотправленного письма, секунды.
+MAIL_QUEUE_RETRY_DELAY = 10
+# Сколько секунд занятое письмо скрыто от других процессов send_queued_mail.
+# Если отправитель упал, письмо снова станет доступно по истечении срока.
+MAIL_QUEUE_LOCK_TIMEOUT = 300
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'api.authentication.StatelessJWTAuthentication',
     ),
     'DEFAULT_FILTER_BACKENDS': (
         'rest_framework.filters.SearchFilter',
         'django_filters.rest_framework.DjangoFilterBackend',
     ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
+    'DEFAULT_RENDERER_CLASSES': (
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'PAGE_SIZE': 10,
 }
 
@@ -138,5 +271,16 @@ MAX_SCORE = 10
 MAX_STR_LENGTH = 15
 NAME_MAX_LENGTH = 255
 MYSELF_NAME = 'me'
+TITLES_BULK_MAX_SIZE = 5000
+# Асинхронные list и retrieve произведений, отзывов и комментариев;
+# включайте при запуске под ASGI (api_yamdb.asgi).
+ASYNC_READ_VIEWS = env_bool('ASYNC_READ_VIEWS', False)
+# Списки произведений, отзывов и комментариев сериализуются из строк
+# .values() без ModelSerializer (api.serializers.RowSerializerMixin).
+FAST_READ_SERIALIZERS = env_bool('FAST_READ_SERIALIZERS', True)
+# Конфигурация текстового поиска PostgreSQL (to_tsvector)
+SEARCH_CONFIG = 'russian'
+# Триграммные индексы pg_trgm для нечёткого поиска (search_mode=fuzzy)
+SEARCH_TRIGRAM_INDEX = True
 
 ADMIN_EMAIL = 'admin@yamdb.com'
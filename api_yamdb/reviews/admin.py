@@ -1,7 +1,9 @@
 from django.contrib import admin
 from django.contrib.admin.decorators import register
 
-from .models import User, Category, Comment, Genre, Review, Title
+from .models import (
+    User, Category, Comment, Genre, OutboxEmail, Review, Title
+)
 
 
 @register(User)
@@ -49,3 +51,11 @@ class CommentAdmin(admin.ModelAdmin):
     list_display = ('pk', 'review', 'author', 'text', 'pub_date')
     search_fields = ('text',)
     empty_value_display = '-пусто-'
+
+
+@register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ('pk', 'subject', 'recipients', 'created', 'sent_at',
+                    'attempts')
+    list_filter = ('sent_at',)
+    empty_value_display = '-пусто-'
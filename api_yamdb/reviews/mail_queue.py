@@ -0,0 +1,189 @@
+import logging
+import queue
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+_queues = {}
+
+
+def get_mail_queue():
+    """Вернуть очередь писем, заданную в settings.MAIL_QUEUE_BACKEND."""
+    path = settings.MAIL_QUEUE_BACKEND
+    if path not in _queues:
+        _queues[path] = import_string(path)()
+    return _queues[path]
+
+
+def enqueue_mail(subject, body, from_email, recipients):
+    get_mail_queue().enqueue(subject, body, from_email, recipients)
+
+
+def deliver(messages):
+    """Отправить письма через одно SMTP-соединение.
+
+    Возвращает список ошибок той же длины, что и messages:
+    None для доставленного письма или текст ошибки.
+    """
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as error:
+        return [str(error)] * len(messages)
+    errors = []
+    try:
+        for message in messages:
+            try:
+                connection.send_messages([message])
+                errors.append(None)
+            except Exception as error:
+                errors.append(str(error))
+    finally:
+        connection.close()
+    return errors
+
+
+class SyncMailQueue:
+    """Отправка письма прямо во время запроса."""
+
+    def enqueue(self, subject, body, from_email, recipients):
+        EmailMessage(subject, body, from_email, recipients).send()
+
+
+class DatabaseMailQueue:
+    """Очередь в таблице OutboxEmail.
+
+    Письма отправляет команда send_queued_mail.
+    """
+
+    def enqueue(self, subject, body, from_email, recipients):
+        OutboxEmail.objects.create(
+            subject=subject,
+            body=body,
+            from_email=from_email,
+            recipients=list(recipients)
+        )
+
+    def send_pending(self, batch_size=None, max_attempts=None):
+        """Отправить одну пачку писем, вернуть число доставленных.
+
+        Письма занимаются в короткой транзакции: счётчик попыток
+        увеличивается, а locked_until скрывает их от других отправителей
+        на MAIL_QUEUE_LOCK_TIMEOUT секунд. Отправка идёт вне транзакции.
+        Неотправленное письмо повторяется не раньше чем через
+        MAIL_QUEUE_RETRY_DELAY секунд.
+        """
+        emails = self.claim(
+            batch_size or settings.MAIL_QUEUE_BATCH_SIZE,
+            max_attempts or settings.MAIL_QUEUE_MAX_ATTEMPTS
+        )
+        if not emails:
+            return 0
+        errors = deliver([
+            EmailMessage(
+                email.subject,
+                email.body,
+                email.from_email,
+                email.recipients
+            )
+            for email in emails
+        ])
+        now = timezone.now()
+        retry_at = now + timedelta(seconds=settings.MAIL_QUEUE_RETRY_DELAY)
+        for email, error in zip(emails, errors):
+            if error is None:
+                email.sent_at = now
+                email.locked_until = None
+            else:
+                email.last_error = error
+                email.locked_until = retry_at
+        OutboxEmail.objects.bulk_update(
+            emails, ('sent_at', 'last_error', 'locked_until')
+        )
+        return errors.count(None)
+
+    @staticmethod
+    def claim(batch_size, max_attempts):
+        """Занять пачку писем, готовых к отправке."""
+        now = timezone.now()
+        with transaction.atomic():
+            emails = list(
+                OutboxEmail.objects.select_for_update(
+                    skip_locked=True
+                ).filter(
+                    Q(locked_until__isnull=True) | Q(locked_until__lte=now),
+                    sent_at__isnull=True,
+                    attempts__lt=max_attempts
+                )[:batch_size]
+            )
+            locked_until = now + timedelta(
+                seconds=settings.MAIL_QUEUE_LOCK_TIMEOUT
+            )
+            for email in emails:
+                email.attempts += 1
+                email.locked_until = locked_until
+            OutboxEmail.objects.bulk_update(
+                emails, ('attempts', 'locked_until')
+            )
+        return emails
+
+
+class ThreadPoolMailQueue:
+    """Очередь в памяти процесса с фоновым потоком отправки.
+
+    Неотправленные письма теряются при остановке процесса.
+    """
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.worker = None
+
+    def enqueue(self, subject, body, from_email, recipients):
+        self.queue.put(
+            (EmailMessage(subject, body, from_email, recipients), 0)
+        )
+        with self.lock:
+            if self.worker is None or not self.worker.is_alive():
+                self.worker = threading.Thread(
+                    target=self.run, name='mail-queue', daemon=True
+                )
+                self.worker.start()
+
+    def take_batch(self):
+        batch = [self.queue.get()]
+        while len(batch) < settings.MAIL_QUEUE_BATCH_SIZE:
+            try:
+                batch.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def run(self):
+        while True:
+            batch = self.take_batch()
+            errors = deliver([message for message, _ in batch])
+            failed = False
+            for (message, attempts), error in zip(batch, errors):
+                if error is None:
+                    continue
+                if attempts + 1 < settings.MAIL_QUEUE_MAX_ATTEMPTS:
+                    self.queue.put((message, attempts + 1))
+                    failed = True
+                else:
+                    logger.error(
+                        'Письмо для %s не отправлено: %s', message.to, error
+                    )
+            if failed:
+                time.sleep(settings.MAIL_QUEUE_RETRY_DELAY)
@@ -1,7 +1,12 @@
 import os
+
 import pandas as pd
-from django.core.management import BaseCommand
 from django.apps import apps
+from django.core.management import BaseCommand
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from reviews.signals import data_changed
 
 file_model_match = {
     'Category': 'category.csv',
@@ -12,19 +17,29 @@ file_model_match = {
     'Review': 'review.csv',
     'Comment': 'comments.csv',
 }
+CHUNK_SIZE = 1000
 
 
 class Command(BaseCommand):
     help = """Import of CSV data and creation/updating of model objects.
-    This command takes only one CSV file and model name at a time."""
+    Each file is read in chunks, foreign keys are checked against
+    in-memory sets of ids and rows are written with bulk operations
+    inside one transaction per file."""
 
     def add_arguments(self, parser):
         parser.add_argument(
             '--path', type=str, help='Path to folder with CSV files'
         )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=CHUNK_SIZE,
+            help='Number of CSV rows processed at once'
+        )
 
     def handle(self, *args, **kwargs):
         folder_path = kwargs.get('path')
+        chunk_size = kwargs['chunk_size']
 
         if not folder_path:
             self.stdout.write(
@@ -40,26 +55,43 @@ class Command(BaseCommand):
             )
             return
 
+        imported_models = []
         for model_name, file_name in file_model_match.items():
             file_path = os.path.join(folder_path, file_name)
-            file_df = self.read_csv(file_path)
-
-            if file_df is None:
+            if not os.path.exists(file_path):
                 self.stdout.write(
-                    self.style.ERROR(f'Файл {file_path} пуст.')
+                    self.style.ERROR(f'Файл {file_path} не найден.')
                 )
                 continue
+            model = self.get_model(model_name)
+            if not model:
+                continue
+            try:
+                with transaction.atomic():
+                    created, updated, skipped = self.import_file(
+                        file_path, model, chunk_size
+                    )
+            except Exception as e:
+                self.stdout.write(
+                    self.style.ERROR(
+                        f'Ошибка при импорте файла {file_path}: {e}'
+                    )
+                )
+                continue
+            imported_models.append(model)
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f'{model_name}: создано {created}, '
+                    f'обновлено {updated}, пропущено {skipped}'
+                )
+            )
 
-            if model_name == 'GenreTitle':
-                self.process_mtm_table(file_df, model_name)
-            else:
-                model = self.get_model(model_name)
-                if not model:
-                    continue
-                for _, row in file_df.iterrows():
-                    data = self.process_row(row, model)
-                    if data:
-                        self.save_model_object(data, model)
+        self.reset_sequences(imported_models)
+        if apps.get_model('reviews', 'Review') in imported_models:
+            apps.get_model('reviews', 'Title').objects.rebuild_ratings()
+        if imported_models:
+            # bulk_create и bulk_update не отправляют сигналы моделей.
+            data_changed.send(sender=self.__class__)
 
     def get_model(self, model_name):
         """Get the model from the app."""
@@ -73,84 +105,149 @@ class Command(BaseCommand):
             )
             return None
 
-    def read_csv(self, file_path):
-        """Read the CSV file."""
-        try:
-            return pd.read_csv(file_path)
-        except Exception as e:
-            self.stdout.write(
-                self.style.ERROR(
-                    f'Ошибка при чтении файла: {e}'
-                )
+    def get_columns(self, model):
+        """Map CSV columns to model attributes, considering _id suffix."""
+        columns = {}
+        for field in model._meta.concrete_fields:
+            if field.is_relation:
+                columns[f'{field.name}_id'] = field
+            columns[field.name] = field
+        return columns
+
+    def import_file(self, file_path, model, chunk_size):
+        """Import one CSV file chunk by chunk."""
+        columns = self.get_columns(model)
+        related_ids = {
+            field.attname: set(
+                field.related_model.objects.values_list('pk', flat=True)
             )
-            return None
+            for field in model._meta.concrete_fields if field.is_relation
+        }
+        unique_fields = self.get_unique_fields(model)
+        update_fields = set()
+        created = updated = skipped = 0
+        chunks = pd.read_csv(
+            file_path, chunksize=chunk_size, keep_default_na=False
+        )
+        for chunk in chunks:
+            fields = [columns[name] for name in chunk.columns
+                      if name in columns]
+            update_fields.update(
+                field.attname for field in fields if not field.primary_key
+            )
+            objects = []
+            for row in chunk.to_dict('records'):
+                data = self.process_row(row, columns, related_ids)
+                if data is None:
+                    skipped += 1
+                    continue
+                objects.append(model(**data))
+            new_objects, existing_objects = self.split_existing(
+                model, objects
+            )
+            new_objects = self.skip_duplicates(
+                model, new_objects, unique_fields
+            )
+            skipped += len(objects) - len(new_objects) - len(
+                existing_objects
+            )
+            model.objects.bulk_create(new_objects)
+            if existing_objects and update_fields:
+                model.objects.bulk_update(
+                    existing_objects, sorted(update_fields)
+                )
+            created += len(new_objects)
+            updated += len(existing_objects)
+        return created, updated, skipped
 
-    def process_mtm_table(self, file_df, model_name):
-        """Handle MTM relationships by populating the through table."""
-        if model_name == 'GenreTitle':
-            title_model = apps.get_model('reviews', 'Title')
-            genre_model = apps.get_model('reviews', 'Genre')
-            for _, row in file_df.iterrows():
-                try:
-                    title = title_model.objects.get(id=row['title_id'])
-                    genre = genre_model.objects.get(id=row['genre_id'])
-                    title.genre.add(genre)
+    def process_row(self, row, columns, related_ids):
+        """Convert a CSV row to model data, None if a relation is missing."""
+        data = {}
+        for name, value in row.items():
+            field = columns.get(name)
+            if field is None:
+                continue
+            if field.is_relation:
+                value = None if value == '' else int(value)
+                if value is not None and value not in related_ids[
+                    field.attname
+                ]:
                     self.stdout.write(
-                        self.style.SUCCESS(
-                            f'Связь добавлена: Title {title.id} - '
-                            f'Genre {genre.id}'
+                        self.style.ERROR(
+                            f'Строка {row}: объект '
+                            f'{field.related_model.__name__} с id={value} '
+                            f'не найден'
                         )
                     )
-                except Exception as e:
+                    return None
+            data[field.attname] = value
+        return data
+
+    def get_unique_fields(self, model):
+        """Sets of attnames that must be unique, besides the primary key."""
+        opts = model._meta
+        names = [
+            *opts.unique_together,
+            *(
+                constraint.fields
+                for constraint in opts.total_unique_constraints
+            ),
+            *((field.name,) for field in opts.concrete_fields
+              if field.unique and not field.primary_key),
+        ]
+        return [
+            tuple(opts.get_field(name).attname for name in fields)
+            for fields in names
+        ]
+
+    def skip_duplicates(self, model, objects, unique_fields):
+        """Drop new objects repeating a unique key of the table or chunk.
+
+        Such a row would fail the whole file with IntegrityError.
+        """
+        for fields in unique_fields:
+            keys = {
+                tuple(getattr(obj, name) for name in fields)
+                for obj in objects
+            }
+            taken = set(model.objects.filter(**{
+                f'{fields[0]}__in': {key[0] for key in keys}
+            }).values_list(*fields))
+            kept = []
+            for obj in objects:
+                key = tuple(getattr(obj, name) for name in fields)
+                if None not in key and key in taken:
                     self.stdout.write(
-                        self.style.ERROR(f'Ошибка: {e}')
-                    )
-
-    def process_row(self, row, model):
-        """Process a single row of CSV data and return the model data."""
-        data = {}
-        for field in model._meta.fields:
-            field_name = field.name
-
-            if field.is_relation:
-                data[field_name] = self.get_related_object(
-                    field, field_name, row
-                )
-            elif field_name in row:
-                data[field_name] = row[field_name]
-
-        return data if data else None
-
-    def get_related_object(self, field, field_name, row):
-        """Handle related fields, considering _id suffix and field name."""
-        related_field_name = f'{field_name}_id'
-
-        if related_field_name in row:
-            return field.related_model.objects.get(id=row[related_field_name])
-        elif field_name in row:
-            return field.related_model.objects.get(id=row[field_name])
-
-        return None
-
-    def save_model_object(self, data, model):
-        """Save or update the model object."""
-        try:
-            obj, created = model.objects.update_or_create(**data)
-            if created:
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f'Создан объект {model.__name__}: {obj}'
+                        self.style.ERROR(
+                            f'Строка с id={obj.pk}: {model.__name__} с '
+                            f'{", ".join(fields)}={key} уже существует'
+                        )
                     )
-                )
+                    continue
+                taken.add(key)
+                kept.append(obj)
+            objects = kept
+        return objects
+
+    def split_existing(self, model, objects):
+        """Split objects into new ones and those already in the database."""
+        existing_ids = set(
+            model.objects.filter(
+                pk__in=[obj.pk for obj in objects if obj.pk is not None]
+            ).values_list('pk', flat=True)
+        )
+        new_objects = []
+        existing_objects = []
+        for obj in objects:
+            if obj.pk in existing_ids:
+                existing_objects.append(obj)
             else:
-                self.stdout.write(
-                    self.style.SUCCESS(
-                        f'Обновлен объект {model.__name__}: {obj}'
-                    )
-                )
-        except Exception as e:
-            self.stdout.write(
-                self.style.ERROR(
-                    f'Ошибка при сохранении объекта {model.__name__}: {e}'
-                )
-            )
+                new_objects.append(obj)
+        return new_objects, existing_objects
+
+    def reset_sequences(self, models):
+        """Move id sequences past explicitly imported ids."""
+        statements = connection.ops.sequence_reset_sql(no_style(), models)
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
@@ -0,0 +1,19 @@
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from reviews.models import Title
+from reviews.signals import data_changed
+
+
+class Command(BaseCommand):
+    help = """Rebuild denormalized rating columns of titles from reviews."""
+
+    def handle(self, *args, **kwargs):
+        with transaction.atomic():
+            updated = Title.objects.rebuild_ratings()
+        data_changed.send(sender=self.__class__)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Рейтинг пересчитан для {updated} произведений'
+            )
+        )
@@ -0,0 +1,13 @@
+from django.core.management import BaseCommand
+from django.db import transaction
+
+from reviews import search
+
+
+class Command(BaseCommand):
+    help = """Recreate full-text search tables, triggers and indexes."""
+
+    def handle(self, *args, **kwargs):
+        with transaction.atomic():
+            search.install()
+        self.stdout.write(self.style.SUCCESS('Поисковый индекс перестроен'))
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management import BaseCommand
+
+from reviews.mail_queue import DatabaseMailQueue
+
+
+class Command(BaseCommand):
+    help = """Send e-mails queued in the outbox table.
+    With --loop the command keeps polling the outbox."""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, help='Messages per SMTP connection'
+        )
+        parser.add_argument(
+            '--loop', action='store_true', help='Keep polling the outbox'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=5,
+            help='Seconds between polls of an empty outbox'
+        )
+
+    def handle(self, *args, **kwargs):
+        mail_queue = DatabaseMailQueue()
+        while True:
+            sent = mail_queue.send_pending(kwargs['batch_size'])
+            if sent:
+                self.stdout.write(
+                    self.style.SUCCESS(f'Отправлено писем: {sent}')
+                )
+            if not kwargs['loop']:
+                return
+            if not sent:
+                time.sleep(kwargs['interval'])
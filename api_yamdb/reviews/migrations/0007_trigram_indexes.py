@@ -0,0 +1,24 @@
+from django.db import migrations
+
+
+def install_trigram(apps, schema_editor):
+    from reviews import search
+
+    search.install_trigram(schema_editor.connection)
+
+
+def uninstall_trigram(apps, schema_editor):
+    from reviews import search
+
+    search.uninstall_trigram(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0006_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_trigram, uninstall_trigram),
+    ]
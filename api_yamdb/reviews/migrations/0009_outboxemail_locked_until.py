@@ -0,0 +1,18 @@
+# Generated by Django 3.2 on 2026-10-18 06:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0008_title_score_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outboxemail',
+            name='locked_until',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Не отправлять до'),
+        ),
+    ]
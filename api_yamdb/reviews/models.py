@@ -1,3 +1,4 @@
+from collections import Counter
 from enum import Enum
 
 from django.conf import settings
@@ -5,6 +6,11 @@ from django.contrib.auth.models import AbstractUser
 from django.core.exceptions import ValidationError
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.db import models
+from django.db.models import (
+    Avg, Case, Count, ExpressionWrapper, F, FloatField, OuterRef, Subquery,
+    Sum, Value, When
+)
+from django.db.models.functions import Cast, Coalesce, Lower
 from django.utils import timezone
 
 from .constants import (
@@ -93,6 +99,10 @@ class User(AbstractUser):
         ordering = ('username',)
         verbose_name = 'Пользователь'
         verbose_name_plural = 'Пользователи'
+        indexes = (
+            # Поиск по началу псевдонима без учёта регистра.
+            models.Index(Lower('username'), name='user_username_lower_idx'),
+        )
 
     def __str__(self):
         return self.username
@@ -146,6 +156,80 @@ class Genre(BaseNameSlugModel):
         verbose_name_plural = 'Жанры'
 
 
+SCORES = range(MIN_SCORE, MAX_SCORE + 1)
+
+
+def score_count_field(score):
+    """Имя поля Title с количеством оценок score."""
+    return f'score_{score}_count'
+
+
+class TitleQuerySet(models.QuerySet):
+
+    def change_rating(self, added=None, removed=None):
+        """Атомарно учесть новую и снятую оценки и пересчитать рейтинг.
+
+        Сумма, количество и счётчики оценок по значениям вычисляются из
+        старых значений строки в одном UPDATE, поэтому параллельные отзывы
+        не теряют обновлений.
+        """
+        deltas = Counter()
+        if added is not None:
+            deltas[added] += 1
+        if removed is not None:
+            deltas[removed] -= 1
+        score = sum(value * delta for value, delta in deltas.items())
+        count = sum(deltas.values())
+        return self.update(
+            **{
+                score_count_field(value): F(score_count_field(value)) + delta
+                for value, delta in deltas.items() if delta
+            },
+            rating_sum=F('rating_sum') + score,
+            rating_count=F('rating_count') + count,
+            rating=Case(
+                When(rating_count=-count, then=Value(None)),
+                default=ExpressionWrapper(
+                    Cast(F('rating_sum') + score, FloatField())
+                    / (F('rating_count') + count),
+                    output_field=FloatField()
+                ),
+                output_field=FloatField()
+            )
+        )
+
+    def rebuild_ratings(self):
+        """Пересчитать рейтинговые поля по таблице отзывов."""
+        reviews = Review.objects.filter(
+            title=OuterRef('pk')
+        ).order_by().values('title')
+        return self.update(
+            rating_sum=Coalesce(
+                Subquery(reviews.annotate(total=Sum('score')).values('total')),
+                0
+            ),
+            rating_count=Coalesce(
+                Subquery(reviews.annotate(total=Count('id')).values('total')),
+                0
+            ),
+            rating=Subquery(
+                reviews.annotate(
+                    total=Avg('score')
+                ).values('total'),
+                output_field=FloatField()
+            ),
+            **{
+                score_count_field(score): Coalesce(
+                    Subquery(reviews.filter(score=score).annotate(
+                        total=Count('id')
+                    ).values('total')),
+                    0
+                )
+                for score in SCORES
+            }
+        )
+
+
 class Title(models.Model):
     name = models.CharField(
         max_length=NAME_MAX_LENGTH,
@@ -169,18 +253,153 @@ class Title(models.Model):
     )
     genre = models.ManyToManyField(
         Genre,
+        through='GenreTitle',
         verbose_name='Жанр',
         related_name='titles'
     )
+    rating_sum = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Сумма оценок'
+    )
+    rating_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок'
+    )
+    rating = models.FloatField(
+        null=True,
+        editable=False,
+        db_index=True,
+        verbose_name='Рейтинг'
+    )
+    # Гистограмма оценок: по счётчику на каждое значение из SCORES.
+    # Счётчики меняет change_rating вместе с суммой и количеством оценок.
+    score_1_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок 1'
+    )
+    score_2_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок 2'
+    )
+    score_3_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок 3'
+    )
+    score_4_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок 4'
+    )
+    score_5_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок 5'
+    )
+    score_6_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок 6'
+    )
+    score_7_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок 7'
+    )
+    score_8_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок 8'
+    )
+    score_9_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок 9'
+    )
+    score_10_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Количество оценок 10'
+    )
+
+    objects = TitleQuerySet.as_manager()
 
     class Meta:
         verbose_name = 'Произведение'
         verbose_name_plural = 'Произведения'
         ordering = ('-year', 'name',)
+        indexes = (
+            # Список по умолчанию и фильтр по году.
+            models.Index(fields=('-year', 'name'), name='title_year_name_idx'),
+            # Фильтр по категории с сортировкой по умолчанию.
+            models.Index(
+                fields=('category', '-year', 'name'),
+                name='title_category_year_idx'
+            ),
+            # Фильтр по названию с сортировкой по умолчанию.
+            models.Index(fields=('name', '-year'), name='title_name_idx'),
+        )
 
     def __str__(self):
         return f'Произведение {self.name[:MAX_STR_LENGTH]}, {self.year} года.'
 
+    @property
+    def score_counts(self):
+        """Количество оценок по значениям от MIN_SCORE до MAX_SCORE."""
+        return {
+            score: getattr(self, score_count_field(score)) for score in SCORES
+        }
+
+    @property
+    def score_median(self):
+        """Медиана оценок по score_counts или None без оценок."""
+        counts = self.score_counts
+        total = sum(counts.values())
+        if not total:
+            return None
+        middle = ((total - 1) // 2, total // 2)
+        values = []
+        seen = 0
+        for score, count in counts.items():
+            seen += count
+            while len(values) < len(middle) and seen > middle[len(values)]:
+                values.append(score)
+        return sum(values) / len(values)
+
+
+class GenreTitle(models.Model):
+    title = models.ForeignKey(
+        Title,
+        on_delete=models.CASCADE,
+        verbose_name='Произведение'
+    )
+    genre = models.ForeignKey(
+        Genre,
+        on_delete=models.CASCADE,
+        verbose_name='Жанр'
+    )
+
+    class Meta:
+        db_table = 'reviews_title_genre'
+        unique_together = ('title', 'genre')
+        verbose_name = 'Жанр произведения'
+        verbose_name_plural = 'Жанры произведений'
+        indexes = (
+            # Фильтр произведений по жанру: id произведений берутся
+            # из индекса без чтения таблицы связей.
+            models.Index(
+                fields=('genre', 'title'),
+                name='genre_title_genre_idx'
+            ),
+        )
+
+    def __str__(self):
+        return f'{self.title_id} - {self.genre_id}'
+
 
 class Review(BasePostModel):
     title = models.ForeignKey(
@@ -203,9 +422,23 @@ class Review(BasePostModel):
         verbose_name='Оценка'
     )
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Запоминаем загруженные значения, чтобы при сохранении
+        # пересчитать рейтинг произведения по разнице оценок.
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
     class Meta(BasePostModel.Meta):
         verbose_name = 'Отзыв'
         verbose_name_plural = 'Отзывы'
+        indexes = (
+            models.Index(
+                fields=('title', '-pub_date', '-id'),
+                name='review_title_pub_date_idx'
+            ),
+        )
         constraints = (
             models.UniqueConstraint(
                 fields=['author', 'title'],
@@ -225,3 +458,50 @@ class Comment(BasePostModel):
     class Meta(BasePostModel.Meta):
         verbose_name = 'Комментарий'
         verbose_name_plural = 'Комментарии'
+        indexes = (
+            models.Index(
+                fields=('review', '-pub_date', '-id'),
+                name='comment_review_pub_date_idx'
+            ),
+        )
+
+
+class OutboxEmail(models.Model):
+    subject = models.CharField(
+        max_length=NAME_MAX_LENGTH,
+        verbose_name='Тема'
+    )
+    body = models.TextField(verbose_name='Текст')
+    from_email = models.EmailField(
+        max_length=EMAIL_FIELD_SIZE,
+        verbose_name='Отправитель'
+    )
+    recipients = models.JSONField(verbose_name='Получатели')
+    created = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Дата создания'
+    )
+    sent_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        db_index=True,
+        verbose_name='Дата отправки'
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0,
+        verbose_name='Попытки отправки'
+    )
+    last_error = models.TextField(blank=True, verbose_name='Ошибка')
+    locked_until = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name='Не отправлять до'
+    )
+
+    class Meta:
+        ordering = ('id',)
+        verbose_name = 'Исходящее письмо'
+        verbose_name_plural = 'Исходящие письма'
+
+    def __str__(self):
+        return self.subject[:MAX_STR_LENGTH]
@@ -0,0 +1,289 @@
+"""Полнотекстовый поиск по произведениям, отзывам и комментариям.
+
+SQLite: таблицы FTS5 с внешним содержимым, которые синхронизируют
+триггеры на исходных таблицах. PostgreSQL: GIN-индексы по выражению
+to_tsvector. Для других баз поиск выполняется через icontains.
+
+Пересоздание таблицы SQLite при миграции удаляет её триггеры, поэтому
+после каждой миграции индексы проверяются и при необходимости строятся
+заново (ensure_installed), вручную это делает команда rebuild_search_index.
+"""
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+from django.utils.html import escape
+
+from .models import Category, Comment, Genre, Review, Title, User
+
+TARGETS = {
+    'title': (Title, ('name', 'description')),
+    'review': (Review, ('text',)),
+    'comment': (Comment, ('text',)),
+}
+# Поля с триграммными индексами для нечёткого поиска (только PostgreSQL).
+TRIGRAM_TARGETS = (
+    (Category, 'name'),
+    (Genre, 'name'),
+    (User, 'username'),
+)
+# Порог сходства, как pg_trgm.similarity_threshold по умолчанию.
+TRIGRAM_THRESHOLD = 0.3
+# База выделяет совпадения символами из области для частного
+# использования: текст фрагмента экранируется, и только затем они
+# заменяются тегами HTML (highlight).
+SNIPPET_START = '\ue000'
+SNIPPET_END = '\ue001'
+SNIPPET_WORDS = 16
+HIGHLIGHT_START = '<b>'
+HIGHLIGHT_END = '</b>'
+
+
+def fts_table(model):
+    return f'search_{model._meta.model_name}'
+
+
+def sqlite_install(cursor, model, columns):
+    table = model._meta.db_table
+    fts = fts_table(model)
+    names = ', '.join(columns)
+    new = ', '.join(f'new.{column}' for column in columns)
+    old = ', '.join(f'old.{column}' for column in columns)
+    delete = (
+        f"INSERT INTO {fts} ({fts}, rowid, {names}) "
+        f"VALUES ('delete', old.id, {old});"
+    )
+    insert = f'INSERT INTO {fts} (rowid, {names}) VALUES (new.id, {new});'
+    sqlite_uninstall(cursor, model)
+    cursor.execute(
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({names}, "
+        f"content='{table}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2')"
+    )
+    cursor.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+    cursor.execute(
+        f'CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} '
+        f'BEGIN {insert} END'
+    )
+    cursor.execute(
+        f'CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} '
+        f'BEGIN {delete} END'
+    )
+    # Только по индексируемым столбцам: пересчёт рейтинга не трогает индекс.
+    cursor.execute(
+        f'CREATE TRIGGER {fts}_au AFTER UPDATE OF {names} ON {table} '
+        f'BEGIN {delete} {insert} END'
+    )
+
+
+def sqlite_uninstall(cursor, model):
+    fts = fts_table(model)
+    for suffix in ('ai', 'ad', 'au'):
+        cursor.execute(f'DROP TRIGGER IF EXISTS {fts}_{suffix}')
+    cursor.execute(f'DROP TABLE IF EXISTS {fts}')
+
+
+def postgres_document(columns):
+    return " || ' ' || ".join(
+        f"coalesce({column}, '')" for column in columns
+    )
+
+
+def postgres_vector(columns):
+    config = settings.SEARCH_CONFIG
+    return f"to_tsvector('{config}', {postgres_document(columns)})"
+
+
+def postgres_install(cursor, model, columns):
+    cursor.execute(
+        f'CREATE INDEX IF NOT EXISTS {fts_table(model)}_idx '
+        f'ON {model._meta.db_table} USING GIN ({postgres_vector(columns)})'
+    )
+
+
+def postgres_uninstall(cursor, model):
+    cursor.execute(f'DROP INDEX IF EXISTS {fts_table(model)}_idx')
+
+
+def install(schema_connection=connection):
+    """Создать (или пересоздать) поисковые индексы."""
+    install_target = {
+        'sqlite': sqlite_install,
+        'postgresql': postgres_install,
+    }.get(schema_connection.vendor)
+    if install_target is None:
+        return
+    with schema_connection.cursor() as cursor:
+        for model, columns in TARGETS.values():
+            install_target(cursor, model, columns)
+
+
+def is_installed(schema_connection=connection):
+    """Проверить, что все таблицы FTS5 и их триггеры на месте."""
+    if schema_connection.vendor != 'sqlite':
+        return True
+    expected = [
+        fts_table(model) + suffix
+        for model, _ in TARGETS.values()
+        for suffix in ('', '_ai', '_ad', '_au')
+    ]
+    with schema_connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT count(*) FROM sqlite_master WHERE name IN ({})'.format(
+                ', '.join(['%s'] * len(expected))
+            ),
+            expected
+        )
+        return cursor.fetchone()[0] == len(expected)
+
+
+def ensure_installed(schema_connection=connection):
+    """Построить индексы, если миграция удалила их или они ещё не созданы.
+
+    В PostgreSQL GIN-индексы переживают изменения таблиц и создаются
+    миграцией.
+    """
+    if not is_installed(schema_connection):
+        install(schema_connection)
+
+
+def uninstall(schema_connection=connection):
+    uninstall_target = {
+        'sqlite': sqlite_uninstall,
+        'postgresql': postgres_uninstall,
+    }.get(schema_connection.vendor)
+    if uninstall_target is None:
+        return
+    with schema_connection.cursor() as cursor:
+        for model, _ in TARGETS.values():
+            uninstall_target(cursor, model)
+
+
+def sqlite_search(model, columns, query, limit, offset):
+    terms = re.findall(r'\w+', query)
+    if not terms:
+        return 0, []
+    fts = fts_table(model)
+    match = ' '.join('"{}"'.format(term) for term in terms)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'SELECT count(*) FROM {fts} WHERE {fts} MATCH %s', [match]
+        )
+        count = cursor.fetchone()[0]
+        cursor.execute(
+            f"SELECT rowid, -rank, snippet({fts}, -1, %s, %s, '…', %s) "
+            f'FROM {fts} WHERE {fts} MATCH %s ORDER BY rank '
+            f'LIMIT %s OFFSET %s',
+            [SNIPPET_START, SNIPPET_END, SNIPPET_WORDS, match, limit, offset]
+        )
+        return count, cursor.fetchall()
+
+
+def postgres_search(model, columns, query, limit, offset):
+    table = model._meta.db_table
+    config = settings.SEARCH_CONFIG
+    vector = postgres_vector(columns)
+    options = (
+        f'StartSel={SNIPPET_START}, StopSel={SNIPPET_END}, '
+        f'MaxWords={SNIPPET_WORDS}'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT count(*) FROM {table} "
+            f"WHERE {vector} @@ plainto_tsquery('{config}', %s)",
+            [query]
+        )
+        count = cursor.fetchone()[0]
+        cursor.execute(
+            f"SELECT id, ts_rank({vector}, query), "
+            f"ts_headline('{config}', {postgres_document(columns)}, "
+            f"query, %s) "
+            f"FROM {table}, plainto_tsquery('{config}', %s) query "
+            f"WHERE {vector} @@ query ORDER BY 2 DESC, id "
+            f"LIMIT %s OFFSET %s",
+            [options, query, limit, offset]
+        )
+        return count, cursor.fetchall()
+
+
+def fallback_search(model, columns, query, limit, offset):
+    condition = Q()
+    for column in columns:
+        condition |= Q(**{f'{column}__icontains': query})
+    queryset = model.objects.filter(condition).order_by('id')
+    rows = queryset.values_list('id', *columns)[offset:offset + limit]
+    return queryset.count(), [
+        (row[0], 0.0, ' '.join(value or '' for value in row[1:]))
+        for row in rows
+    ]
+
+
+def highlight(snippet):
+    """Фрагмент как HTML: текст экранирован, совпадения выделены <b>."""
+    return escape(snippet or '').replace(
+        SNIPPET_START, HIGHLIGHT_START
+    ).replace(SNIPPET_END, HIGHLIGHT_END)
+
+
+def search(kind, query, limit, offset=0):
+    """Найти объекты вида kind по запросу query.
+
+    Возвращает общее число совпадений и страницу строк
+    (id, релевантность, фрагмент с подсветкой) в порядке релевантности.
+    Фрагмент - безопасный HTML, в котором размечены только совпадения.
+    """
+    model, columns = TARGETS[kind]
+    backend = {
+        'sqlite': sqlite_search,
+        'postgresql': postgres_search,
+    }.get(connection.vendor, fallback_search)
+    count, rows = backend(model, columns, query, limit, offset)
+    return count, [
+        (pk, rank, highlight(snippet)) for pk, rank, snippet in rows
+    ]
+
+
+def trigram_index(model, column):
+    return f'{model._meta.db_table}_{column}_trgm'
+
+
+def install_trigram(schema_connection=connection):
+    """Создать триграммные индексы, если они включены и поддерживаются."""
+    if (schema_connection.vendor != 'postgresql'
+            or not settings.SEARCH_TRIGRAM_INDEX):
+        return
+    with schema_connection.cursor() as cursor:
+        cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for model, column in TRIGRAM_TARGETS:
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS {trigram_index(model, column)} '
+                f'ON {model._meta.db_table} USING GIN ({column} gin_trgm_ops)'
+            )
+
+
+def uninstall_trigram(schema_connection=connection):
+    if schema_connection.vendor != 'postgresql':
+        return
+    with schema_connection.cursor() as cursor:
+        for model, column in TRIGRAM_TARGETS:
+            cursor.execute(
+                f'DROP INDEX IF EXISTS {trigram_index(model, column)}'
+            )
+
+
+def trigrams(value):
+    """Множество триграмм строки по правилам pg_trgm."""
+    result = set()
+    for word in re.findall(r'\w+', value.casefold()):
+        word = f'  {word} '
+        result.update(word[i:i + 3] for i in range(len(word) - 2))
+    return result
+
+
+def similarity(first, second):
+    """Сходство строк - доля общих триграмм, как similarity() в pg_trgm."""
+    first, second = trigrams(first), trigrams(second)
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
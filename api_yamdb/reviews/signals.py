@@ -0,0 +1,49 @@
+from django.db import connections
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+
+from . import search
+from .models import Review, Title
+
+# Данные изменены в обход сигналов моделей (импорт, пересчёт рейтинга):
+# отправляется командами по завершении записи.
+data_changed = Signal()
+
+
+@receiver(post_save, sender=Review)
+def update_rating_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    loaded = getattr(instance, '_loaded_values', {})
+    old_title_id = loaded.get('title_id', instance.title_id)
+    old_score = loaded.get('score', instance.score)
+    titles = Title.objects.filter(pk=instance.title_id)
+    if created:
+        titles.change_rating(added=instance.score)
+    elif old_title_id != instance.title_id:
+        Title.objects.filter(pk=old_title_id).change_rating(removed=old_score)
+        titles.change_rating(added=instance.score)
+    elif old_score != instance.score:
+        titles.change_rating(added=instance.score, removed=old_score)
+    instance._loaded_values = {
+        **loaded, 'title_id': instance.title_id, 'score': instance.score
+    }
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_on_delete(sender, instance, **kwargs):
+    loaded = getattr(instance, '_loaded_values', {})
+    Title.objects.filter(
+        pk=loaded.get('title_id', instance.title_id)
+    ).change_rating(removed=loaded.get('score', instance.score))
+
+
+def ensure_search_index(sender, using, **kwargs):
+    """Восстановить триггеры поиска, удалённые пересозданием таблиц."""
+    connection = connections[using]
+    tables = connection.introspection.table_names()
+    if all(
+        model._meta.db_table in tables
+        for model, _ in search.TARGETS.values()
+    ):
+        search.ensure_installed(connection)
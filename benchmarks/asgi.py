@@ -0,0 +1,134 @@
+"""Чтение каталога под ASGI с большим числом одновременных запросов.
+
+Запуск из корня репозитория:
+
+    ASYNC_READ_VIEWS=1 python -m benchmarks.asgi --concurrency 64
+
+Запросы отправляет AsyncClient Django через ASGI-обработчик приложения,
+каждый запрос - в своём ThreadSensitiveContext, как в ASGIHandler под
+сервером (uvicorn, daphne). Синхронный и асинхронный пути чтения
+сравнивает benchmarks.compare:
+
+    python -m benchmarks.compare --module benchmarks.asgi \\
+        --profile sync-views --profile async-views -- --concurrency 64
+"""
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from asgiref.sync import ThreadSensitiveContext
+from django.conf import settings
+from django.db import connection
+from django.test import AsyncClient
+from django.test.utils import (
+    override_settings, setup_test_environment, teardown_test_environment
+)
+
+# benchmarks.run настраивает Django до импорта моделей.
+from .run import DUMMY_CACHES, SCENARIOS, statistics
+from .concurrency import create_databases
+from .seed import seed_catalogue
+
+READ_SCENARIOS = ('title_list', 'title_detail', 'review_list', 'comment_list')
+SIZES = {
+    'users': 100,
+    'categories': 5,
+    'genres': 20,
+    'titles': 1000,
+    'reviews_per_title': 5,
+    'comments_per_review': 2,
+}
+
+
+async def drive(data, args):
+    """Выполнить args.requests запросов, не более args.concurrency сразу."""
+    rng = random.Random(args.seed)
+    plan = [rng.choice(args.scenario or READ_SCENARIOS)
+            for _ in range(args.requests)]
+    latencies = {name: [] for name in set(plan)}
+    errors = dict.fromkeys(latencies, 0)
+    queue = iter(plan)
+    client = AsyncClient(raise_request_exception=False)
+
+    async def worker():
+        for name in queue:
+            start = time.perf_counter()
+            async with ThreadSensitiveContext():
+                response = await SCENARIOS[name](client, data, rng)
+            latencies[name].append((time.perf_counter() - start) * 1000)
+            errors[name] += response.status_code >= 400
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+    results = {
+        name: statistics(values, errors[name], elapsed)
+        for name, values in latencies.items()
+    }
+    results['total'] = statistics(
+        [value for values in latencies.values() for value in values],
+        sum(errors.values()),
+        elapsed
+    )
+    return results
+
+
+def run(args):
+    data = seed_catalogue(seed=args.seed, **SIZES)
+    return {
+        'config': {
+            'concurrency': args.concurrency,
+            'requests': args.requests,
+            'async_read_views': settings.ASYNC_READ_VIEWS,
+            'cache': not args.no_cache,
+            'database': connection.vendor,
+        },
+        'results': asyncio.run(drive(data, args)),
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--scenario',
+        action='append',
+        choices=READ_SCENARIOS,
+        help='Run only the given scenarios'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Replace the configured cache with DummyCache'
+    )
+    parser.add_argument('--output', help='Write JSON result to this file')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    setup_test_environment()
+    with tempfile.TemporaryDirectory() as directory:
+        old_name = create_databases(directory)
+        try:
+            with override_settings(
+                CACHES=DUMMY_CACHES if args.no_cache else settings.CACHES
+            ):
+                result = run(args)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+    output = json.dumps(result, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(output, encoding='utf-8')
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,132 @@
+"""Сравнение пропускной способности API на разных профилях окружения.
+
+Каждый профиль - набор переменных окружения для api_yamdb.settings;
+для него benchmarks.run (или модуль из --module) запускается в отдельном
+процессе. Параметры подключения к PostgreSQL (POSTGRES_DB, POSTGRES_USER,
+POSTGRES_PASSWORD, DB_HOST, DB_PORT) берутся из окружения. Профилям
+PostgreSQL нужен запущенный сервер, поэтому по умолчанию они не
+запускаются и указываются явно.
+
+    python -m benchmarks.compare --profile sqlite --profile postgresql-pool \\
+        -- --titles 2000 --requests 300
+
+Аргументы после `--` передаются модулю нагрузки.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+PROFILES = {
+    'sqlite-untuned': {'DB_ENGINE': 'sqlite3', 'SQLITE_TUNING': '0'},
+    'sqlite': {'DB_ENGINE': 'sqlite3'},
+    'sqlite-replica': {'DB_ENGINE': 'sqlite3', 'SQLITE_READ_REPLICA': '1'},
+    'postgresql': {
+        'DB_ENGINE': 'postgresql',
+        'DB_CONN_MAX_AGE': '0',
+    },
+    'postgresql-persistent': {
+        'DB_ENGINE': 'postgresql',
+        'DB_CONN_MAX_AGE': '600',
+    },
+    'postgresql-pool': {
+        'DB_ENGINE': 'postgresql',
+        'DB_POOL': '1',
+    },
+    'sync-views': {'ASYNC_READ_VIEWS': '0'},
+    'async-views': {'ASYNC_READ_VIEWS': '1'},
+    'model-serializers': {'FAST_READ_SERIALIZERS': '0'},
+    'fast-serializers': {'FAST_READ_SERIALIZERS': '1'},
+}
+DEFAULT_PROFILES = [
+    name for name, env in PROFILES.items()
+    if env.get('DB_ENGINE') != 'postgresql'
+]
+
+
+def unavailable(name):
+    """Причина, по которой профиль нельзя запустить, или None."""
+    if (PROFILES[name].get('DB_ENGINE') == 'postgresql'
+            and importlib.util.find_spec('psycopg2') is None):
+        return ('не установлен psycopg2 '
+                '(pip install -r requirements-postgres.txt)')
+    return None
+
+
+def run_profile(name, module, run_args):
+    """Прогнать модуль нагрузки с окружением профиля и вернуть результат."""
+    with tempfile.TemporaryDirectory() as directory:
+        output = Path(directory) / 'result.json'
+        subprocess.run(
+            [sys.executable, '-m', module,
+             '--output', str(output), *run_args],
+            env={**os.environ, **PROFILES[name]},
+            stdout=subprocess.DEVNULL,
+            check=True
+        )
+        return json.loads(output.read_text(encoding='utf-8'))
+
+
+def compare(results):
+    """Пропускная способность по сценариям и профилям."""
+    scenarios = dict.fromkeys(
+        scenario for result in results.values()
+        for scenario in result['results']
+    )
+    return {
+        scenario: {
+            name: round(result['results'][scenario]['throughput_rps'], 1)
+            for name, result in results.items()
+            if scenario in result['results']
+        }
+        for scenario in scenarios
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument(
+        '--profile',
+        action='append',
+        choices=PROFILES,
+        help='Profiles to compare (default: all except PostgreSQL)'
+    )
+    parser.add_argument(
+        '--module',
+        default='benchmarks.run',
+        choices=('benchmarks.run', 'benchmarks.concurrency',
+                 'benchmarks.asgi'),
+        help='Benchmark to run for each profile'
+    )
+    parser.add_argument('--output', help='Write JSON result to this file')
+    parser.add_argument('run_args', nargs='*',
+                        help='Arguments for the benchmark module')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    profiles = args.profile or DEFAULT_PROFILES
+    for name in profiles:
+        reason = unavailable(name)
+        if reason:
+            sys.exit(f'Профиль {name} недоступен: {reason}')
+    results = {
+        name: run_profile(name, args.module, args.run_args)
+        for name in profiles
+    }
+    output = json.dumps({
+        'throughput_rps': compare(results),
+        'profiles': results,
+    }, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(output, encoding='utf-8')
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
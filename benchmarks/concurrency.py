@@ -0,0 +1,184 @@
+"""Конкурентная нагрузка: чтение каталога и публикация отзывов из потоков.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.concurrency --threads 8 --requests 200
+
+Каждый поток отправляет свои запросы через тестовый клиент Django: с
+вероятностью --write-ratio публикует отзыв от своего пользователя, иначе
+читает список произведений или отзывов. База SQLite создаётся в файле,
+чтобы потоки работали с отдельными соединениями, как процессы сервера.
+Результат - JSON в формате benchmarks.run, пригодный для
+benchmarks.compare, например:
+
+    python -m benchmarks.compare --module benchmarks.concurrency \\
+        --profile sqlite-untuned --profile sqlite --profile sqlite-replica
+"""
+import argparse
+import json
+import random
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from django.db import connection, connections
+from django.test import Client
+from django.test.utils import (
+    setup_test_environment, teardown_test_environment
+)
+
+# benchmarks.run настраивает Django до импорта моделей.
+from .run import API_URL, statistics
+from api.authentication import ClaimsAccessToken
+from reviews.models import RoleChoices, User
+from .seed import seed_catalogue
+
+SIZES = {
+    'users': 50,
+    'categories': 5,
+    'genres': 20,
+    'titles': 2000,
+    'reviews_per_title': 2,
+    'comments_per_review': 0,
+}
+
+
+class Worker(threading.Thread):
+    """Поток с собственным клиентом, пользователем и журналом задержек."""
+
+    def __init__(self, index, data, args):
+        super().__init__()
+        self.rng = random.Random(args.seed + index)
+        self.data = data
+        self.args = args
+        user = User.objects.create_user(
+            username=f'writer{index}',
+            email=f'writer{index}@yamdb.fake',
+            role=RoleChoices.USER.value
+        )
+        token = ClaimsAccessToken.for_user(user)
+        self.client = Client(
+            HTTP_AUTHORIZATION=f'Bearer {token}',
+            raise_request_exception=False
+        )
+        # У каждого потока свой отрезок произведений: отзывы не повторяются.
+        titles = data['titles']
+        size = len(titles) // args.threads
+        self.titles = iter(titles[index * size:(index + 1) * size])
+        self.latencies = {'read': [], 'write': []}
+        self.errors = {'read': 0, 'write': 0}
+
+    def request(self):
+        if self.rng.random() < self.args.write_ratio:
+            title_id = next(self.titles, None)
+            if title_id is not None:
+                return 'write', self.client.post(
+                    f'{API_URL}/titles/{title_id}/reviews/',
+                    {'text': 'Отзыв под нагрузкой', 'score': 7},
+                    content_type='application/json'
+                )
+        if self.rng.random() < 0.5:
+            return 'read', self.client.get(f'{API_URL}/titles/')
+        title_id = self.rng.choice(self.data['titles'])
+        return 'read', self.client.get(
+            f'{API_URL}/titles/{title_id}/reviews/'
+        )
+
+    def run(self):
+        try:
+            for _ in range(self.args.requests):
+                start = time.perf_counter()
+                kind, response = self.request()
+                self.latencies[kind].append(
+                    (time.perf_counter() - start) * 1000
+                )
+                self.errors[kind] += response.status_code >= 400
+        finally:
+            connections.close_all()
+
+
+def run(args):
+    data = seed_catalogue(seed=args.seed, **SIZES)
+    workers = [Worker(index, data, args) for index in range(args.threads)]
+    connections.close_all()
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+    results = {}
+    for kind in ('read', 'write'):
+        latencies = [
+            value for worker in workers for value in worker.latencies[kind]
+        ]
+        if latencies:
+            results[kind] = statistics(
+                latencies,
+                sum(worker.errors[kind] for worker in workers),
+                elapsed
+            )
+    results['total'] = statistics(
+        [value for worker in workers
+         for values in worker.latencies.values() for value in values],
+        sum(sum(worker.errors.values()) for worker in workers),
+        elapsed
+    )
+    return {
+        'config': {
+            'threads': args.threads,
+            'requests_per_thread': args.requests,
+            'write_ratio': args.write_ratio,
+            'database': connection.vendor,
+            'pragmas': connection.settings_dict.get('PRAGMAS'),
+            'replica': len(connections.databases) > 1,
+        },
+        'results': results,
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=100,
+                        help='Requests per thread')
+    parser.add_argument('--write-ratio', type=float, default=0.2)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Write JSON result to this file')
+    return parser.parse_args()
+
+
+def create_databases(directory):
+    """Тестовые базы; SQLite - в файле, реплики - зеркала основной."""
+    if connection.vendor == 'sqlite':
+        connection.settings_dict['TEST']['NAME'] = str(
+            Path(directory) / 'benchmark.sqlite3'
+        )
+    old_name = connection.creation.create_test_db(verbosity=0)
+    for alias in connections:
+        if connections[alias].settings_dict['TEST'].get('MIRROR'):
+            connections[alias].creation.set_as_test_mirror(
+                connection.settings_dict
+            )
+    return old_name
+
+
+def main():
+    args = parse_args()
+    setup_test_environment()
+    with tempfile.TemporaryDirectory() as directory:
+        old_name = create_databases(directory)
+        try:
+            result = run(args)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+    output = json.dumps(result, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(output, encoding='utf-8')
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
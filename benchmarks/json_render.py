@@ -0,0 +1,138 @@
+"""Микробенчмарк отрисовки и разбора JSON на типичных страницах API.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.json_render --limit 100 --repeat 2000
+
+Страницы произведений, отзывов и комментариев берутся из ответов API на
+заполненной тестовой базе (response.data до отрисовки) и отрисовываются
+JSONRenderer DRF и api.renderers.FastJSONRenderer; тела ответов разбираются
+JSONParser и api.parsers.FastJSONParser. Перед замером проверяется, что
+результаты совпадают байт в байт.
+"""
+import argparse
+import io
+import json
+import random
+import time
+from pathlib import Path
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import (
+    setup_test_environment, teardown_test_environment
+)
+
+# benchmarks.run настраивает Django до импорта моделей.
+from .run import API_URL
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer, orjson
+from .seed import seed_catalogue
+
+SIZES = {
+    'users': 50,
+    'categories': 5,
+    'genres': 20,
+    'titles': 200,
+    'reviews_per_title': 20,
+    'comments_per_review': 20,
+}
+
+
+def pages(data, limit, rng):
+    """Данные страниц API до отрисовки."""
+    client = Client()
+    title_id = rng.choice(data['titles'])
+    review_id, review_title_id = rng.choice(data['reviews'])
+    urls = {
+        'titles': f'{API_URL}/titles/',
+        'reviews': f'{API_URL}/titles/{title_id}/reviews/',
+        'comments': (
+            f'{API_URL}/titles/{review_title_id}/reviews/{review_id}'
+            '/comments/'
+        ),
+    }
+    return {
+        name: client.get(url, {'limit': limit}).data
+        for name, url in urls.items()
+    }
+
+
+def timed(function, repeat):
+    """Среднее время вызова в микросекундах."""
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def measure(page, repeat):
+    renderer, fast_renderer = JSONRenderer(), FastJSONRenderer()
+    parser, fast_parser = JSONParser(), FastJSONParser()
+    body = renderer.render(page)
+    assert fast_renderer.render(page) == body, 'Отрисовка различается'
+    assert fast_parser.parse(io.BytesIO(body)) == (
+        parser.parse(io.BytesIO(body))
+    ), 'Разбор различается'
+    result = {'bytes': len(body)}
+    for name, stdlib, fast in (
+        ('render', lambda: renderer.render(page),
+         lambda: fast_renderer.render(page)),
+        ('parse', lambda: parser.parse(io.BytesIO(body)),
+         lambda: fast_parser.parse(io.BytesIO(body))),
+    ):
+        stdlib_us, fast_us = timed(stdlib, repeat), timed(fast, repeat)
+        result[name] = {
+            'stdlib_us': round(stdlib_us, 1),
+            'fast_us': round(fast_us, 1),
+            'speedup': round(stdlib_us / fast_us, 2),
+        }
+    return result
+
+
+def run(args):
+    data = seed_catalogue(seed=args.seed, **SIZES)
+    rng = random.Random(args.seed)
+    return {
+        'config': {
+            'limit': args.limit,
+            'repeat': args.repeat,
+            'orjson': orjson.__version__ if orjson else None,
+            'database': connection.vendor,
+        },
+        'results': {
+            name: measure(page, args.repeat)
+            for name, page in pages(data, args.limit, rng).items()
+        },
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--limit', type=int, default=10,
+                        help='Page size')
+    parser.add_argument('--repeat', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='Write JSON result to this file')
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        result = run(args)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+    output = json.dumps(result, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(output, encoding='utf-8')
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
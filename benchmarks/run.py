@@ -0,0 +1,205 @@
+"""Нагрузочный прогон основных эндпоинтов API.
+
+Запуск из корня репозитория:
+
+    python -m benchmarks.run --titles 5000 --requests 500 --output result.json
+
+Каталог заполняется в отдельной тестовой базе, которая удаляется после
+прогона. Результат - JSON с пропускной способностью и перцентилями
+задержки по сценариям, пригодный для сравнения между запусками.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent / 'api_yamdb'
+sys.path.insert(0, str(PROJECT_DIR))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_yamdb.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.contrib.auth.tokens import default_token_generator  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import (  # noqa: E402
+    override_settings, setup_test_environment, teardown_test_environment
+)
+
+from api.metrics import percentile  # noqa: E402
+from reviews.models import User  # noqa: E402
+from .seed import DEFAULT_SIZES, seed_catalogue  # noqa: E402
+
+API_URL = '/api/v1'
+PERCENTILES = (50, 95, 99)
+DUMMY_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}
+}
+
+
+def title_list(client, data, rng):
+    offset = rng.randrange(0, max(len(data['titles']) - 10, 1))
+    return client.get(f'{API_URL}/titles/?offset={offset}')
+
+
+def title_list_filtered(client, data, rng):
+    return client.get(
+        f'{API_URL}/titles/?genre={rng.choice(data["genres"])}'
+        f'&category={rng.choice(data["categories"])}'
+    )
+
+
+def title_detail(client, data, rng):
+    return client.get(f'{API_URL}/titles/{rng.choice(data["titles"])}/')
+
+
+def review_list(client, data, rng):
+    return client.get(
+        f'{API_URL}/titles/{rng.choice(data["titles"])}/reviews/'
+    )
+
+
+def comment_list(client, data, rng):
+    review_id, title_id = rng.choice(data['reviews'])
+    return client.get(
+        f'{API_URL}/titles/{title_id}/reviews/{review_id}/comments/'
+    )
+
+
+def signup(client, data, rng):
+    data['signups'] = data.get('signups', 0) + 1
+    username = f'bench{data["signups"]}'
+    return client.post(f'{API_URL}/auth/signup/', {
+        'username': username,
+        'email': f'{username}@yamdb.fake',
+    })
+
+
+def token(client, data, rng):
+    username, code = rng.choice(data['codes'])
+    return client.post(f'{API_URL}/auth/token/', {
+        'username': username,
+        'confirmation_code': code,
+    })
+
+
+SCENARIOS = {
+    'title_list': title_list,
+    'title_list_filtered': title_list_filtered,
+    'title_detail': title_detail,
+    'review_list': review_list,
+    'comment_list': comment_list,
+    'signup': signup,
+    'token': token,
+}
+
+
+def measure(scenario, client, data, rng, requests, warmup):
+    """Выполнить сценарий и вернуть статистику задержек."""
+    for _ in range(warmup):
+        scenario(client, data, rng)
+    latencies = []
+    errors = 0
+    started = time.perf_counter()
+    for _ in range(requests):
+        start = time.perf_counter()
+        response = scenario(client, data, rng)
+        latencies.append((time.perf_counter() - start) * 1000)
+        errors += response.status_code >= 400
+    return statistics(latencies, errors, time.perf_counter() - started)
+
+
+def statistics(latencies, errors, elapsed):
+    """Пропускная способность и перцентили задержек в миллисекундах."""
+    latencies = sorted(latencies)
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput_rps': len(latencies) / elapsed,
+        'latency_ms': {
+            'mean': sum(latencies) / len(latencies),
+            'max': latencies[-1],
+            **{f'p{rank}': percentile(latencies, rank)
+               for rank in PERCENTILES},
+        },
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    for name, default in DEFAULT_SIZES.items():
+        parser.add_argument(
+            f'--{name.replace("_", "-")}', type=int, default=default
+        )
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--scenario',
+        action='append',
+        choices=SCENARIOS,
+        help='Run only the given scenarios'
+    )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Replace the configured cache with DummyCache'
+    )
+    parser.add_argument('--output', help='Write JSON result to this file')
+    return parser.parse_args()
+
+
+def run(args):
+    sizes = {name: getattr(args, name) for name in DEFAULT_SIZES}
+    data = seed_catalogue(seed=args.seed, **sizes)
+    data['codes'] = [
+        (user.username, default_token_generator.make_token(user))
+        for user in User.objects.all()[:100]
+    ]
+    rng = random.Random(args.seed)
+    client = Client()
+    results = {}
+    for name in args.scenario or SCENARIOS:
+        results[name] = measure(
+            SCENARIOS[name], client, data, rng, args.requests, args.warmup
+        )
+    return {
+        'config': {
+            **sizes,
+            'requests': args.requests,
+            'warmup': args.warmup,
+            'cache': not args.no_cache,
+            'database': connection.vendor,
+            'conn_max_age': connection.settings_dict['CONN_MAX_AGE'],
+            'pool': bool(connection.settings_dict.get('POOL')),
+        },
+        'results': results,
+    }
+
+
+def main():
+    args = parse_args()
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        with override_settings(
+            CACHES=DUMMY_CACHES if args.no_cache else settings.CACHES
+        ):
+            result = run(args)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+    output = json.dumps(result, indent=2, ensure_ascii=False)
+    if args.output:
+        Path(args.output).write_text(output, encoding='utf-8')
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
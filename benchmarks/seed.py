@@ -0,0 +1,96 @@
+"""Синтетический каталог той же структуры, что и static/data/*.csv."""
+import random
+
+from django.contrib.auth import get_user_model
+
+from reviews.constants import MAX_SCORE, MIN_SCORE
+from reviews.models import Category, Comment, Genre, Review, RoleChoices, Title
+
+User = get_user_model()
+
+DEFAULT_SIZES = {
+    'users': 200,
+    'categories': 5,
+    'genres': 20,
+    'titles': 1000,
+    'reviews_per_title': 10,
+    'comments_per_review': 2,
+}
+BATCH_SIZE = 2000
+
+
+def seed_catalogue(users, categories, genres, titles, reviews_per_title,
+                   comments_per_review, seed=0):
+    """Заполнить базу и вернуть id созданных объектов по моделям."""
+    rng = random.Random(seed)
+    roles = [role.value for role in RoleChoices]
+    User.objects.bulk_create(
+        (User(
+            username=f'user{index}',
+            email=f'user{index}@yamdb.fake',
+            role=rng.choice(roles),
+            bio=f'Биография пользователя {index}',
+        ) for index in range(users)),
+        batch_size=BATCH_SIZE
+    )
+    Category.objects.bulk_create(
+        Category(name=f'Категория {index}', slug=f'category-{index}')
+        for index in range(categories)
+    )
+    Genre.objects.bulk_create(
+        Genre(name=f'Жанр {index}', slug=f'genre-{index}')
+        for index in range(genres)
+    )
+    user_ids = list(User.objects.values_list('id', flat=True))
+    category_ids = list(Category.objects.values_list('id', flat=True))
+    genre_ids = list(Genre.objects.values_list('id', flat=True))
+
+    Title.objects.bulk_create(
+        (Title(
+            name=f'Произведение {index}',
+            year=rng.randint(1900, 2020),
+            description=f'Описание произведения {index}',
+            category_id=rng.choice(category_ids),
+        ) for index in range(titles)),
+        batch_size=BATCH_SIZE
+    )
+    title_ids = list(Title.objects.values_list('id', flat=True))
+    GenreTitle = Title.genre.through
+    GenreTitle.objects.bulk_create(
+        (GenreTitle(title_id=title_id, genre_id=genre_id)
+         for title_id in title_ids
+         for genre_id in rng.sample(genre_ids, min(2, len(genre_ids)))),
+        batch_size=BATCH_SIZE
+    )
+
+    per_title = min(reviews_per_title, len(user_ids))
+    Review.objects.bulk_create(
+        (
+            Review(
+                title_id=title_id,
+                author_id=author_id,
+                text=f'Отзыв на произведение {title_id}',
+                score=rng.randint(MIN_SCORE, MAX_SCORE),
+            )
+            for title_id in title_ids
+            for author_id in rng.sample(user_ids, per_title)
+        ),
+        batch_size=BATCH_SIZE
+    )
+    review_ids = list(Review.objects.values_list('id', flat=True))
+    Comment.objects.bulk_create(
+        (Comment(
+            review_id=review_id,
+            author_id=rng.choice(user_ids),
+            text=f'Комментарий к отзыву {review_id}',
+        ) for review_id in review_ids for _ in range(comments_per_review)),
+        batch_size=BATCH_SIZE
+    )
+    Title.objects.rebuild_ratings()
+    return {
+        'users': user_ids,
+        'categories': list(Category.objects.values_list('slug', flat=True)),
+        'genres': list(Genre.objects.values_list('slug', flat=True)),
+        'titles': title_ids,
+        'reviews': list(Review.objects.values_list('id', 'title_id')),
+    }
@@ -1,6 +1,8 @@
 import os
 import sys
 
+import pytest
+from django.core.cache import cache
 from django.utils.version import get_version
 
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -33,3 +35,19 @@ assert get_version() < '4.0.0', 'Пожалуйста, используйте в
 pytest_plugins = [
     'tests.fixtures.fixture_user',
 ]
+
+
+@pytest.fixture(autouse=True)
+def sync_mail_queue(settings):
+    # Письма отправляются сразу, чтобы тесты видели их в mail.outbox.
+    settings.MAIL_QUEUE_BACKEND = 'reviews.mail_queue.SyncMailQueue'
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    from api.lookups import categories, genres
+
+    # Кэш в памяти процесса переживает очистку базы между тестами.
+    cache.clear()
+    categories.clear()
+    genres.clear()
@@ -0,0 +1,95 @@
+import pytest
+
+from api.lookups import categories, genres
+from reviews.models import Category, Genre, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test08QueryCount:
+
+    TITLES_URL = '/api/v1/titles/'
+
+    @staticmethod
+    def create_catalogue(size):
+        category = Category.objects.create(name='Фильм', slug='movie')
+        genres = [
+            Genre.objects.create(name='Драма', slug='drama'),
+            Genre.objects.create(name='Комедия', slug='comedy'),
+        ]
+        for index in range(size):
+            title = Title.objects.create(
+                name=f'Произведение {index}', year=2000, category=category
+            )
+            title.genre.set(genres)
+
+    @staticmethod
+    def warm_lookups():
+        categories.all()
+        genres.all()
+
+    @pytest.mark.parametrize('size', (1, 10))
+    def test_01_title_list_query_count(self, client, size,
+                                       django_assert_num_queries):
+        self.create_catalogue(size)
+        self.warm_lookups()
+        with django_assert_num_queries(3):
+            response = client.get(self.TITLES_URL)
+        assert len(response.json()['results']) == size, (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` возвращает '
+            'все произведения страницы.'
+        )
+
+    @pytest.mark.parametrize('size', (1, 10))
+    def test_02_review_list_query_count(self, client, django_user_model,
+                                        size, django_assert_num_queries):
+        self.create_catalogue(1)
+        title = Title.objects.get()
+        for index in range(size):
+            author = django_user_model.objects.create_user(
+                username=f'author{index}', email=f'author{index}@yamdb.fake'
+            )
+            title.reviews.create(author=author, text='Отзыв', score=5)
+        url = f'/api/v1/titles/{title.id}/reviews/'
+        with django_assert_num_queries(2):
+            response = client.get(url)
+        assert response.json()['results'][0]['author'].startswith(
+            'author'
+        ), (
+            f'Проверьте, что ответ на GET-запрос к `{url}` содержит '
+            'имя автора отзыва.'
+        )
+
+    def test_03_filtered_title_list_query_count(self, client,
+                                                django_assert_num_queries):
+        self.create_catalogue(10)
+        self.warm_lookups()
+        with django_assert_num_queries(3):
+            response = client.get(
+                self.TITLES_URL, {'genre': 'drama', 'category': 'movie'}
+            )
+        data = response.json()
+        assert data['count'] == 10
+        assert data['results'][0]['category'] == {
+            'name': 'Фильм', 'slug': 'movie'
+        }
+        assert data['results'][0]['genre'] == [
+            {'name': 'Драма', 'slug': 'drama'},
+            {'name': 'Комедия', 'slug': 'comedy'},
+        ], (
+            f'Проверьте, что GET-запрос к `{self.TITLES_URL}` возвращает '
+            'жанры произведения в порядке названий.'
+        )
+
+    def test_04_title_create_query_count(self, admin_client,
+                                         django_assert_max_num_queries):
+        self.create_catalogue(0)
+        self.warm_lookups()
+        # Слаги разрешаются без запросов: остаются пользователь, вставка
+        # произведения, установка связей с жанрами и чтение их для ответа.
+        with django_assert_max_num_queries(7):
+            response = admin_client.post(self.TITLES_URL, {
+                'name': 'Новое', 'year': 2000,
+                'genre': ['drama', 'comedy'], 'category': 'movie'
+            }, format='json')
+        assert response.status_code == 201
+        assert response.json()['category']['slug'] == 'movie'
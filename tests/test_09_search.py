@@ -0,0 +1,102 @@
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Category, Comment, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test09Search:
+
+    SEARCH_URL = '/api/v1/search/'
+
+    @staticmethod
+    def create_title(name, description=''):
+        category, _ = Category.objects.get_or_create(
+            name='Фильм', slug='movie'
+        )
+        return Title.objects.create(
+            name=name, year=2000, description=description, category=category
+        )
+
+    def test_01_title_search(self, client):
+        self.create_title('Властелин колец', 'Фэнтези о кольце всевластья')
+        self.create_title('Крёстный отец', 'Криминальная драма')
+        response = client.get(self.SEARCH_URL, {'q': 'драма'})
+        assert response.status_code == 200
+        data = response.json()
+        assert data['count'] == 1, (
+            f'Проверьте, что GET-запрос к `{self.SEARCH_URL}` находит '
+            'произведения по описанию.'
+        )
+        assert data['results'][0]['snippet'] == 'Криминальная <b>драма</b>'
+
+    def test_02_index_follows_changes(self, client):
+        title = self.create_title('Матрица')
+        title.name = 'Начало'
+        title.save()
+        assert client.get(
+            self.SEARCH_URL, {'q': 'матрица'}
+        ).json()['count'] == 0
+        assert client.get(
+            self.SEARCH_URL, {'q': 'начало'}
+        ).json()['count'] == 1
+        title.delete()
+        assert client.get(
+            self.SEARCH_URL, {'q': 'начало'}
+        ).json()['count'] == 0
+
+    def test_03_review_and_comment_search(self, client, admin):
+        title = self.create_title('Матрица')
+        review = Review.objects.create(
+            title=title, author=admin, text='Отличный фильм', score=9
+        )
+        Review.objects.create(
+            title=self.create_title('Начало'), author=admin,
+            text='Скучный фильм', score=3
+        )
+        Comment.objects.create(review=review, author=admin, text='Согласен')
+        response = client.get(
+            self.SEARCH_URL, {'q': 'отличный', 'type': 'review'}
+        )
+        result, = response.json()['results']
+        assert result['id'] == review.id
+        assert result['title_id'] == title.id
+        response = client.get(
+            self.SEARCH_URL, {'q': 'согласен', 'type': 'comment'}
+        )
+        result, = response.json()['results']
+        assert result['review_id'] == review.id
+        assert result['title_id'] == title.id
+
+    @pytest.mark.parametrize('params', (
+        {}, {'q': ' '}, {'q': 'фильм', 'type': 'user'}
+    ))
+    def test_04_invalid_params(self, client, params):
+        response = client.get(self.SEARCH_URL, params)
+        assert response.status_code == 400, (
+            f'Проверьте, что GET-запрос к `{self.SEARCH_URL}` без текста '
+            'запроса или с неизвестным type возвращает статус 400.'
+        )
+
+    def test_05_rebuild_index(self, client):
+        self.create_title('Матрица')
+        call_command('rebuild_search_index')
+        assert client.get(
+            self.SEARCH_URL, {'q': 'матрица'}
+        ).json()['count'] == 1
+
+    def test_06_snippet_is_escaped(self, client, admin):
+        Review.objects.create(
+            title=self.create_title('Матрица'), author=admin,
+            text='<img src=x onerror=alert(1)> хорошо', score=9
+        )
+        response = client.get(
+            self.SEARCH_URL, {'q': 'хорошо', 'type': 'review'}
+        )
+        result, = response.json()['results']
+        assert result['snippet'] == (
+            '&lt;img src=x onerror=alert(1)&gt; <b>хорошо</b>'
+        ), (
+            'Проверьте, что HTML из текста отзыва экранируется во фрагменте, '
+            'а тегом `<b>` выделены только совпадения.'
+        )
@@ -0,0 +1,88 @@
+import pytest
+
+from reviews.models import Category, Genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test10Autocomplete:
+
+    CATEGORY_URL = '/api/v1/categories/'
+    GENRES_URL = '/api/v1/genres/'
+    USERS_URL = '/api/v1/users/'
+
+    @staticmethod
+    def names(response):
+        return [item['name'] for item in response.json()['results']]
+
+    def test_01_prefix_search(self, client):
+        Category.objects.create(name='Фильм', slug='movie')
+        Category.objects.create(name='Книга', slug='book')
+        Category.objects.create(name='Фильмотека', slug='library')
+        response = client.get(
+            self.CATEGORY_URL, {'search': 'фил', 'search_mode': 'prefix'}
+        )
+        assert response.status_code == 200
+        assert sorted(self.names(response)) == ['Фильм', 'Фильмотека'], (
+            f'Проверьте, что GET-запрос к `{self.CATEGORY_URL}` с '
+            '`search_mode=prefix` находит категории по началу названия без '
+            'учёта регистра.'
+        )
+
+    def test_02_fuzzy_search(self, client):
+        Genre.objects.create(name='Драма', slug='drama')
+        Genre.objects.create(name='Комедия', slug='comedy')
+        Genre.objects.create(name='Мелодрама', slug='melodrama')
+        response = client.get(
+            self.GENRES_URL, {'search': 'дрмаа', 'search_mode': 'fuzzy'}
+        )
+        assert self.names(response) == []
+        response = client.get(
+            self.GENRES_URL, {'search': 'драмма', 'search_mode': 'fuzzy'}
+        )
+        assert self.names(response) == ['Драма'], (
+            f'Проверьте, что GET-запрос к `{self.GENRES_URL}` с '
+            '`search_mode=fuzzy` находит названия с опечатками.'
+        )
+        response = client.get(
+            self.GENRES_URL, {'search': 'мелодрама', 'search_mode': 'fuzzy'}
+        )
+        assert self.names(response) == ['Мелодрама', 'Драма'], (
+            f'Проверьте, что GET-запрос к `{self.GENRES_URL}` с '
+            '`search_mode=fuzzy` возвращает лучшие совпадения первыми.'
+        )
+
+    def test_03_cached_table(self, client, django_assert_num_queries):
+        Category.objects.create(name='Фильм', slug='movie')
+        client.get(self.CATEGORY_URL, {'search': 'ф'})
+        # Таблица уже в памяти: запросы только для страницы и её размера.
+        with django_assert_num_queries(2):
+            response = client.get(self.CATEGORY_URL, {'search': 'фи'})
+        assert self.names(response) == ['Фильм']
+        Category.objects.create(name='Фильмы', slug='movies')
+        response = client.get(self.CATEGORY_URL, {'search': 'фил'})
+        assert self.names(response) == ['Фильм', 'Фильмы'], (
+            'Проверьте, что кэш категорий обновляется при их изменении.'
+        )
+
+    def test_04_user_prefix_search(self, admin_client, admin, user):
+        for prefix, expected in (
+            ('TestU', [user.username]),
+            ('testu', [user.username]),
+            ('adm', []),
+            ('TESTA', [admin.username]),
+        ):
+            response = admin_client.get(
+                self.USERS_URL, {'search': prefix, 'search_mode': 'prefix'}
+            )
+            assert [
+                item['username'] for item in response.json()['results']
+            ] == expected, (
+                'Проверьте, что `search_mode=prefix` находит пользователей '
+                'по началу псевдонима без учёта регистра.'
+            )
+
+    def test_05_invalid_mode(self, client):
+        response = client.get(
+            self.CATEGORY_URL, {'search': 'ф', 'search_mode': 'regex'}
+        )
+        assert response.status_code == 400
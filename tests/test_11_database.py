@@ -0,0 +1,53 @@
+import pytest
+from django.db import connection
+from django.test import RequestFactory
+
+from api.middleware import ReadReplicaMiddleware
+from api_yamdb.routers import REPLICA_ALIAS, ReadReplicaRouter, use_replica
+
+
+@pytest.mark.skipif(
+    connection.vendor != 'sqlite', reason='Настройки SQLite'
+)
+@pytest.mark.django_db(transaction=True)
+class Test11SQLiteTuning:
+
+    def test_01_pragmas(self, settings):
+        if not settings.SQLITE_TUNING:
+            pytest.skip('SQLITE_TUNING выключен')
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            assert cursor.fetchone()[0] == 5000
+            cursor.execute('PRAGMA synchronous')
+            assert cursor.fetchone()[0] == 1, (
+                'Проверьте, что соединения SQLite открываются с '
+                '`synchronous = NORMAL`.'
+            )
+
+
+class Test11ReadReplica:
+
+    @staticmethod
+    def routed_alias(settings, method, path):
+        settings.DATABASES = {**settings.DATABASES, REPLICA_ALIAS: {}}
+        middleware = ReadReplicaMiddleware(
+            lambda request: ReadReplicaRouter().db_for_read(None)
+        )
+        request = RequestFactory().generic(method, path)
+        return middleware(request)
+
+    @pytest.mark.parametrize('method, path, alias', (
+        ('GET', '/api/v1/titles/', REPLICA_ALIAS),
+        ('HEAD', '/api/v1/titles/1/', REPLICA_ALIAS),
+        ('POST', '/api/v1/titles/1/reviews/', None),
+        ('GET', '/admin/', None),
+    ))
+    def test_01_safe_api_reads_use_replica(self, settings, method, path,
+                                           alias):
+        assert self.routed_alias(settings, method, path) == alias
+        assert use_replica.get() is False
+
+    def test_02_replica_is_not_migrated(self):
+        router = ReadReplicaRouter()
+        assert router.allow_migrate(REPLICA_ALIAS, 'reviews') is False
+        assert router.allow_migrate('default', 'reviews') is None
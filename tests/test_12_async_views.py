@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.test import AsyncRequestFactory, RequestFactory
+
+from api.authentication import ClaimsAccessToken
+from api.views import CommentViewSet, ReviewViewSet, TitleViewSet
+from reviews.models import Category, Comment, Genre, Review, Title
+
+
+@pytest.mark.django_db(transaction=True)
+class Test12AsyncViews:
+
+    @staticmethod
+    def create_catalogue(author):
+        category = Category.objects.create(name='Фильм', slug='movie')
+        genre = Genre.objects.create(name='Драма', slug='drama')
+        title = Title.objects.create(
+            name='Произведение', year=2000, category=category
+        )
+        title.genre.set([genre])
+        review = Review.objects.create(
+            title=title, author=author, text='Отзыв', score=7
+        )
+        comment = Comment.objects.create(
+            review=review, author=author, text='Комментарий'
+        )
+        return title, review, comment
+
+    @staticmethod
+    def get(viewset, actions, path, settings, **kwargs):
+        settings.ASYNC_READ_VIEWS = False
+        sync_response = viewset.as_view(actions)(
+            RequestFactory().get(path), **kwargs
+        )
+        sync_response.render()
+        settings.ASYNC_READ_VIEWS = True
+        view = viewset.as_view(actions)
+        assert asyncio.iscoroutinefunction(view), (
+            f'Проверьте, что при `ASYNC_READ_VIEWS = True` '
+            f'{viewset.__name__} обрабатывает GET асинхронно.'
+        )
+        response = async_to_sync(view)(
+            AsyncRequestFactory().get(path), **kwargs
+        )
+        return sync_response, response
+
+    def test_01_same_output(self, settings, admin):
+        title, review, comment = self.create_catalogue(admin)
+        cases = (
+            (TitleViewSet, {'get': 'list'}, '/api/v1/titles/', {}),
+            (TitleViewSet, {'get': 'retrieve'},
+             f'/api/v1/titles/{title.id}/', {'pk': str(title.id)}),
+            (ReviewViewSet, {'get': 'list'},
+             f'/api/v1/titles/{title.id}/reviews/',
+             {'title_id': str(title.id)}),
+            (CommentViewSet, {'get': 'retrieve'},
+             f'/api/v1/titles/{title.id}/reviews/{review.id}/comments/'
+             f'{comment.id}/',
+             {'title_id': str(title.id), 'review_id': str(review.id),
+              'pk': str(comment.id)}),
+        )
+        for viewset, actions, path, kwargs in cases:
+            sync_response, response = self.get(
+                viewset, actions, path, settings, **kwargs
+            )
+            assert response.status_code == sync_response.status_code == 200
+            assert response.content == sync_response.content, (
+                f'Проверьте, что асинхронный ответ на GET-запрос к `{path}` '
+                'совпадает с синхронным.'
+            )
+
+    def test_02_not_found(self, settings):
+        _, response = self.get(
+            ReviewViewSet, {'get': 'list'}, '/api/v1/titles/1/reviews/',
+            settings, title_id='1'
+        )
+        assert response.status_code == 404
+
+    def test_03_not_modified_without_queries(self, settings, admin,
+                                             django_assert_num_queries):
+        self.create_catalogue(admin)
+        settings.ASYNC_READ_VIEWS = True
+        view = TitleViewSet.as_view({'get': 'list'})
+        response = async_to_sync(view)(
+            AsyncRequestFactory().get('/api/v1/titles/')
+        )
+        with django_assert_num_queries(0):
+            # AsyncRequestFactory в Django 3.2 принимает заголовки ASGI.
+            response = async_to_sync(view)(AsyncRequestFactory().get(
+                '/api/v1/titles/', **{'if-none-match': response['ETag']}
+            ))
+        assert response.status_code == 304
+
+    def test_04_browsable_api(self, settings, admin):
+        title, review, _ = self.create_catalogue(admin)
+        settings.ASYNC_READ_VIEWS = True
+        headers = {
+            'accept': 'text/html',
+            'authorization': f'Bearer {ClaimsAccessToken.for_user(admin)}',
+        }
+        # Действия как в маршрутизаторе: формы строятся для POST и PATCH.
+        detail = {'get': 'retrieve', 'patch': 'partial_update'}
+        cases = (
+            (TitleViewSet, {'get': 'list', 'post': 'create'},
+             '/api/v1/titles/', {}),
+            (TitleViewSet, detail,
+             f'/api/v1/titles/{title.id}/', {'pk': str(title.id)}),
+            (ReviewViewSet, detail,
+             f'/api/v1/titles/{title.id}/reviews/{review.id}/',
+             {'title_id': str(title.id), 'pk': str(review.id)}),
+        )
+        for viewset, actions, path, kwargs in cases:
+            response = async_to_sync(viewset.as_view(actions))(
+                AsyncRequestFactory().get(path, **headers), **kwargs
+            )
+            if hasattr(response, 'render'):
+                response = async_to_sync(sync_to_async(response.render))()
+            assert response.status_code == 200, (
+                f'Проверьте, что GET-запрос администратора к `{path}` с '
+                '`Accept: text/html` при `ASYNC_READ_VIEWS = True` '
+                'возвращает страницу BrowsableAPI.'
+            )
+            assert b'<html' in response.content
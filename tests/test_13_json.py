@@ -0,0 +1,138 @@
+import datetime
+import io
+import uuid
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+from api import parsers, renderers
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer
+
+DATA = ReturnDict({
+    'count': 2,
+    'next': None,
+    'results': ReturnList([
+        {
+            'id': 1,
+            'name': 'Иван Васильевич меняет профессию',
+            'text': 'Строка\u2028абзац\u2029конец "кавычки" \\ / \t\n',
+            'pub_date': datetime.datetime(
+                2021, 3, 1, 12, 30, 15, 123456, tzinfo=timezone.utc
+            ),
+            'naive': datetime.datetime(2021, 3, 1, 12, 30),
+            'date': datetime.date(2021, 3, 1),
+            'time': datetime.time(12, 30, 15, 500),
+            'duration': datetime.timedelta(hours=1, microseconds=5),
+            'score': Decimal('7.50'),
+            'rating': 7.333333333333333,
+            'big': 2 ** 70,
+            'uuid': uuid.UUID(int=1),
+            'lazy': gettext_lazy('Отзыв'),
+            'error': ErrorDetail('Обязательное поле.', code='required'),
+            'flags': (True, False, None),
+            'empty': {},
+            1: 'числовой ключ',
+            'emoji': '\U0001f3ac',
+        },
+    ], serializer=None),
+}, serializer=None)
+
+# Страница поиска: rank из bm25 FTS5 порядка 1e-06.
+SEARCH_PAGE = ReturnDict({
+    'count': 3,
+    'next': None,
+    'previous': None,
+    'results': ReturnList([
+        {'type': 'title', 'id': 1, 'rank': -1.2e-06,
+         'snippet': 'Иван Васильевич <b>меняет</b> профессию'},
+        {'type': 'review', 'id': 2, 'rank': 2.5e-05, 'snippet': '1e5'},
+        {'type': 'comment', 'id': 3, 'rank': 1e+16, 'snippet': ''},
+    ], serializer=None),
+}, serializer=None)
+
+
+class Test13FastJSON:
+
+    @pytest.mark.parametrize('data', (
+        DATA,
+        DATA['results'],
+        SEARCH_PAGE,
+        [1e-06, 1e16, 2.5e-05, -3e-7, 1.5e300, 0.0001, 1e15, 123.456],
+        {'detail': 'Страница не найдена.'},
+        [],
+        'строка',
+        0,
+    ))
+    def test_01_same_output(self, data):
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(data), (
+            'Проверьте, что FastJSONRenderer отрисовывает JSON байт в байт '
+            'как JSONRenderer DRF.'
+        )
+
+    @pytest.mark.parametrize('media_type', (
+        'application/json; indent=4', 'application/json'
+    ))
+    def test_02_indent(self, media_type):
+        assert FastJSONRenderer().render(DATA, media_type) == (
+            JSONRenderer().render(DATA, media_type)
+        )
+
+    def test_03_none(self):
+        assert FastJSONRenderer().render(None) == b''
+
+    def test_04_fallback_without_orjson(self, monkeypatch):
+        monkeypatch.setattr(renderers, 'orjson', None)
+        monkeypatch.setattr(parsers, 'orjson', None)
+        body = FastJSONRenderer().render(DATA)
+        assert body == JSONRenderer().render(DATA)
+        assert FastJSONParser().parse(io.BytesIO(body)) == (
+            JSONParser().parse(io.BytesIO(body))
+        )
+
+    @pytest.mark.parametrize('body', (
+        '{"text": "Отзыв", "score": 7, "ok": true, "none": null}',
+        '[1.5, -2, 1e3, "\\u041e\\u0442\\u0437\\u044b\\u0432"]',
+        '{"big": 12345678901234567890123}',
+    ))
+    def test_05_parse(self, body):
+        body = body.encode()
+        assert FastJSONParser().parse(io.BytesIO(body)) == (
+            JSONParser().parse(io.BytesIO(body))
+        )
+
+    @pytest.mark.parametrize('body', ('{"text": ', '{"score": NaN}'))
+    def test_06_parse_error(self, body):
+        body = body.encode()
+        with pytest.raises(ParseError) as expected:
+            JSONParser().parse(io.BytesIO(body))
+        with pytest.raises(ParseError) as error:
+            FastJSONParser().parse(io.BytesIO(body))
+        assert str(error.value) == str(expected.value)
+
+    def test_07_parse_other_encoding(self):
+        body = '{"text": "Отзыв"}'.encode('cp1251')
+        context = {'encoding': 'cp1251'}
+        assert FastJSONParser().parse(io.BytesIO(body), None, context) == {
+            'text': 'Отзыв'
+        }
+
+    def test_08_fast_path(self, monkeypatch):
+        data = dict(DATA['results'][0])
+        del data['big']
+        body = JSONRenderer().render(data)
+
+        def stdlib_render(*args, **kwargs):
+            raise AssertionError(
+                'Проверьте, что FastJSONRenderer отрисовывает обычные ответы '
+                'через orjson.'
+            )
+
+        monkeypatch.setattr(JSONRenderer, 'render', stdlib_render)
+        assert FastJSONRenderer().render(data) == body
@@ -0,0 +1,83 @@
+import pytest
+from django.core.cache import cache
+
+from api.lookups import categories, genres
+from api.serializers import TitleSafeSerializer
+from benchmarks.seed import seed_catalogue
+from reviews.models import Category, Title
+
+SIZES = {
+    'users': 10,
+    'categories': 3,
+    'genres': 5,
+    'titles': 30,
+    'reviews_per_title': 3,
+    'comments_per_review': 2,
+}
+
+
+@pytest.mark.django_db(transaction=True)
+class Test14FastSerializers:
+
+    @pytest.fixture
+    def catalogue(self):
+        data = seed_catalogue(seed=0, **SIZES)
+        # Произведения без категории, жанров и оценок.
+        Category.objects.filter(slug=data['categories'][0]).delete()
+        title = Title.objects.create(name='Без жанров', year=2000)
+        data['titles'].append(title.id)
+        return data
+
+    @staticmethod
+    def get_both(client, settings, url):
+        contents = []
+        for fast in (False, True):
+            settings.FAST_READ_SERIALIZERS = fast
+            cache.clear()
+            categories.clear()
+            genres.clear()
+            response = client.get(url)
+            assert response.status_code == 200, url
+            contents.append(response.content)
+        return contents
+
+    def test_01_same_json(self, client, settings, catalogue):
+        title_id = catalogue['titles'][0]
+        review_id, review_title_id = catalogue['reviews'][0]
+        urls = (
+            '/api/v1/titles/?limit=100',
+            '/api/v1/titles/?ordering=-rating&limit=7&offset=3',
+            f'/api/v1/titles/?genre={catalogue["genres"][1]}',
+            f'/api/v1/titles/{title_id}/',
+            f'/api/v1/titles/{title_id}/reviews/',
+            f'/api/v1/titles/{title_id}/reviews/?cursor=&limit=2',
+            f'/api/v1/titles/{catalogue["titles"][-1]}/reviews/',
+            f'/api/v1/titles/{review_title_id}/reviews/{review_id}/comments/',
+        )
+        for url in urls:
+            slow, fast = self.get_both(client, settings, url)
+            assert fast == slow, (
+                f'Проверьте, что ответ на GET-запрос к `{url}` с '
+                '`FAST_READ_SERIALIZERS = True` совпадает с ответом '
+                'ModelSerializer байт в байт.'
+            )
+
+    def test_02_rows(self, client, settings, catalogue, monkeypatch,
+                     django_assert_max_num_queries):
+        settings.FAST_READ_SERIALIZERS = True
+        client.get('/api/v1/titles/')
+        cache.clear()
+        rows = []
+        represent_rows = TitleSafeSerializer.represent_rows
+        monkeypatch.setattr(
+            TitleSafeSerializer, 'represent_rows',
+            lambda serializer, page: rows.extend(page) or represent_rows(
+                serializer, page
+            )
+        )
+        with django_assert_max_num_queries(3):
+            client.get('/api/v1/titles/')
+        assert rows, (
+            'Проверьте, что при `FAST_READ_SERIALIZERS = True` список '
+            'произведений сериализуется из строк `.values()`.'
+        )
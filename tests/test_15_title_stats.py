@@ -0,0 +1,106 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import SCORES, Review, Title, score_count_field
+
+STATS_URL = '/api/v1/titles/{title_id}/stats/'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test15TitleStats:
+
+    @staticmethod
+    def histogram(**counts):
+        return [
+            {'score': score, 'count': counts.get(f's{score}', 0)}
+            for score in range(1, 11)
+        ]
+
+    def test_01_empty(self, client):
+        title = Title.objects.create(name='Без отзывов', year=2000)
+        response = client.get(STATS_URL.format(title_id=title.id))
+        assert response.status_code == HTTPStatus.OK, (
+            f'Проверьте, что GET-запрос к `{STATS_URL}` возвращает ответ '
+            'со статусом 200.'
+        )
+        assert response.json() == {
+            'count': 0,
+            'mean': None,
+            'median': None,
+            'histogram': self.histogram(),
+        }
+
+    def test_02_not_found(self, client):
+        for title_id in ('1', 'abc'):
+            response = client.get(STATS_URL.format(title_id=title_id))
+            assert response.status_code == HTTPStatus.NOT_FOUND
+
+    def test_03_write_path(self, client, admin, moderator, user,
+                           django_assert_num_queries):
+        title = Title.objects.create(name='Произведение', year=2000)
+        other = Title.objects.create(name='Другое', year=2000)
+        Review.objects.create(title=title, author=admin, text='1', score=2)
+        Review.objects.create(title=title, author=moderator, text='2', score=9)
+        review = Review.objects.create(
+            title=title, author=user, text='3', score=9
+        )
+        url = STATS_URL.format(title_id=title.id)
+        with django_assert_num_queries(1):
+            data = client.get(url).json()
+        assert data == {
+            'count': 3,
+            'mean': 20 / 3,
+            'median': 9,
+            'histogram': self.histogram(s2=1, s9=2),
+        }, (
+            f'Проверьте, что `{STATS_URL}` возвращает количество, среднее, '
+            'медиану и гистограмму оценок произведения.'
+        )
+
+        review.score = 5
+        review.save()
+        data = client.get(url).json()
+        assert data['median'] == 5
+        assert data['histogram'] == self.histogram(s2=1, s5=1, s9=1)
+
+        review.title = other
+        review.save()
+        data = client.get(url).json()
+        assert data['count'] == 2
+        assert data['median'] == 5.5
+        assert data['histogram'] == self.histogram(s2=1, s9=1)
+        assert client.get(
+            STATS_URL.format(title_id=other.id)
+        ).json()['histogram'] == self.histogram(s5=1)
+
+        Review.objects.filter(score=2).get().delete()
+        assert client.get(url).json() == {
+            'count': 1,
+            'mean': 9,
+            'median': 9,
+            'histogram': self.histogram(s9=1),
+        }
+
+    def test_04_rebuild(self, admin, user):
+        title = Title.objects.create(name='Произведение', year=2000)
+        Review.objects.bulk_create((
+            Review(title=title, author=admin, text='1', score=4),
+            Review(title=title, author=user, text='2', score=4),
+        ))
+        Title.objects.rebuild_ratings()
+        title.refresh_from_db()
+        assert title.score_counts == {
+            score: 2 if score == 4 else 0 for score in range(1, 11)
+        }
+        assert title.score_median == 4
+
+    def test_05_score_count_fields(self):
+        declared = {
+            field.name for field in Title._meta.get_fields()
+            if field.name.startswith('score_')
+        }
+        assert declared == {score_count_field(score) for score in SCORES}, (
+            'Проверьте, что у модели Title объявлено поле счётчика для '
+            'каждого значения оценки от MIN_SCORE до MAX_SCORE.'
+        )
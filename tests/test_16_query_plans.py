@@ -0,0 +1,45 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+
+from api.management.commands import check_query_plans
+from reviews.models import Category, Genre
+
+
+@pytest.mark.django_db(transaction=True)
+class Test16QueryPlans:
+
+    @staticmethod
+    def run_command():
+        out = StringIO()
+        call_command('check_query_plans', stdout=out)
+        return out.getvalue()
+
+    @pytest.mark.skipif(
+        connection.vendor != 'sqlite', reason='Планы SQLite'
+    )
+    def test_01_filters_use_indexes(self):
+        Category.objects.create(name='Фильм', slug='movie')
+        Genre.objects.create(name='Драма', slug='drama')
+        output = self.run_command()
+        assert 'title_category_year_idx' in output, (
+            'Проверьте, что фильтр по категории планируется по индексу '
+            '`title_category_year_idx`.'
+        )
+        assert 'genre_title_genre_idx' in output, (
+            'Проверьте, что фильтр по жанру планируется по индексу '
+            '`genre_title_genre_idx`.'
+        )
+
+    def test_02_empty_database(self):
+        assert 'titles?genre=' in self.run_command()
+
+    def test_03_empty_queryset(self, monkeypatch):
+        monkeypatch.setattr(check_query_plans, 'slug_of', lambda model: 'x')
+        output = self.run_command()
+        assert 'titles?category=: пустая выборка' in output, (
+            'Проверьте, что check_query_plans не строит план для заведомо '
+            'пустой выборки.'
+        )
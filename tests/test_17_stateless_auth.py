@@ -0,0 +1,95 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.cache import cache
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from api import authentication
+from api.authentication import (
+    ClaimsAccessToken, ClaimsTokenUser, StatelessJWTAuthentication
+)
+from reviews.models import User
+
+
+def bearer(user):
+    return f'Bearer {ClaimsAccessToken.for_user(user)}'
+
+
+def client_for(user):
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=bearer(user))
+    return client
+
+
+def authenticate(authorization, method='get'):
+    request = getattr(APIRequestFactory(), method)(
+        '/', HTTP_AUTHORIZATION=authorization
+    )
+    user, _ = StatelessJWTAuthentication().authenticate(Request(request))
+    return user
+
+
+@pytest.mark.django_db(transaction=True)
+class Test17StatelessAuth:
+
+    @pytest.fixture
+    def shared_cache(self, monkeypatch):
+        # В тестах один процесс: кэш в памяти ведёт себя как общий.
+        monkeypatch.setattr(authentication, 'is_shared', lambda cache: True)
+
+    def test_01_claims_user(self, user, shared_cache):
+        # Отметка о создании пользователя старше нового токена.
+        cache.clear()
+        authorization = bearer(user)
+        assert isinstance(authenticate(authorization), ClaimsTokenUser), (
+            'Проверьте, что с общим кэшем пользователь безопасного запроса '
+            'строится из полезной нагрузки токена.'
+        )
+        assert isinstance(authenticate(authorization, 'post'), User)
+
+    def test_02_process_cache(self, user):
+        cache.clear()
+        assert isinstance(authenticate(bearer(user)), User), (
+            'Проверьте, что с кэшем в памяти процесса пользователь всегда '
+            'загружается из базы: отметки других процессов ему не видны.'
+        )
+
+    def test_03_demoted_admin(self, admin, shared_cache):
+        authorization = bearer(admin)
+        client = client_for(admin)
+        admin.role = 'user'
+        admin.save()
+        assert isinstance(authenticate(authorization), User)
+        response = client.get('/api/v1/users/')
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что после снятия роли администратора ранее выданный '
+            'токен не даёт доступа к `/api/v1/users/`.'
+        )
+        # Отметка об изменении потеряна (другой процесс, вытеснение из
+        # кэша): представления администратора всё равно читают роль из базы.
+        cache.clear()
+        response = client.get('/api/v1/users/')
+        assert response.status_code == HTTPStatus.FORBIDDEN, (
+            'Проверьте, что представления только для администратора не '
+            'доверяют роли из токена.'
+        )
+
+    def test_04_deleted_user(self, user, shared_cache):
+        client = client_for(user)
+        user.delete()
+        response = client.get('/api/v1/titles/')
+        assert response.status_code == HTTPStatus.UNAUTHORIZED, (
+            'Проверьте, что токен удалённого пользователя отклоняется.'
+        )
+
+    def test_05_renamed_user(self, user, shared_cache):
+        authorization = bearer(user)
+        user.username = 'RenamedUser'
+        user.save()
+        authenticated = authenticate(authorization)
+        assert isinstance(authenticated, User)
+        assert authenticated.username == 'RenamedUser', (
+            'Проверьте, что после переименования пользователь ранее '
+            'выданного токена загружается из базы.'
+        )
@@ -0,0 +1,133 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from api.cache import get_cache
+from reviews.models import Category, Review, Title
+
+CATEGORIES_URL = '/api/v1/categories/'
+TITLE_URL = '/api/v1/titles/{title_id}/'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test18ResponseCache:
+
+    def test_01_hit(self, client, django_assert_num_queries):
+        Category.objects.create(name='Фильм', slug='movie')
+        response = client.get(CATEGORIES_URL)
+        with django_assert_num_queries(0):
+            cached = client.get(CATEGORIES_URL)
+        assert cached.json() == response.json(), (
+            'Проверьте, что повторный GET-запрос получает ответ из кэша без '
+            'обращения к базе.'
+        )
+
+    def test_02_miss(self, client):
+        Category.objects.create(name='Фильм', slug='movie')
+        client.get(CATEGORIES_URL)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(CATEGORIES_URL, {'search': 'Книга'})
+        assert queries, (
+            'Проверьте, что запрос с другими параметрами не получает '
+            'закэшированный ответ.'
+        )
+        assert response.json()['results'] == []
+
+    def test_03_invalidation(self, client):
+        client.get(CATEGORIES_URL)
+        Category.objects.create(name='Фильм', slug='movie')
+        assert client.get(CATEGORIES_URL).json()['count'] == 1, (
+            'Проверьте, что изменение данных сбрасывает кэш ответов.'
+        )
+
+    def test_04_csv_parser(self, client, tmp_path):
+        Category.objects.create(id=1, name='Фильм', slug='movie')
+        client.get(CATEGORIES_URL)
+        (tmp_path / 'category.csv').write_text(
+            'id,name,slug\n1,Кино,movie\n2,Книга,book\n', encoding='utf-8'
+        )
+        call_command('csv_parser', path=str(tmp_path))
+        names = [
+            category['name']
+            for category in client.get(CATEGORIES_URL).json()['results']
+        ]
+        assert sorted(names) == ['Кино', 'Книга'], (
+            'Проверьте, что команда `csv_parser` сбрасывает кэш ответов.'
+        )
+
+    def test_05_rebuild_ratings(self, client, admin, user):
+        title = Title.objects.create(name='Произведение', year=2000)
+        Review.objects.create(title=title, author=admin, text='1', score=2)
+        Review.objects.create(title=title, author=user, text='2', score=4)
+        url = TITLE_URL.format(title_id=title.id)
+        assert client.get(url).json()['rating'] == 3
+        Review.objects.update(score=10)
+        call_command('rebuild_ratings')
+        assert client.get(url).json()['rating'] == 10, (
+            'Проверьте, что команда `rebuild_ratings` сбрасывает кэш ответов.'
+        )
+
+    def test_06_not_modified(self, client, django_assert_num_queries):
+        Category.objects.create(name='Фильм', slug='movie')
+        etag = client.get(CATEGORIES_URL)['ETag']
+        with django_assert_num_queries(0):
+            response = client.get(CATEGORIES_URL, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+            'Проверьте, что запрос с актуальным `If-None-Match` получает '
+            'ответ 304 без обращения к базе.'
+        )
+        assert response['ETag'] == etag
+
+    def test_07_etag_after_write(self, client, admin):
+        title = Title.objects.create(name='Произведение', year=2000)
+        url = TITLE_URL.format(title_id=title.id)
+        etags = [client.get(url)['ETag']]
+        Review.objects.create(title=title, author=admin, text='1', score=2)
+        etags.append(client.get(url)['ETag'])
+        Review.objects.update(score=5)
+        call_command('rebuild_ratings')
+        etags.append(client.get(url)['ETag'])
+        assert len(set(etags)) == 3, (
+            'Проверьте, что после изменения данных ответ получает новый ETag.'
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etags[0])
+        assert response.status_code == HTTPStatus.OK
+        assert response['ETag'] == etags[-1]
+
+    def test_08_host_in_key(self, client):
+        for number in range(2):
+            Category.objects.create(
+                name=f'Категория {number}', slug=f's{number}'
+            )
+        client.get(CATEGORIES_URL, {'limit': 1}, HTTP_HOST='internal:8000')
+        response = client.get(
+            CATEGORIES_URL, {'limit': 1}, HTTP_HOST='api.example.com'
+        )
+        assert response.json()['next'].startswith(
+            'http://api.example.com/'
+        ), (
+            'Проверьте, что закэшированные ссылки `next` и `previous` не '
+            'отдаются запросам к другому хосту.'
+        )
+
+    def test_09_version_timeout(self, client, settings, monkeypatch):
+        settings.API_CACHE_VERSION_TIMEOUT = 123
+        backend = get_cache()
+        timeouts = []
+        add, set_many = backend.add, backend.set_many
+        monkeypatch.setattr(backend, 'add', lambda key, value, timeout: (
+            timeouts.append(timeout) or add(key, value, timeout)
+        ))
+        monkeypatch.setattr(backend, 'set_many', lambda data, timeout: (
+            timeouts.append(timeout) or set_many(data, timeout)
+        ))
+        client.get(TITLE_URL.format(title_id=100500))
+        client.get('/api/v1/titles/100500/reviews/')
+        Category.objects.create(name='Фильм', slug='movie')
+        assert timeouts and set(timeouts) == {123}, (
+            'Проверьте, что версии областей кэша хранятся ограниченное '
+            'время `API_CACHE_VERSION_TIMEOUT`.'
+        )
@@ -0,0 +1,141 @@
+import time
+from datetime import timedelta
+
+import pytest
+from django.core import mail
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from reviews import mail_queue
+from reviews.mail_queue import (
+    DatabaseMailQueue, SyncMailQueue, ThreadPoolMailQueue
+)
+from reviews.models import OutboxEmail
+
+
+def enqueue(queue, count=1):
+    for number in range(count):
+        queue.enqueue(
+            f'Письмо {number}', 'Текст', 'yamdb@yamdb.fake',
+            [f'user{number}@yamdb.fake']
+        )
+
+
+def wait_for_outbox(count, timeout=5):
+    deadline = time.monotonic() + timeout
+    while len(mail.outbox) < count and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return len(mail.outbox)
+
+
+@pytest.mark.django_db(transaction=True)
+class Test19MailQueue:
+
+    def test_01_sync(self):
+        enqueue(SyncMailQueue())
+        assert [message.to for message in mail.outbox] == [
+            ['user0@yamdb.fake']
+        ]
+
+    def test_02_database(self):
+        queue = DatabaseMailQueue()
+        enqueue(queue, 3)
+        assert not mail.outbox, (
+            'Проверьте, что DatabaseMailQueue не отправляет письма в запросе.'
+        )
+        assert queue.send_pending(batch_size=2) == 2
+        assert queue.send_pending(batch_size=2) == 1
+        assert queue.send_pending() == 0
+        assert len(mail.outbox) == 3
+        assert not OutboxEmail.objects.filter(sent_at__isnull=True).exists()
+        assert set(
+            OutboxEmail.objects.values_list('attempts', flat=True)
+        ) == {1}
+
+    def test_03_database_sends_outside_transaction(self, monkeypatch):
+        queue = DatabaseMailQueue()
+        enqueue(queue, 2)
+        deliver = mail_queue.deliver
+        nested = []
+
+        def spy(messages):
+            assert not connection.in_atomic_block, (
+                'Проверьте, что письма отправляются вне транзакции.'
+            )
+            nested.append(queue.send_pending())
+            return deliver(messages)
+
+        monkeypatch.setattr(mail_queue, 'deliver', spy)
+        assert queue.send_pending() == 2
+        assert nested == [0], (
+            'Проверьте, что занятые письма не отправляет другой процесс.'
+        )
+
+    def test_04_database_retry(self, settings, monkeypatch):
+        settings.MAIL_QUEUE_RETRY_DELAY = 60
+        settings.MAIL_QUEUE_MAX_ATTEMPTS = 2
+        queue = DatabaseMailQueue()
+        enqueue(queue)
+        monkeypatch.setattr(
+            mail_queue, 'deliver', lambda messages: ['нет соединения']
+        )
+        started = timezone.now()
+        assert queue.send_pending() == 0
+        email = OutboxEmail.objects.get()
+        assert email.attempts == 1
+        assert email.last_error == 'нет соединения'
+        assert email.locked_until >= started + timedelta(seconds=60), (
+            'Проверьте, что повторная отправка откладывается на '
+            '`MAIL_QUEUE_RETRY_DELAY` секунд.'
+        )
+        assert queue.send_pending() == 0
+        assert OutboxEmail.objects.get().attempts == 1
+
+        OutboxEmail.objects.update(locked_until=started)
+        assert queue.send_pending() == 0
+        OutboxEmail.objects.update(locked_until=started)
+        monkeypatch.undo()
+        assert queue.send_pending() == 0, (
+            'Проверьте, что после `MAIL_QUEUE_MAX_ATTEMPTS` попыток письмо '
+            'больше не отправляется.'
+        )
+        assert OutboxEmail.objects.get().attempts == 2
+        assert not mail.outbox
+
+    def test_05_expired_claim(self):
+        queue = DatabaseMailQueue()
+        enqueue(queue)
+        # Отправитель занял письмо и упал до записи результата.
+        OutboxEmail.objects.update(
+            attempts=1, locked_until=timezone.now() + timedelta(minutes=5)
+        )
+        assert queue.send_pending() == 0
+        OutboxEmail.objects.update(locked_until=timezone.now())
+        assert queue.send_pending() == 1
+        assert len(mail.outbox) == 1
+
+    def test_06_send_queued_mail(self, capsys):
+        enqueue(DatabaseMailQueue(), 2)
+        call_command('send_queued_mail')
+        assert 'Отправлено писем: 2' in capsys.readouterr().out
+        assert len(mail.outbox) == 2
+
+    def test_07_thread_pool(self, settings, monkeypatch):
+        settings.MAIL_QUEUE_RETRY_DELAY = 0
+        deliver = mail_queue.deliver
+        calls = []
+
+        def flaky(messages):
+            calls.append(len(messages))
+            if len(calls) == 1:
+                return ['нет соединения'] * len(messages)
+            return deliver(messages)
+
+        monkeypatch.setattr(mail_queue, 'deliver', flaky)
+        enqueue(ThreadPoolMailQueue(), 2)
+        assert wait_for_outbox(2) == 2, (
+            'Проверьте, что ThreadPoolMailQueue отправляет письма в фоновом '
+            'потоке и повторяет неудачные.'
+        )
+        assert len(calls) >= 2
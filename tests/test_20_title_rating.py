@@ -0,0 +1,71 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.management import call_command
+
+from reviews.models import Review, Title
+
+REVIEWS_URL = '/api/v1/titles/{title_id}/reviews/'
+REVIEW_URL = '/api/v1/titles/{title_id}/reviews/{review_id}/'
+
+
+def rating_fields(title):
+    title.refresh_from_db()
+    return title.rating, title.rating_sum, title.rating_count
+
+
+@pytest.mark.django_db(transaction=True)
+class Test20TitleRating:
+
+    def test_01_review_changes(self, user_client, moderator_client):
+        title = Title.objects.create(name='Произведение', year=2000)
+        url = REVIEWS_URL.format(title_id=title.id)
+        response = user_client.post(url, {'text': 'Отзыв', 'score': 4})
+        assert response.status_code == HTTPStatus.CREATED
+        review_id = response.json()['id']
+        assert rating_fields(title) == (4, 4, 1), (
+            'Проверьте, что создание отзыва обновляет рейтинг произведения.'
+        )
+        moderator_client.post(url, {'text': 'Отзыв', 'score': 9})
+        assert rating_fields(title) == (6.5, 13, 2)
+
+        review_url = REVIEW_URL.format(title_id=title.id, review_id=review_id)
+        response = user_client.patch(review_url, {'score': 7})
+        assert response.status_code == HTTPStatus.OK
+        assert rating_fields(title) == (8, 16, 2), (
+            'Проверьте, что изменение оценки обновляет рейтинг произведения.'
+        )
+        user_client.patch(review_url, {'text': 'Новый текст'})
+        assert rating_fields(title) == (8, 16, 2)
+
+        assert user_client.delete(review_url).status_code == (
+            HTTPStatus.NO_CONTENT
+        )
+        assert rating_fields(title) == (9, 9, 1), (
+            'Проверьте, что удаление отзыва обновляет рейтинг произведения.'
+        )
+        Review.objects.get().delete()
+        assert rating_fields(title) == (None, 0, 0)
+        assert user_client.get(
+            f'/api/v1/titles/{title.id}/'
+        ).json()['rating'] is None
+
+    def test_02_rebuild_ratings(self, admin, user, capsys):
+        title = Title.objects.create(name='Произведение', year=2000)
+        empty = Title.objects.create(name='Без отзывов', year=2000)
+        Review.objects.bulk_create((
+            Review(title=title, author=admin, text='1', score=3),
+            Review(title=title, author=user, text='2', score=8),
+        ))
+        Title.objects.filter(pk=empty.pk).update(
+            rating=5, rating_sum=5, rating_count=1
+        )
+        call_command('rebuild_ratings')
+        assert 'Рейтинг пересчитан для 2 произведений' in (
+            capsys.readouterr().out
+        )
+        assert rating_fields(title) == (5.5, 11, 2), (
+            'Проверьте, что команда `rebuild_ratings` пересчитывает рейтинг '
+            'по таблице отзывов.'
+        )
+        assert rating_fields(empty) == (None, 0, 0)
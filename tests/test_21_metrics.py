@@ -0,0 +1,135 @@
+import json
+import logging
+import time
+
+import pytest
+from django.core.management import call_command
+from django.test import Client
+
+from api.metrics import METRICS
+from api.serializers import RowListSerializer
+from reviews.models import Title
+
+
+@pytest.fixture
+def metrics_log(caplog, monkeypatch):
+    # Записи api.metrics попадают в caplog, а не в METRICS_LOG_FILE.
+    monkeypatch.setattr(
+        logging.getLogger('api.metrics'), 'handlers', [caplog.handler]
+    )
+    return caplog
+
+
+def entries(caplog):
+    return [
+        json.loads(record.getMessage()) for record in caplog.records
+        if record.name == 'api.metrics'
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test21Metrics:
+
+    def test_01_middleware(self, settings, metrics_log):
+        settings.METRICS_ENABLED = True
+        settings.METRICS_SAMPLE_RATE = 1.0
+        Title.objects.create(name='Произведение', year=2000)
+        client = Client()
+        assert client.get('/api/v1/titles/').status_code == 200
+        client.get('/api/v1/titles/', HTTP_ACCEPT='text/html')
+        client.get('/api/v1/no-such-url/')
+        logged = entries(metrics_log)
+        assert [entry['route'] for entry in logged] == [
+            'GET titles-list', 'GET titles-list'
+        ], (
+            'Проверьте, что MetricsMiddleware записывает замеры каждого '
+            'запроса к известному маршруту.'
+        )
+        json_entry, html_entry = logged
+        assert json_entry['status'] == 200
+        assert json_entry['sql_count'] > 0
+        for entry in logged:
+            assert set(METRICS) <= set(entry)
+            assert all(entry[metric] >= 0 for metric in METRICS)
+            assert entry['total_time'] >= (
+                entry['sql_time'] + entry['view_time']
+                + entry['serialize_time'] + entry['render_time']
+            ) * 0.999
+        assert json_entry['serialize_time'] > 0, (
+            'Проверьте, что MetricsMiddleware замеряет время сериализации.'
+        )
+        assert html_entry['render_time'] > 0, (
+            'Проверьте, что MetricsMiddleware замеряет время рендеринга.'
+        )
+
+    def test_02_serialize_time(self, settings, metrics_log, monkeypatch):
+        settings.METRICS_ENABLED = True
+        settings.METRICS_SAMPLE_RATE = 1.0
+        Title.objects.create(name='Произведение', year=2000)
+        to_representation = RowListSerializer.to_representation
+
+        def slow(self, data):
+            time.sleep(0.05)
+            return to_representation(self, data)
+
+        monkeypatch.setattr(RowListSerializer, 'to_representation', slow)
+        assert Client().get('/api/v1/titles/').status_code == 200
+        entry, = entries(metrics_log)
+        assert entry['serialize_time'] >= 0.05, (
+            'Проверьте, что `serialize_time` включает to_representation '
+            'сериализатора списка.'
+        )
+        assert entry['view_time'] < 0.05, (
+            'Проверьте, что время сериализации не входит в `view_time`.'
+        )
+
+    def test_03_sampling(self, settings, metrics_log):
+        settings.METRICS_ENABLED = True
+        settings.METRICS_SAMPLE_RATE = 0.0
+        Client().get('/api/v1/titles/')
+        assert not entries(metrics_log)
+
+    def test_04_disabled(self, settings, metrics_log):
+        settings.METRICS_ENABLED = False
+        Client().get('/api/v1/titles/')
+        assert not entries(metrics_log)
+
+    def test_05_metrics_report(self, tmp_path, capsys):
+        log = tmp_path / 'metrics.log'
+        lines = [
+            json.dumps({
+                'route': 'GET titles-list', 'sql_count': count,
+                'sql_time': 0.001 * count, 'view_time': 0.002,
+                'serialize_time': 0.001,
+                'render_time': 0.003, 'total_time': 0.01 * count,
+            })
+            for count in range(1, 101)
+        ]
+        lines += [
+            json.dumps({'route': 'POST signup', 'total_time': 0.5}),
+            'не JSON',
+            json.dumps(['без маршрута']),
+        ]
+        log.write_text('\n'.join(lines), encoding='utf-8')
+
+        call_command('metrics_report', file=str(log), json=True)
+        summary = json.loads(capsys.readouterr().out)
+        assert set(summary) == {'GET titles-list', 'POST signup'}
+        titles = summary['GET titles-list']
+        assert titles['requests'] == 100
+        assert titles['sql_count'] == {'p50': 50, 'p95': 95, 'p99': 99}, (
+            'Проверьте, что `metrics_report` считает перцентили методом '
+            'ближайшего ранга.'
+        )
+        assert summary['POST signup']['sql_count'] == {
+            'p50': 0, 'p95': 0, 'p99': 0
+        }
+
+        call_command('metrics_report', file=str(log))
+        output = capsys.readouterr().out
+        assert 'GET titles-list: 100 запросов' in output
+        assert 'sql_count: p50=50, p95=95, p99=99' in output
+
+    def test_06_metrics_report_missing_file(self, tmp_path, capsys):
+        call_command('metrics_report', file=str(tmp_path / 'missing.log'))
+        assert 'Ошибка при чтении журнала' in capsys.readouterr().out
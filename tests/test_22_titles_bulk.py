@@ -0,0 +1,117 @@
+from http import HTTPStatus
+
+import pytest
+
+from reviews.models import Category, Genre, Title
+
+BULK_URL = '/api/v1/titles/bulk/'
+TITLES_URL = '/api/v1/titles/'
+
+
+def item(name, genre=('drama',), category='movie', **fields):
+    return {
+        'name': name, 'year': 2000, 'genre': list(genre),
+        'category': category, **fields
+    }
+
+
+@pytest.mark.django_db(transaction=True)
+class Test22TitlesBulk:
+
+    @pytest.fixture(autouse=True)
+    def catalogue(self):
+        Category.objects.create(name='Фильм', slug='movie')
+        Category.objects.create(name='Книга', slug='book')
+        Genre.objects.create(name='Драма', slug='drama')
+        Genre.objects.create(name='Комедия', slug='comedy')
+
+    def test_01_create(self, admin_client, monkeypatch):
+        Title.objects.create(name='Уже есть', year=1990)
+
+        def save(*args, **kwargs):
+            raise AssertionError(
+                'Проверьте, что произведения вставляются bulk_create, а не '
+                'по одному.'
+            )
+
+        monkeypatch.setattr(Title, 'save', save)
+        response = admin_client.post(BULK_URL, [
+            item('Первое', genre=('drama', 'comedy', 'drama')),
+            item('Второе', genre=(), category='book', description='Текст'),
+            item('Третье', genre=('comedy',)),
+        ], format='json')
+        assert response.status_code == HTTPStatus.CREATED
+        results = response.json()
+        assert [set(result) for result in results] == [{'id'}] * 3
+        for result, (name, genres, category) in zip(results, (
+            ('Первое', ['drama', 'comedy'], 'movie'),
+            ('Второе', [], 'book'),
+            ('Третье', ['comedy'], 'movie'),
+        )):
+            title = admin_client.get(f'{TITLES_URL}{result["id"]}/').json()
+            assert title['name'] == name, (
+                'Проверьте, что пакетное создание возвращает id созданных '
+                'произведений в порядке запроса.'
+            )
+            assert sorted(genre['slug'] for genre in title['genre']) == (
+                sorted(genres)
+            ), 'Проверьте, что произведения связываются со своими жанрами.'
+            assert title['category']['slug'] == category
+
+    def test_02_item_errors(self, admin_client):
+        response = admin_client.post(BULK_URL, [
+            item('Верное'),
+            item('Нет категории', category='unknown'),
+            item('Нет жанра', genre=('drama', 'unknown')),
+            {'name': 'Без полей'},
+            'не объект',
+        ], format='json')
+        assert response.status_code == HTTPStatus.CREATED
+        results = response.json()
+        assert len(results) == 5
+        assert 'id' in results[0]
+        assert set(results[1]['errors']) == {'category'}
+        assert set(results[2]['errors']) == {'genre'}
+        assert len(results[2]['errors']['genre']) == 1
+        assert {'year', 'genre', 'category'} <= set(results[3]['errors'])
+        assert 'errors' in results[4]
+        assert Title.objects.count() == 1, (
+            'Проверьте, что отклонённые элементы не создаются.'
+        )
+
+        response = admin_client.post(
+            BULK_URL, [item('Нет категории', category='unknown')],
+            format='json'
+        )
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert 'errors' in response.json()[0]
+
+    def test_03_invalid_request(self, admin_client, user_client, settings):
+        settings.TITLES_BULK_MAX_SIZE = 2
+        for data in ([], {'name': 'Не список'}, [item('1')] * 3):
+            response = admin_client.post(BULK_URL, data, format='json')
+            assert response.status_code == HTTPStatus.BAD_REQUEST
+            assert response.json(), (
+                'Проверьте, что ответ 400 на неверный запрос содержит '
+                'сообщение об ошибке.'
+            )
+        assert user_client.post(
+            BULK_URL, [item('1')], format='json'
+        ).status_code == HTTPStatus.FORBIDDEN
+        assert not Title.objects.exists()
+
+    def test_04_cache(self, admin_client, client):
+        urls = (
+            TITLES_URL,
+            f'{TITLES_URL}?genre=comedy',
+            f'{TITLES_URL}?category=book',
+        )
+        for url in urls:
+            assert client.get(url).json()['count'] == 0
+        admin_client.post(BULK_URL, [
+            item('Комедия', genre=('comedy',), category='book')
+        ], format='json')
+        for url in urls:
+            assert client.get(url).json()['count'] == 1, (
+                f'Проверьте, что пакетное создание сбрасывает кэш `{url}`.'
+            )
@@ -0,0 +1,141 @@
+import csv
+import io
+import json
+from datetime import datetime
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+from reviews.models import Category, Genre, Review, Title
+
+TITLES_URL = '/api/v1/export/titles/'
+REVIEWS_URL = '/api/v1/export/reviews/'
+
+
+def content(response):
+    return b''.join(response.streaming_content).decode()
+
+
+def ndjson(response):
+    return [json.loads(line) for line in content(response).splitlines()]
+
+
+@pytest.mark.django_db(transaction=True)
+class Test23Export:
+
+    @pytest.fixture
+    def catalogue(self, admin, user):
+        category = Category.objects.create(name='Фильм', slug='movie')
+        drama = Genre.objects.create(name='Драма', slug='drama')
+        comedy = Genre.objects.create(name='Комедия', slug='comedy')
+        first = Title.objects.create(
+            name='Первое', year=2000, category=category
+        )
+        first.genre.set([drama, comedy])
+        second = Title.objects.create(name='Второе', year=2001)
+        reviews = [
+            Review.objects.create(
+                title=first, author=author, text='Отзыв', score=score
+            )
+            for author, score in ((admin, 4), (user, 8))
+        ]
+        for review, day in zip(reviews, (1, 3)):
+            Review.objects.filter(pk=review.pk).update(pub_date=datetime(
+                2021, 3, day, 12, tzinfo=timezone.utc
+            ))
+        return first, second, reviews
+
+    def test_01_access(self, client, user_client, admin_client):
+        for url in (TITLES_URL, REVIEWS_URL):
+            assert client.get(url).status_code == HTTPStatus.UNAUTHORIZED
+            assert user_client.get(url).status_code == HTTPStatus.FORBIDDEN, (
+                f'Проверьте, что `{url}` доступен только администратору.'
+            )
+            assert admin_client.get(url).status_code == HTTPStatus.OK
+
+    def test_02_titles_ndjson(self, admin_client, catalogue):
+        first, second, _ = catalogue
+        response = admin_client.get(TITLES_URL)
+        assert response['Content-Type'].startswith('application/x-ndjson')
+        assert ndjson(response) == [
+            {
+                'id': first.id, 'name': 'Первое', 'year': 2000,
+                'description': None, 'rating': 6.0, 'category': 'movie',
+                'genre': ['comedy', 'drama'],
+            },
+            {
+                'id': second.id, 'name': 'Второе', 'year': 2001,
+                'description': None, 'rating': None, 'category': None,
+                'genre': [],
+            },
+        ]
+        rows = ndjson(admin_client.get(TITLES_URL, {'since': first.id}))
+        assert [row['id'] for row in rows] == [second.id], (
+            'Проверьте, что параметр `since` выгружает записи с большим id.'
+        )
+
+    def test_03_csv(self, admin_client, catalogue):
+        first, second, reviews = catalogue
+        response = admin_client.get(TITLES_URL, {'output': 'csv'})
+        assert response['Content-Type'].startswith('text/csv')
+        assert 'titles.csv' in response['Content-Disposition']
+        rows = list(csv.reader(io.StringIO(content(response))))
+        assert rows == [
+            ['id', 'name', 'year', 'description', 'rating', 'category',
+             'genre'],
+            [str(first.id), 'Первое', '2000', '', '6.0', 'movie',
+             'comedy,drama'],
+            [str(second.id), 'Второе', '2001', '', '', '', ''],
+        ]
+        response = admin_client.get(REVIEWS_URL, {'output': 'csv'})
+        rows = list(csv.reader(io.StringIO(content(response))))
+        assert rows[0] == [
+            'id', 'title_id', 'author', 'text', 'score', 'pub_date'
+        ]
+        assert [row[2] for row in rows[1:]] == ['TestAdmin', 'TestUser']
+
+    def test_04_reviews_since_date(self, admin_client, catalogue):
+        _, _, reviews = catalogue
+        rows = ndjson(admin_client.get(REVIEWS_URL))
+        assert [row['id'] for row in rows] == [
+            review.id for review in reviews
+        ]
+        assert rows[0]['pub_date'] == '2021-03-01T12:00:00Z'
+        for since_date, expected in (
+            ('2021-03-02', reviews[1:]),
+            ('2021-03-01', reviews),
+            ('2021-03-01T12:00:00Z', reviews[1:]),
+            ('2021-03-01T11:00:00+00:00', reviews),
+            ('2021-03-03T12:00:00', []),
+        ):
+            response = admin_client.get(
+                REVIEWS_URL, {'since_date': since_date}
+            )
+            assert response.status_code == HTTPStatus.OK, (
+                'Проверьте, что `since_date` принимает дату и дату со '
+                'временем в формате ISO 8601.'
+            )
+            assert [row['id'] for row in ndjson(response)] == [
+                review.id for review in expected
+            ], since_date
+        rows = ndjson(admin_client.get(
+            REVIEWS_URL, {'since': reviews[0].id, 'since_date': '2021-01-01'}
+        ))
+        assert [row['id'] for row in rows] == [reviews[1].id]
+
+    def test_05_invalid_parameters(self, admin_client):
+        for url, params in (
+            (REVIEWS_URL, {'since_date': 'вчера'}),
+            (REVIEWS_URL, {'since_date': '2021-13-01'}),
+            (REVIEWS_URL, {'since': 'abc'}),
+            (REVIEWS_URL, {'output': 'xml'}),
+            (TITLES_URL, {'since_date': '2021-03-01'}),
+        ):
+            response = admin_client.get(url, params)
+            assert response.status_code == HTTPStatus.BAD_REQUEST, (
+                f'Проверьте, что `{url}` отвечает 400 на параметры {params}.'
+            )
+            assert set(response.json()) == set(params) & {
+                'since', 'since_date', 'output'
+            }
@@ -0,0 +1,144 @@
+from datetime import datetime, timedelta
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from reviews.models import Comment, Review, Title
+
+COMMENTS_URL = '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+PAGE_SIZE = 10
+
+
+@pytest.mark.django_db(transaction=True)
+class Test24CursorPagination:
+
+    @pytest.fixture
+    def comments(self, admin):
+        title = Title.objects.create(name='Произведение', year=2000)
+        review = Review.objects.create(
+            title=title, author=admin, text='Отзыв', score=5
+        )
+        Comment.objects.bulk_create(
+            Comment(review=review, author=admin, text=str(number))
+            for number in range(25)
+        )
+        # Часть комментариев с одинаковой датой: порядок задаёт id.
+        start = datetime(2021, 3, 1, tzinfo=timezone.utc)
+        for number, comment in enumerate(Comment.objects.order_by('id')):
+            Comment.objects.filter(pk=comment.pk).update(
+                pub_date=start + timedelta(hours=number // 3)
+            )
+        expected = list(
+            Comment.objects.order_by('-pub_date', '-id').values_list(
+                'id', flat=True
+            )
+        )
+        url = COMMENTS_URL.format(title_id=title.id, review_id=review.id)
+        return url, review, expected
+
+    @staticmethod
+    def walk(client, url):
+        pages = []
+        # Ограничение на случай курсора, который не доходит до конца.
+        while url and len(pages) < 200:
+            data = client.get(url).json()
+            pages.append(data)
+            url = data['next']
+        return pages
+
+    def test_01_cursor_pages(self, client, comments):
+        url, _, expected = comments
+        pages = self.walk(client, f'{url}?cursor=')
+        assert [len(page['results']) for page in pages] == [10, 10, 5], (
+            'Проверьте, что пустой параметр `cursor` включает курсорную '
+            'пагинацию по `PAGE_SIZE` записей.'
+        )
+        assert 'count' not in pages[0], (
+            'Проверьте, что курсорная пагинация не считает записи.'
+        )
+        assert pages[0]['previous'] is None
+        assert 'cursor' in parse_qs(urlparse(pages[0]['next']).query)
+        ids = [item['id'] for page in pages for item in page['results']]
+        assert ids == expected, (
+            'Проверьте, что курсорная пагинация выдаёт записи по убыванию '
+            '(pub_date, id) без повторов и пропусков.'
+        )
+
+        previous = client.get(pages[1]['previous']).json()
+        assert [item['id'] for item in previous['results']] == (
+            expected[:PAGE_SIZE]
+        )
+
+    def test_02_stable_with_new_rows(self, client, admin, comments):
+        url, review, expected = comments
+        first = client.get(f'{url}?cursor=').json()
+        Comment.objects.create(review=review, author=admin, text='Новый')
+        rest = self.walk(client, first['next'])
+        ids = [item['id'] for item in first['results']] + [
+            item['id'] for page in rest for item in page['results']
+        ]
+        assert ids == expected, (
+            'Проверьте, что новые записи не сдвигают следующие страницы '
+            'курсорной пагинации.'
+        )
+
+    def test_03_limit_offset_fallback(self, client, comments):
+        url, _, expected = comments
+        data = client.get(url).json()
+        assert data['count'] == 25, (
+            'Проверьте, что без параметра `cursor` используется пагинация '
+            'limit/offset.'
+        )
+        assert [item['id'] for item in data['results']] == (
+            expected[:PAGE_SIZE]
+        )
+        data = client.get(url, {'limit': 4, 'offset': 6}).json()
+        assert [item['id'] for item in data['results']] == expected[6:10]
+        assert 'offset=10' in data['next']
+        assert 'offset=2' in data['previous']
+
+    def test_04_many_equal_dates(self, client, admin):
+        title = Title.objects.create(name='Произведение', year=2000)
+        review = Review.objects.create(
+            title=title, author=admin, text='Отзыв', score=5
+        )
+        Comment.objects.bulk_create(
+            Comment(review=review, author=admin, text=str(number))
+            for number in range(1100)
+        )
+        # Как после импорта CSV: у всех записей одна дата.
+        Comment.objects.update(
+            pub_date=datetime(2021, 3, 1, tzinfo=timezone.utc)
+        )
+        url = COMMENTS_URL.format(title_id=title.id, review_id=review.id)
+        with CaptureQueriesContext(connection) as queries:
+            pages = self.walk(client, f'{url}?cursor=&limit=100')
+        ids = [item['id'] for page in pages for item in page['results']]
+        assert len(pages) == 11 and ids == sorted(ids, reverse=True), (
+            'Проверьте, что курсорная пагинация проходит записи с одинаковой '
+            'датой по id, без повторов и пропусков.'
+        )
+        assert len(set(ids)) == 1100
+        assert not any('OFFSET' in query['sql'] for query in queries), (
+            'Проверьте, что курсорная пагинация не использует OFFSET.'
+        )
+        previous = client.get(pages[-1]['previous']).json()
+        assert [item['id'] for item in previous['results']] == ids[900:1000]
+
+    def test_05_cursor_limit(self, client, comments):
+        url, _, expected = comments
+        pages = self.walk(client, f'{url}?cursor=&limit=7')
+        assert [len(page['results']) for page in pages] == [7, 7, 7, 4], (
+            'Проверьте, что параметр `limit` задаёт размер страницы '
+            'курсорной пагинации.'
+        )
+        assert [
+            item['id'] for page in pages for item in page['results']
+        ] == expected
+
+    def test_06_invalid_cursor(self, client, comments):
+        url, _, _ = comments
+        assert client.get(url, {'cursor': 'мусор'}).status_code == 404
@@ -0,0 +1,72 @@
+from http import HTTPStatus
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from reviews.models import Comment, Review, Title
+
+REVIEWS_URL = '/api/v1/titles/{title_id}/reviews/'
+COMMENTS_URL = '/api/v1/titles/{title_id}/reviews/{review_id}/comments/'
+
+
+@pytest.mark.django_db(transaction=True)
+class Test25NestedCreate:
+
+    @pytest.fixture
+    def review(self, admin):
+        title = Title.objects.create(name='Произведение', year=2000)
+        return Review.objects.create(
+            title=title, author=admin, text='Отзыв', score=3
+        )
+
+    def test_01_missing_parent(self, user_client, review):
+        other = Title.objects.create(name='Другое', year=2000)
+        for url, data in (
+            (REVIEWS_URL.format(title_id=0), {'text': 'Отзыв', 'score': 5}),
+            (COMMENTS_URL.format(title_id=review.title_id, review_id=0),
+             {'text': 'Комментарий'}),
+            (COMMENTS_URL.format(title_id=other.id, review_id=review.id),
+             {'text': 'Комментарий'}),
+        ):
+            response = user_client.post(url, data)
+            assert response.status_code == HTTPStatus.NOT_FOUND, (
+                f'Проверьте, что POST-запрос к `{url}` с несуществующим '
+                'родительским объектом возвращает ответ со статусом 404.'
+            )
+        assert Review.objects.count() == 1
+        assert not Comment.objects.exists()
+
+    def test_02_review_queries(self, user_client, admin_client, review):
+        url = REVIEWS_URL.format(title_id=review.title_id)
+        with CaptureQueriesContext(connection) as queries:
+            response = user_client.post(url, {'text': 'Отзыв', 'score': 5})
+        assert response.status_code == HTTPStatus.CREATED
+        assert len(queries) <= 7, (
+            'Проверьте, что создание отзыва не делает лишних запросов.'
+        )
+        selects = [
+            query['sql'] for query in queries
+            if query['sql'].startswith('SELECT')
+            and 'FROM "reviews_user"' not in query['sql']
+        ]
+        assert len(selects) == 1, (
+            'Проверьте, что перед созданием отзыва проверяется только '
+            'существование произведения, а повторный отзыв отсекает '
+            'ограничение в базе.'
+        )
+
+        response = admin_client.post(url, {'text': 'Ещё раз', 'score': 5})
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json() == {'non_field_errors': [
+            'Отзыв на произведение \'Произведение\'уже существует'
+        ]}
+
+    def test_03_comment_queries(self, user_client, review,
+                                django_assert_max_num_queries):
+        url = COMMENTS_URL.format(
+            title_id=review.title_id, review_id=review.id
+        )
+        with django_assert_max_num_queries(3):
+            response = user_client.post(url, {'text': 'Комментарий'})
+        assert response.status_code == HTTPStatus.CREATED
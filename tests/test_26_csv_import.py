@@ -0,0 +1,129 @@
+import csv
+import re
+from pathlib import Path
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Avg, Count
+
+from reviews.models import (
+    SCORES, Category, Comment, Genre, GenreTitle, Review, Title, User,
+    score_count_field
+)
+
+DATA_DIR = Path(__file__).resolve().parent.parent / 'api_yamdb/static/data'
+FILES = {
+    Category: 'category.csv',
+    Genre: 'genre.csv',
+    User: 'users.csv',
+    Title: 'titles.csv',
+    GenreTitle: 'genre_title.csv',
+    Review: 'review.csv',
+    Comment: 'comments.csv',
+}
+REPORT = re.compile(
+    r'(\w+): создано (\d+), обновлено (\d+), пропущено (\d+)'
+)
+
+
+def csv_rows(path):
+    with open(path, encoding='utf-8', newline='') as file:
+        return len(list(csv.DictReader(file)))
+
+
+def run_import(path, capsys):
+    call_command('csv_parser', path=str(path))
+    output = capsys.readouterr().out
+    counts = {
+        name: tuple(map(int, numbers))
+        for name, *numbers in REPORT.findall(output)
+    }
+    return counts, output
+
+
+def write_csv(directory, name, text):
+    (directory / name).write_text(text, encoding='utf-8')
+
+
+@pytest.mark.django_db(transaction=True)
+class Test26CsvImport:
+
+    def test_01_static_data(self, capsys):
+        counts, _ = run_import(DATA_DIR, capsys)
+        for model, file_name in FILES.items():
+            rows = csv_rows(DATA_DIR / file_name)
+            assert counts[model.__name__] == (rows, 0, 0), (
+                f'Проверьте, что `csv_parser` создаёт все объекты '
+                f'{model.__name__} из `{file_name}`.'
+            )
+            assert model.objects.count() == rows
+
+    def test_02_second_run_updates(self, capsys):
+        run_import(DATA_DIR, capsys)
+        Category.objects.filter(pk=1).update(name='Изменено')
+        counts, _ = run_import(DATA_DIR, capsys)
+        for model, file_name in FILES.items():
+            rows = csv_rows(DATA_DIR / file_name)
+            assert counts[model.__name__] == (0, rows, 0), (
+                'Проверьте, что повторный импорт обновляет объекты, а не '
+                'создаёт копии.'
+            )
+            assert model.objects.count() == rows
+        assert Category.objects.get(pk=1).name == 'Фильм'
+
+    def test_03_missing_foreign_keys(self, tmp_path, capsys):
+        write_csv(tmp_path, 'category.csv', 'id,name,slug\n1,Фильм,movie\n')
+        write_csv(
+            tmp_path, 'titles.csv',
+            'id,name,year,category\n1,Первое,2000,1\n2,Второе,2000,99\n'
+            '3,Третье,2000,\n'
+        )
+        counts, output = run_import(tmp_path, capsys)
+        assert counts['Title'] == (2, 0, 1), (
+            'Проверьте, что строки со ссылкой на несуществующий объект '
+            'пропускаются.'
+        )
+        assert 'Category с id=99 не найден' in output
+        assert set(Title.objects.values_list('id', flat=True)) == {1, 3}
+        assert Title.objects.get(pk=3).category_id is None
+
+    def test_04_ratings_rebuilt(self, capsys):
+        run_import(DATA_DIR, capsys)
+        titles = Title.objects.annotate(
+            average=Avg('reviews__score'), reviews_count=Count('reviews')
+        )
+        assert titles.filter(reviews_count__gt=0).exists()
+        for title in titles:
+            assert title.rating == title.average, (
+                'Проверьте, что после импорта отзывов рейтинг пересчитан.'
+            )
+            assert title.rating_count == title.reviews_count
+            scores = Review.objects.filter(title=title)
+            assert title.score_counts == {
+                score: scores.filter(score=score).count() for score in SCORES
+            }, 'Проверьте, что после импорта пересчитаны счётчики оценок.'
+
+    def test_05_duplicate_review(self, tmp_path, capsys, admin, user):
+        title = Title.objects.create(id=1, name='Произведение', year=2000)
+        other = Title.objects.create(id=2, name='Другое', year=2000)
+        Review.objects.create(
+            id=1, title=title, author=admin, text='Отзыв', score=5
+        )
+        write_csv(
+            tmp_path, 'review.csv',
+            'id,title_id,text,author,score,pub_date\n'
+            f'2,1,Повтор в базе,{admin.id},7,2021-03-01T12:00:00Z\n'
+            f'3,1,Первый,{user.id},8,2021-03-01T12:00:00Z\n'
+            f'4,1,Повтор в файле,{user.id},9,2021-03-01T12:00:00Z\n'
+            f'5,2,Другое,{user.id},6,2021-03-01T12:00:00Z\n'
+        )
+        counts, output = run_import(tmp_path, capsys)
+        assert counts['Review'] == (2, 0, 2), (
+            'Проверьте, что повторный отзыв автора на произведение '
+            'пропускается, а остальные строки файла импортируются.'
+        )
+        assert 'Строка с id=2' in output and 'Строка с id=4' in output
+        assert set(Review.objects.values_list('id', flat=True)) == {1, 3, 5}
+        title.refresh_from_db()
+        other.refresh_from_db()
+        assert (title.rating, other.rating) == (6.5, 6)